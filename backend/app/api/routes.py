@@ -1,14 +1,25 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from fastapi.responses import StreamingResponse
 from urllib.parse import quote
-from app.services.analysis_service import analyze_contract
+from app.core.config import get_settings
+from typing import Optional
+import asyncio
+import json
+from app.services.analysis_service import (
+    analyze_contract,
+    get_cached_analysis,
+    prepare_contract,
+    replay_contract_analysis,
+    stream_contract_analysis,
+)
 from app.services.document_service import validate_file, get_supported_formats_message
-from app.services.chat_service import generate_chat_response
-from app.services.labor_chat_service import generate_labor_chat_response
+from app.services.chat_service import generate_chat_response, stream_chat_response
+from app.services.labor_chat_service import generate_labor_chat_response, stream_labor_chat_response
 from app.services.docx_generator import generate_safe_contract
 from app.services.pdf_report_generator import generate_analysis_report
 from app.models.schemas import (
     ContractAnalysisResponse,
+    RevisionAnalysisResponse,
     HealthResponse,
     ChatRequest,
     ChatResponse,
@@ -30,6 +41,7 @@ from app.models.schemas import (
 )
 
 router = APIRouter()
+settings = get_settings()
 
 
 @router.get("/health", response_model=HealthResponse)
@@ -49,6 +61,101 @@ async def get_llm_info():
     return info
 
 
+@router.get("/system/rate-limits")
+async def get_rate_limit_stats():
+    """제공자별 LLM API 속도 제한 대기 시간/재시도 통계 + 동시 요청 한도 + 동일 요청 병합 통계 조회"""
+    from app.core.adaptive_concurrency import get_concurrency_stats
+    from app.core.rate_limit import get_rate_limit_stats as get_stats
+    from app.core.llm_client import get_single_flight
+
+    return {
+        "providers": get_stats(),
+        "concurrency": get_concurrency_stats(),
+        "single_flight": get_single_flight().stats(),
+    }
+
+
+@router.get("/system/token-usage")
+async def get_token_usage_stats():
+    """엔드포인트 + 모델별 LLM 토큰 사용량 조회 (프롬프트/응답, 프롬프트 캐시 적중)"""
+    from app.core.usage import get_usage_stats
+
+    return get_usage_stats()
+
+
+@router.get("/system/structured-output")
+async def get_structured_output_stats():
+    """LLM JSON 응답 처리 결과 조회 (정상, 로컬 복구, 재요청, 실패, 상위 모델 승급)"""
+    from app.core.structured_output import get_structured_output_stats as get_stats
+
+    return get_stats()
+
+
+@router.get("/system/llm-routing")
+async def get_llm_routing_stats():
+    """LLM 제공자 헤지/장애 조치 상태 조회"""
+    from app.core.llm_client import LLMClientFactory
+
+    if not settings.llm_fallback_provider:
+        return {"enabled": False}
+    return {"enabled": True, **LLMClientFactory.get_router().stats()}
+
+
+@router.get("/system/llm-cascade")
+async def get_llm_cascade_stats():
+    """저가 → 고가 모델 단계별 라우팅 통계 조회 (엔드포인트/단계별 승급률, 승급 사유, 지연 시간)"""
+    from app.core.cascade import get_cascade_stats
+
+    return get_cascade_stats()
+
+
+@router.get("/system/analysis-cache")
+async def get_analysis_cache_stats():
+    """분석 결과 캐시 통계 조회 (문서 단위 + 조항 단위 + 임베딩)"""
+    from app.services.analysis_cache import get_analysis_cache
+    from app.services.clause_cache import get_clause_cache
+    from app.services.embedding_cache import get_embedding_cache
+
+    return {
+        "document": get_analysis_cache().stats(),
+        "clause": get_clause_cache().stats(),
+        "embedding": get_embedding_cache().stats()
+    }
+
+
+@router.delete("/system/analysis-cache")
+async def invalidate_analysis_cache(stale_only: bool = False):
+    """분석 결과 캐시 무효화 (stale_only: 이전 프롬프트 버전 문서 결과만 삭제)"""
+    from app.services.analysis_cache import get_analysis_cache
+    from app.services.clause_cache import get_clause_cache
+
+    removed = get_analysis_cache().invalidate(stale_only=stale_only)
+    removed_clauses = 0 if stale_only else get_clause_cache().clear()
+    return {"success": True, "removed": removed, "removed_clauses": removed_clauses}
+
+
+@router.get("/system/semantic-cache")
+async def get_semantic_cache_stats():
+    """의미 기반 응답 캐시 통계 조회 (엔드포인트별 적중률, 적용 엔드포인트와 임계값)"""
+    from app.core.semantic_cache import get_semantic_cache, parse_semantic_cache_endpoints
+
+    return {
+        "enabled": settings.semantic_cache_enabled,
+        "endpoints": parse_semantic_cache_endpoints(
+            settings.semantic_cache_endpoints, settings.semantic_cache_threshold
+        ),
+        **get_semantic_cache().stats()
+    }
+
+
+@router.delete("/system/semantic-cache")
+async def clear_semantic_cache():
+    """의미 기반 응답 캐시 비우기"""
+    from app.core.semantic_cache import get_semantic_cache
+
+    return {"success": True, "removed": get_semantic_cache().clear()}
+
+
 @router.post("/system/test-anonymization")
 async def test_anonymization(text: str):
     """개인정보 익명화 테스트 (개발용)"""
@@ -96,6 +203,274 @@ async def analyze_contract_endpoint(file: UploadFile = File(...)):
         )
 
 
+@router.post("/analyze/stream")
+async def analyze_contract_stream_endpoint(file: UploadFile = File(...)):
+    """
+    계약서 분석 스트리밍 API (NDJSON)
+    - start: 계약서 유형과 조항 목록
+    - clause: 분석이 끝난 조항 (완료 순서)
+    - result: 전체 위험도 요약
+    """
+    contents = await file.read()
+
+    is_valid, error_message = validate_file(file.filename, len(contents))
+    if not is_valid:
+        raise HTTPException(
+            status_code=400,
+            detail=error_message
+        )
+
+    # 동일 문서의 이전 분석 결과가 있으면 그대로 재생
+    cached = await get_cached_analysis(contents)
+    if cached is not None:
+        events = replay_contract_analysis(cached)
+    else:
+        # 텍스트 추출 오류는 스트림 시작 전에 400으로 반환
+        try:
+            prepared = await asyncio.to_thread(prepare_contract, contents, file.filename)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=str(e)
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"분석 중 오류가 발생했습니다: {str(e)}"
+            )
+        events = stream_contract_analysis(
+            prepared["contract_type"], prepared["clauses"], file_bytes=contents
+        )
+
+    async def event_stream():
+        try:
+            async for event in events:
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        except Exception as e:
+            error = {"event": "error", "detail": f"분석 중 오류가 발생했습니다: {str(e)}"}
+            yield json.dumps(error, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+
+@router.post("/analyze/bulk")
+async def analyze_bulk_endpoint(files: list[UploadFile] = File(...)):
+    """
+    다중 계약서 일괄 분석 API (NDJSON)
+    - zip 파일 또는 여러 파일 업로드
+    - 문서별 진행률/결과와 포트폴리오 요약(portfolio) 이벤트 전달
+    """
+    from app.services.bulk_analysis_service import expand_uploads, analyze_portfolio
+
+    if len(files) > settings.bulk_max_documents:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {settings.bulk_max_documents}개 문서까지 분석할 수 있습니다."
+        )
+
+    max_upload_size = settings.bulk_max_upload_size_mb * 1024 * 1024
+    uploads = []
+    total_size = 0
+    for file in files:
+        # 남은 한도보다 1바이트 더 읽어 초과 여부 확인 (한도를 넘는 업로드는 끝까지 읽지 않음)
+        contents = await file.read(max_upload_size - total_size + 1)
+        total_size += len(contents)
+        if total_size > max_upload_size:
+            raise HTTPException(
+                status_code=400,
+                detail=f"업로드 파일 전체 크기는 {settings.bulk_max_upload_size_mb}MB를 넘을 수 없습니다."
+            )
+        if not file.filename.lower().endswith(".zip"):
+            is_valid, error_message = validate_file(file.filename, len(contents))
+            if not is_valid:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"{file.filename}: {error_message}"
+                )
+        uploads.append((file.filename, contents))
+
+    # zip 압축 해제는 스레드에서 (이벤트 루프 차단 방지)
+    documents, skipped = await asyncio.to_thread(expand_uploads, uploads)
+    if not documents:
+        raise HTTPException(status_code=400, detail="분석할 수 있는 문서가 없습니다.")
+    if len(documents) > settings.bulk_max_documents:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {settings.bulk_max_documents}개 문서까지 분석할 수 있습니다."
+        )
+
+    async def event_stream():
+        accepted = {
+            "event": "accepted",
+            "documents": [
+                {"index": i, "filename": filename}
+                for i, (filename, _) in enumerate(documents)
+            ],
+            "skipped": skipped
+        }
+        yield json.dumps(accepted, ensure_ascii=False) + "\n"
+        try:
+            async for event in analyze_portfolio(documents):
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        except Exception as e:
+            error = {"event": "error", "detail": f"분석 중 오류가 발생했습니다: {str(e)}"}
+            yield json.dumps(error, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+
+@router.post("/analyze/revision", response_model=RevisionAnalysisResponse)
+async def analyze_revision_endpoint(
+    file: UploadFile = File(...),
+    share_id: Optional[str] = Form(None),
+    job_id: Optional[str] = Form(None),
+    prior_result: Optional[str] = Form(None)
+):
+    """
+    개정 계약서 증분 분석 API
+    - 이전 분석은 share_id(협업 공유의 최신 버전), job_id(분석 작업 결과),
+      prior_result(분석 결과 JSON) 중 하나로 지정
+    - 변경/추가된 조항만 다시 분석
+    - share_id로 지정한 경우 결과를 새 버전으로 기록
+    """
+    from app.services.collaboration_service import get_collaboration_service
+    from app.services.job_service import get_job_service
+    from app.services.revision_service import reanalyze_contract, describe_revision
+
+    contents = await file.read()
+
+    is_valid, error_message = validate_file(file.filename, len(contents))
+    if not is_valid:
+        raise HTTPException(
+            status_code=400,
+            detail=error_message
+        )
+
+    # 이전 분석 결과 조회
+    shared = None
+    if share_id:
+        shared = get_collaboration_service().get_shared_analysis(share_id)
+        if not shared:
+            raise HTTPException(status_code=404, detail="공유된 분석을 찾을 수 없습니다.")
+        prior = shared.versions[-1].analysis_data
+    elif job_id:
+        prior = await get_job_service().get_result(job_id)
+        if prior is None:
+            raise HTTPException(status_code=404, detail="완료된 분석 작업을 찾을 수 없습니다.")
+    elif prior_result:
+        try:
+            prior = json.loads(prior_result)
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="prior_result가 올바른 JSON이 아닙니다.")
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail="share_id, job_id, prior_result 중 하나가 필요합니다."
+        )
+
+    try:
+        result = await reanalyze_contract(contents, file.filename, prior)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"분석 중 오류가 발생했습니다: {str(e)}"
+        )
+
+    # 협업 공유에 새 버전으로 기록
+    if shared:
+        # TODO: 실제 인증에서 사용자 ID 가져오기
+        version = get_collaboration_service().create_new_version(
+            share_id=share_id,
+            analysis_data={k: v for k, v in result.items() if k != "revision"},
+            created_by=shared.owner_id,
+            description="개정본 분석",
+            changes=describe_revision(result["revision"])
+        )
+        result = {
+            **result,
+            "share_id": share_id,
+            "version_number": version.version_number if version else None,
+        }
+
+    return result
+
+
+# ==========================================
+# 분석 작업 API
+# ==========================================
+
+@router.post("/jobs/analyze", status_code=202)
+async def submit_analysis_job(file: UploadFile = File(...)):
+    """계약서 분석 작업 등록 (즉시 job_id 반환)"""
+    from app.services.job_service import get_job_service
+
+    contents = await file.read()
+
+    is_valid, error_message = validate_file(file.filename, len(contents))
+    if not is_valid:
+        raise HTTPException(
+            status_code=400,
+            detail=error_message
+        )
+
+    job = await get_job_service().submit(contents, file.filename)
+    return job.to_dict()
+
+
+@router.get("/jobs/{job_id}")
+async def get_analysis_job(job_id: str):
+    """분석 작업 상태 및 진행률 조회"""
+    from app.services.job_service import get_job_service
+
+    job = await get_job_service().get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="분석 작업을 찾을 수 없습니다.")
+
+    return job.to_dict()
+
+
+@router.get("/jobs/{job_id}/result", response_model=ContractAnalysisResponse)
+async def get_analysis_job_result(job_id: str):
+    """완료된 분석 작업 결과 조회"""
+    from app.services.job_service import get_job_service, JobStatus
+
+    service = get_job_service()
+    job = await service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="분석 작업을 찾을 수 없습니다.")
+
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(
+            status_code=500,
+            detail=f"분석 중 오류가 발생했습니다: {job.error}"
+        )
+    if job.status != JobStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail="분석이 아직 완료되지 않았습니다.")
+
+    return await service.get_result(job_id)
+
+
+@router.get("/jobs/{job_id}/events")
+async def subscribe_analysis_job(job_id: str):
+    """분석 작업 이벤트 구독 (NDJSON)"""
+    from app.services.job_service import get_job_service
+
+    service = get_job_service()
+    if not await service.get_job(job_id):
+        raise HTTPException(status_code=404, detail="분석 작업을 찾을 수 없습니다.")
+
+    async def event_stream():
+        async for event in service.subscribe(job_id):
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+
 @router.post("/analyze/text")
 async def analyze_text_endpoint(text: str):
     """텍스트 직접 분석 (테스트용)"""
@@ -119,29 +494,51 @@ async def analyze_text_endpoint(text: str):
     }
 
 
+def _chat_history(request) -> list[dict]:
+    """conversation_history를 dict 리스트로 변환"""
+    return [
+        {"role": msg.role, "content": msg.content}
+        for msg in request.conversation_history
+    ]
+
+
+def _contract_context(request: ChatRequest) -> Optional[dict]:
+    """contract_context를 dict로 변환"""
+    if not request.contract_context:
+        return None
+    return {
+        "contract_type": request.contract_context.contract_type,
+        "high_risk_clauses": request.contract_context.high_risk_clauses,
+        "summary": request.contract_context.summary
+    }
+
+
+def _sse_response(events, error_message: str) -> StreamingResponse:
+    """이벤트 스트림을 SSE(text/event-stream) 응답으로 변환"""
+    async def event_stream():
+        try:
+            async for event in events:
+                data = {k: v for k, v in event.items() if k != "event"}
+                yield f"event: {event['event']}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            error = {"detail": f"{error_message}: {str(e)}"}
+            yield f"event: error\ndata: {json.dumps(error, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat_endpoint(request: ChatRequest):
     """판례 기반 법률 상담 챗봇"""
     try:
-        # conversation_history를 dict 리스트로 변환
-        history = [
-            {"role": msg.role, "content": msg.content}
-            for msg in request.conversation_history
-        ]
-
-        # contract_context를 dict로 변환
-        context = None
-        if request.contract_context:
-            context = {
-                "contract_type": request.contract_context.contract_type,
-                "high_risk_clauses": request.contract_context.high_risk_clauses,
-                "summary": request.contract_context.summary
-            }
-
         result = await generate_chat_response(
             message=request.message,
-            conversation_history=history,
-            contract_context=context
+            conversation_history=_chat_history(request),
+            contract_context=_contract_context(request)
         )
         return result
     except Exception as e:
@@ -151,6 +548,21 @@ async def chat_endpoint(request: ChatRequest):
         )
 
 
+@router.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest):
+    """
+    판례 기반 법률 상담 챗봇 스트리밍 API (SSE)
+    - token: 생성된 텍스트 조각
+    - done: 전체 응답과 인용 판례 (cited_cases)
+    """
+    events = stream_chat_response(
+        message=request.message,
+        conversation_history=_chat_history(request),
+        contract_context=_contract_context(request)
+    )
+    return _sse_response(events, "챗봇 응답 생성 중 오류가 발생했습니다")
+
+
 @router.post("/generate-safe-contract")
 async def generate_safe_contract_endpoint(request: GenerateContractRequest):
     """수정된 안전한 계약서 Word 파일 생성 및 다운로드"""
@@ -225,26 +637,10 @@ async def generate_report_endpoint(request: GenerateReportRequest):
 async def labor_chat_endpoint(request: LaborChatRequest):
     """노동상담 AI 챗봇"""
     try:
-        # conversation_history를 dict 리스트로 변환
-        history = [
-            {"role": msg.role, "content": msg.content}
-            for msg in request.conversation_history
-        ]
-
-        # consultation_info를 dict로 변환
-        consultation = None
-        if request.consultation_info:
-            consultation = {
-                "category": request.consultation_info.category,
-                "employment_status": request.consultation_info.employment_status,
-                "company_size": request.consultation_info.company_size,
-                "employment_type": request.consultation_info.employment_type
-            }
-
         result = await generate_labor_chat_response(
             message=request.message,
-            conversation_history=history,
-            consultation_info=consultation
+            conversation_history=_chat_history(request),
+            consultation_info=_consultation_info(request)
         )
         return result
     except Exception as e:
@@ -254,6 +650,33 @@ async def labor_chat_endpoint(request: LaborChatRequest):
         )
 
 
+@router.post("/labor-chat/stream")
+async def labor_chat_stream_endpoint(request: LaborChatRequest):
+    """
+    노동상담 AI 챗봇 스트리밍 API (SSE)
+    - token: 생성된 텍스트 조각
+    - done: 전체 응답, 인용 판례 (cited_cases), 전문가 연결 필요 여부 (needs_expert)
+    """
+    events = stream_labor_chat_response(
+        message=request.message,
+        conversation_history=_chat_history(request),
+        consultation_info=_consultation_info(request)
+    )
+    return _sse_response(events, "노동상담 응답 생성 중 오류가 발생했습니다")
+
+
+def _consultation_info(request: LaborChatRequest) -> Optional[dict]:
+    """consultation_info를 dict로 변환"""
+    if not request.consultation_info:
+        return None
+    return {
+        "category": request.consultation_info.category,
+        "employment_status": request.consultation_info.employment_status,
+        "company_size": request.consultation_info.company_size,
+        "employment_type": request.consultation_info.employment_type
+    }
+
+
 @router.post("/expert-connect")
 async def expert_connect_endpoint(request: ExpertConnectRequest):
     """전문 노무사 상담 연결 신청"""
@@ -0,0 +1,203 @@
+"""
+제공자별 적응형 동시 요청 제한 (AIMD)
+- 지연 시간이 안정적이면 동시 요청 한도를 조금씩 늘림 (가산 증가)
+- 429/과부하 오류나 지연 시간 급증 시 한도를 크게 줄임 (승산 감소)
+- 한도를 넘는 요청은 도착 순서대로 대기
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from app.core.config import get_settings
+from app.core.metrics import LLM_CONCURRENCY_DECREASES, LLM_CONCURRENCY_LIMIT, LLM_IN_FLIGHT
+from app.core.rate_limit import get_status_code, is_timeout_error
+
+
+settings = get_settings()
+
+# 과부하로 보는 HTTP 상태 코드
+_OVERLOAD_STATUS_CODES = {429, 503, 529}
+
+# 기준 지연 시간 지수 이동 평균 계수 (작을수록 천천히 따라감)
+_BASELINE_ALPHA = 0.05
+
+# 기준 지연 시간을 믿기 전에 필요한 작업별 최소 표본 수
+_MIN_LATENCY_SAMPLES = 10
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD 방식 동시 요청 한도"""
+
+    def __init__(
+        self,
+        provider: str,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        backoff: float = 0.5,
+        latency_tolerance: float = 3.0
+    ):
+        """
+        Args:
+            initial_limit: 시작 한도
+            min_limit / max_limit: 한도 범위
+            backoff: 감소 시 곱하는 비율 (0~1)
+            latency_tolerance: 기준 지연 시간의 몇 배를 넘으면 급증으로 볼지
+        """
+        self.provider = provider
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # 작업(chat, embedding 등)별 기준 지연 시간과 표본 수
+        self._baselines: Dict[str, float] = {}
+        self._samples: Dict[str, int] = {}
+        self._last_decrease = 0.0
+
+        self.increases = 0
+        self.decreases = 0
+        self.max_in_flight = 0
+        self._publish()
+
+    @property
+    def current_limit(self) -> int:
+        return int(self.limit)
+
+    async def acquire(self) -> None:
+        """동시 요청 자리 확보 (한도가 찼으면 대기)"""
+        if not self._waiters and self.in_flight < self.current_limit:
+            self._take_slot()
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 자리를 받은 직후 취소된 경우 반납
+                self._release_slot()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self, operation: str, latency: Optional[float] = None, error: Optional[BaseException] = None) -> None:
+        """
+        요청 완료 후 자리 반납 및 한도 조정
+
+        Args:
+            operation: 지연 시간 기준을 구분할 작업 이름
+            latency: 성공한 요청의 지연 시간 (초)
+            error: 실패한 경우 예외
+        """
+        if error is not None:
+            if self._is_overload(error):
+                self._decrease("throttled")
+        elif latency is not None:
+            self._on_success(operation, latency)
+        self._release_slot()
+
+    def _on_success(self, operation: str, latency: float) -> None:
+        baseline = self._baselines.get(operation)
+        samples = self._samples.get(operation, 0) + 1
+        self._samples[operation] = samples
+
+        if baseline is None:
+            self._baselines[operation] = latency
+            return
+        if samples >= _MIN_LATENCY_SAMPLES and latency > baseline * self.latency_tolerance:
+            # 급증한 지연 시간은 기준에 반영하지 않음 (기준이 따라 올라가면 감지 못함)
+            self._decrease("latency")
+            return
+
+        self._baselines[operation] = baseline + _BASELINE_ALPHA * (latency - baseline)
+        # 한도를 실제로 쓰고 있을 때만 증가 (성공 1건당 1/한도 → 한도만큼 성공하면 +1)
+        if self.in_flight >= self.limit / 2 and self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.increases += 1
+            self._publish()
+
+    def _decrease(self, reason: str) -> None:
+        # 같은 과부하로 동시에 실패한 요청들이 한도를 연달아 줄이지 않도록 기준 지연 시간만큼 간격 유지
+        now = time.monotonic()
+        cooldown = max(self._baselines.values(), default=1.0)
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * self.backoff)
+        self.decreases += 1
+        LLM_CONCURRENCY_DECREASES.inc(provider=self.provider, reason=reason)
+        self._publish()
+
+    @staticmethod
+    def _is_overload(error: BaseException) -> bool:
+        # 제공자가 느려져 SDK/HTTP 타임아웃이 나는 경우도 과부하로 봄
+        if is_timeout_error(error):
+            return True
+        return get_status_code(error) in _OVERLOAD_STATUS_CODES
+
+    def _take_slot(self) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        LLM_IN_FLIGHT.set(self.in_flight, provider=self.provider)
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        LLM_IN_FLIGHT.set(self.in_flight, provider=self.provider)
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_flight < self.current_limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._take_slot()
+                waiter.set_result(None)
+
+    def _publish(self) -> None:
+        LLM_CONCURRENCY_LIMIT.set(self.current_limit, provider=self.provider)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.current_limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "max_in_flight": self.max_in_flight,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "baseline_latency_seconds": {
+                operation: round(latency, 3) for operation, latency in self._baselines.items()
+            },
+        }
+
+
+# 제공자별 동시 요청 제한기
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+
+
+def get_concurrency_limiter(provider: str) -> AdaptiveConcurrencyLimiter:
+    """제공자 동시 요청 제한기 반환 (싱글톤)"""
+    if provider not in _limiters:
+        _limiters[provider] = AdaptiveConcurrencyLimiter(
+            provider,
+            initial_limit=settings.llm_concurrency_initial,
+            min_limit=settings.llm_concurrency_min,
+            max_limit=settings.llm_concurrency_max,
+            backoff=settings.llm_concurrency_backoff,
+            latency_tolerance=settings.llm_concurrency_latency_tolerance,
+        )
+    return _limiters[provider]
+
+
+def get_concurrency_stats() -> Dict[str, Any]:
+    """제공자별 동시 요청 한도 상태"""
+    return {provider: limiter.stats() for provider, limiter in _limiters.items()}
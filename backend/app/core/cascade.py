@@ -0,0 +1,237 @@
+"""
+저가 → 고가 모델 단계별 라우팅 (model cascade)
+- 저가/로컬 모델에 먼저 요청하고, 응답을 믿기 어려울 때만 기본(고가) 모델로 다시 요청
+- 승급 여부는 호출자가 응답을 보고 판단 (조항 분석: 스키마 검증 실패, confidence 미달, 위험도 경계값 근처)
+- 단계별 요청/수용/승급 수, 승급 사유, 지연 시간 집계
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, TypeVar
+
+from app.core.config import get_settings
+from app.core.llm_client import SecureLLMClient
+from app.core.metrics import LLM_CASCADE_ESCALATIONS, LLM_CASCADE_REQUESTS, LLM_CASCADE_TIER_DURATION
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 단계별 라우팅을 지원하는 엔드포인트 (응답의 스키마/확신도/위험도로 승급 여부를 판단할 수 있는 조항 분석만)
+# 채팅은 확신도 신호가 없고, 스트리밍 응답은 이미 보낸 토큰을 되돌릴 수 없어 지원하지 않음
+SUPPORTED_ENDPOINTS = ("clause_analysis", "analysis_with_context")
+
+
+class CascadeTier:
+    """단계 하나 (제공자 + 모델)"""
+
+    def __init__(self, name: str, provider: Optional[str] = None, model: Optional[str] = None):
+        """
+        Args:
+            name: 단계 이름 (cheap, premium)
+            provider / model: None이면 기본 제공자/모델 (보조 제공자가 설정되어 있으면 라우터)
+        """
+        self.name = name
+        self.provider = provider
+        self.model = model
+        self._client: Optional[SecureLLMClient] = None
+
+    @property
+    def client(self) -> SecureLLMClient:
+        if self._client is None:
+            self._client = SecureLLMClient(self.provider, self.model)
+        return self._client
+
+    @property
+    def label(self) -> str:
+        return f"{self.provider or settings.llm_provider}:{self.model or settings.current_model}"
+
+
+class TierStats:
+    """엔드포인트 + 단계별 결과와 최근 지연 시간"""
+
+    def __init__(self, window: int = 200):
+        self.requests = 0
+        self.accepted = 0
+        self.escalated = 0
+        self.errors = 0
+        self.reasons: Dict[str, int] = {}
+        self.latencies: deque = deque(maxlen=window)
+
+    def _percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def stats(self) -> Dict[str, Any]:
+        p50, p95 = self._percentile(0.5), self._percentile(0.95)
+        return {
+            "requests": self.requests,
+            "accepted": self.accepted,
+            "escalated": self.escalated,
+            "errors": self.errors,
+            "escalation_rate": round(self.escalated / self.requests, 3) if self.requests else 0.0,
+            "escalation_reasons": dict(self.reasons),
+            "p50_latency_seconds": round(p50, 3) if p50 is not None else None,
+            "p95_latency_seconds": round(p95, 3) if p95 is not None else None,
+        }
+
+
+class ModelCascade:
+    """단계 순서대로 요청하고 승급 사유가 없는 첫 응답 사용"""
+
+    def __init__(self, tiers: List[CascadeTier], window: Optional[int] = None):
+        self.tiers = tiers
+        self.window = window or settings.llm_cascade_latency_window
+        self._stats: Dict[str, Dict[str, TierStats]] = {}
+
+    @property
+    def name(self) -> str:
+        """단계 구성 (캐시 키 구분용, 예: "openai:gpt-4o-mini>openai:gpt-4o")"""
+        return ">".join(tier.label for tier in self.tiers)
+
+    def _tier_stats(self, endpoint: str, tier: CascadeTier) -> TierStats:
+        by_tier = self._stats.setdefault(endpoint, {})
+        if tier.name not in by_tier:
+            by_tier[tier.name] = TierStats(self.window)
+        return by_tier[tier.name]
+
+    async def run(
+        self,
+        endpoint: str,
+        call: Callable[[SecureLLMClient, bool], Awaitable[T]],
+        escalation_reason: Callable[[T], Optional[str]]
+    ) -> T:
+        """
+        단계별 요청
+
+        Args:
+            endpoint: 통계를 구분할 엔드포인트 이름
+            call: (단계 클라이언트, 마지막 단계 여부) → 응답
+                  마지막 단계가 아니면 형식 오류 재요청 등은 생략하고 바로 승급하도록 구현
+            escalation_reason: 응답을 보고 승급 사유 반환 (믿을 수 있으면 None)
+
+        Returns:
+            승급 사유가 없는 첫 응답 (마지막 단계 응답은 그대로 사용)
+        """
+        for position, tier in enumerate(self.tiers):
+            final = position == len(self.tiers) - 1
+            stats = self._tier_stats(endpoint, tier)
+            stats.requests += 1
+            start = time.perf_counter()
+            try:
+                result = await call(tier.client, final)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats.errors += 1
+                LLM_CASCADE_REQUESTS.inc(endpoint=endpoint, tier=tier.name, outcome="error")
+                if final:
+                    raise
+                logger.warning(f"{tier.label} 요청 실패, 상위 모델로 승급합니다 ({endpoint}): {e}")
+                self._escalate(endpoint, tier, stats, "error")
+                continue
+
+            latency = time.perf_counter() - start
+            stats.latencies.append(latency)
+            LLM_CASCADE_TIER_DURATION.observe(latency, endpoint=endpoint, tier=tier.name)
+
+            reason = None if final else escalation_reason(result)
+            if reason is None:
+                stats.accepted += 1
+                LLM_CASCADE_REQUESTS.inc(endpoint=endpoint, tier=tier.name, outcome="accepted")
+                return result
+
+            LLM_CASCADE_REQUESTS.inc(endpoint=endpoint, tier=tier.name, outcome="escalated")
+            self._escalate(endpoint, tier, stats, reason)
+
+        raise RuntimeError("모델 단계가 설정되지 않았습니다")
+
+    @staticmethod
+    def _escalate(endpoint: str, tier: CascadeTier, stats: TierStats, reason: str) -> None:
+        stats.escalated += 1
+        stats.reasons[reason] = stats.reasons.get(reason, 0) + 1
+        LLM_CASCADE_ESCALATIONS.inc(endpoint=endpoint, tier=tier.name, reason=reason)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tiers": [{"name": tier.name, "model": tier.label} for tier in self.tiers],
+            "endpoints": {
+                endpoint: {name: tier_stats.stats() for name, tier_stats in by_tier.items()}
+                for endpoint, by_tier in self._stats.items()
+            },
+        }
+
+
+# 싱글톤 인스턴스
+_cascade: Optional[ModelCascade] = None
+# 경고를 남긴 미지원 엔드포인트
+_warned_endpoints: Set[str] = set()
+
+
+def _configured_endpoints() -> List[str]:
+    return [endpoint.strip() for endpoint in settings.llm_cascade_endpoints.split(",") if endpoint.strip()]
+
+
+def _cascade_endpoints() -> List[str]:
+    """설정된 엔드포인트 중 단계별 라우팅을 지원하는 것 (미지원 엔드포인트는 경고 후 무시)"""
+    endpoints = []
+    for endpoint in _configured_endpoints():
+        if endpoint in SUPPORTED_ENDPOINTS:
+            endpoints.append(endpoint)
+        elif endpoint not in _warned_endpoints:
+            _warned_endpoints.add(endpoint)
+            logger.warning(
+                f"단계별 라우팅을 지원하지 않는 엔드포인트는 무시합니다: {endpoint} "
+                f"(지원: {', '.join(SUPPORTED_ENDPOINTS)})"
+            )
+    return endpoints
+
+
+def get_model_cascade(endpoint: str) -> Optional[ModelCascade]:
+    """
+    엔드포인트에 적용할 모델 단계 구성 반환
+
+    Returns:
+        ModelCascade, 단계별 라우팅을 쓰지 않거나 저가 모델이 기본 모델과 같으면 None
+    """
+    global _cascade
+    if not settings.llm_cascade_enabled or endpoint not in _cascade_endpoints():
+        return None
+
+    provider = settings.llm_cascade_provider or settings.llm_provider
+    if provider == settings.llm_provider and settings.llm_cascade_model in ("", settings.current_model):
+        return None
+
+    if _cascade is None:
+        _cascade = ModelCascade([
+            CascadeTier("cheap", provider, settings.llm_cascade_model or None),
+            CascadeTier("premium"),
+        ])
+    return _cascade
+
+
+def get_model_scope(endpoint: str) -> str:
+    """엔드포인트 응답을 만드는 모델 구성 (캐시 키 구분용)"""
+    cascade = get_model_cascade(endpoint)
+    return cascade.name if cascade is not None else settings.current_model
+
+
+def get_cascade_stats() -> Dict[str, Any]:
+    """모델 단계별 승급률/지연 시간 통계"""
+    if not settings.llm_cascade_enabled:
+        return {"enabled": False}
+    stats = _cascade.stats() if _cascade is not None else {"tiers": [], "endpoints": {}}
+    return {
+        "enabled": True,
+        "applied_endpoints": _cascade_endpoints(),
+        "ignored_endpoints": [e for e in _configured_endpoints() if e not in SUPPORTED_ENDPOINTS],
+        "min_confidence": settings.llm_cascade_min_confidence,
+        "risk_threshold": settings.llm_cascade_risk_threshold,
+        "risk_margin": settings.llm_cascade_risk_margin,
+        **stats,
+    }
@@ -18,13 +18,16 @@ class Settings(BaseSettings):
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
     # LLM 제공자 설정
-    # "openai" | "upstage" | "anthropic" | "local"
+    # "openai" | "upstage" | "anthropic" | "local" | "fake"
     llm_provider: str = "openai"
 
     # OpenAI 설정
     openai_api_key: Optional[str] = None
     openai_model: str = "gpt-4o"
     embedding_model: str = "text-embedding-3-large"
+    embedding_max_concurrency: int = 4  # 여러 텍스트 임베딩 시 동시 요청 묶음 수
+    embedding_cache_enabled: bool = True  # 임베딩 캐시 (텍스트 해시 + 모델 기준 재사용)
+    embedding_cache_dir: str = "data/embedding_cache"  # 메모리 맵 벡터 파일 저장 경로
 
     # Upstage Solar 설정 (한국 로컬 LLM)
     upstage_api_key: Optional[str] = None
@@ -39,10 +42,114 @@ class Settings(BaseSettings):
     local_llm_base_url: str = "http://localhost:11434/v1"
     local_llm_model: str = "llama3.1:8b"
 
+    # 가짜 LLM 설정 (LLM_PROVIDER=fake, API 호출 없이 부하/회귀 테스트)
+    fake_llm_model: str = "fake-llm"
+    fake_llm_latency_ms: float = 800.0  # 응답 지연 시간 중앙값 (밀리초, 토큰 생성 시간 제외)
+    fake_llm_latency_sigma: float = 0.5  # 지연 시간 로그 정규 분포 폭 (0이면 고정)
+    fake_llm_error_rate: float = 0.0  # 429/5xx 오류 발생 확률 (0~1)
+    fake_llm_tokens_per_second: float = 50.0  # 응답 토큰 생성 속도 (0이면 즉시)
+    fake_llm_embedding_latency_ms: float = 50.0  # 임베딩 요청 지연 시간 중앙값 (밀리초)
+    fake_llm_embedding_dim: int = 256
+    fake_llm_seed: int = 0  # 지연 시간/오류 발생 순서 시드
+
+    # LLM API 연결 풀 설정 (모든 제공자가 공유)
+    llm_max_connections: int = 100  # 최대 동시 연결 수
+    llm_max_keepalive_connections: int = 20  # 유지할 유휴 연결 수
+    llm_keepalive_expiry: float = 30.0  # 유휴 연결 유지 시간 (초)
+    llm_request_timeout: float = 120.0  # 요청 타임아웃 (초)
+
+    # LLM API 속도 제한/재시도 설정 (제공자별 토큰 버킷, 0이면 제한 없음)
+    llm_requests_per_minute: int = 500  # 분당 요청 수
+    llm_tokens_per_minute: int = 200000  # 분당 토큰 수 (입력 + 예상 출력)
+    llm_rate_limit_overrides: str = ""  # 제공자별 설정 "upstage:100:50000,anthropic:50:40000"
+    llm_max_retries: int = 4  # 429/일시적 오류 최대 재시도 횟수
+    llm_retry_base_delay: float = 0.5  # 지수 백오프 기본 대기 시간 (초)
+    llm_retry_max_delay: float = 30.0  # 최대 대기 시간 (초, Retry-After 포함)
+
+    # LLM 제공자별 적응형 동시 요청 제한 (AIMD: 안정적이면 가산 증가, 429/지연 급증 시 승산 감소)
+    llm_adaptive_concurrency_enabled: bool = True
+    llm_concurrency_initial: int = 10  # 시작 동시 요청 한도
+    llm_concurrency_min: int = 1
+    llm_concurrency_max: int = 200
+    llm_concurrency_backoff: float = 0.5  # 감소 시 곱하는 비율
+    llm_concurrency_latency_tolerance: float = 3.0  # 기준 지연 시간의 몇 배를 넘으면 급증으로 볼지
+
+    # LLM 제공자 헤지/장애 조치 설정 (보조 제공자를 비우면 사용 안 함)
+    llm_fallback_provider: str = ""  # "upstage" | "anthropic" | "local"
+    llm_hedge_enabled: bool = True  # 기본 제공자가 p95를 넘기면 보조 제공자에 중복 요청
+    llm_hedge_min_delay: float = 2.0  # 헤지 요청 전 최소 대기 시간 (초, 표본 부족 시 사용)
+    llm_failover_error_rate: float = 0.5  # 이 오류율 이상이면 보조 제공자로 전환
+    llm_failover_min_requests: int = 10  # 오류율 판단에 필요한 최소 요청 수
+    llm_failover_cooldown_seconds: float = 60.0  # 전환 유지 시간 (초)
+    llm_latency_window: int = 100  # 지연 시간/오류율 계산에 쓰는 최근 요청 수
+
+    # 저가 → 고가 모델 단계별 라우팅 (저가/로컬 모델 응답의 확신도가 낮을 때만 기본 모델로 승급)
+    llm_cascade_enabled: bool = False
+    llm_cascade_provider: str = ""  # 저가 모델 제공자 (비우면 LLM_PROVIDER)
+    llm_cascade_model: str = "gpt-4o-mini"  # 저가 모델
+    llm_cascade_endpoints: str = "clause_analysis,analysis_with_context"  # 단계별 라우팅을 적용할 엔드포인트 (조항 분석만 지원)
+    llm_cascade_min_confidence: float = 0.7  # 이 확신도(confidence) 미만이면 승급
+    llm_cascade_risk_threshold: int = 7  # 위험도 경계값 (분석 파이프라인은 6점 이상 판례 검색, 7점 이상 수정안 생성)
+    llm_cascade_risk_margin: int = 1  # 경계값과 이 점수 차이 이내면 승급
+    llm_cascade_latency_window: int = 200  # 단계별 지연 시간 통계에 쓰는 최근 요청 수
+
+    # 동일 LLM 요청 병합 설정 (같은 요청이 동시에 들어오면 한 번만 호출)
+    llm_single_flight_enabled: bool = True
+    llm_single_flight_window_seconds: float = 10.0  # 완료된 응답 재사용 시간 (초, 0이면 진행 중 요청만 병합)
+
+    # 프롬프트 토큰 예산 (초과 시 오래된 대화 요약, 컨텍스트 축소)
+    prompt_budget_chat: int = 6000  # 계약 상담 챗봇
+    prompt_budget_labor_chat: int = 6000  # 노동상담 챗봇
+    prompt_budget_analysis: int = 4000  # 조항 분석/수정안 생성
+
+    # 제공자 프롬프트 캐시 (고정 시스템 프롬프트 재사용, Anthropic은 cache_control 표시 필요)
+    llm_prompt_cache_enabled: bool = True
+
     # 개인정보 보호 설정
     anonymize_personal_data: bool = True  # 개인정보 익명화 활성화
     preserve_amounts_in_anonymization: bool = True  # 금액 정보 보존
 
+    # 분석 파이프라인 설정
+    analysis_max_concurrency: int = 5  # 동시에 분석하는 최대 조항 수
+
+    clause_prescreen_enabled: bool = True  # 규칙 기반 저위험 조항 사전 분류
+
+    # 분석 결과 캐시 설정 (동일 파일 재업로드 시 재사용)
+    analysis_cache_enabled: bool = True
+    analysis_cache_memory_size: int = 128  # 메모리에 보관할 분석 결과 수
+    analysis_cache_dir: Optional[str] = "data/analysis_cache"  # 비우면 디스크 캐시 사용 안 함
+
+    # 조항 분석 캐시 설정 (반복되는 정형 조항 재사용)
+    clause_cache_enabled: bool = True
+    clause_cache_size: int = 2048  # 최대 보관 조항 수
+    clause_cache_ttl_seconds: int = 86400  # 유효 시간 (0이면 만료 없음)
+
+    # 의미 기반 응답 캐시 설정 (표현만 다른 같은 질문에 저장된 응답 재사용)
+    semantic_cache_enabled: bool = True
+    semantic_cache_endpoints: str = "labor_chat"  # 적용할 엔드포인트 "labor_chat:0.92,chat,clause_analysis:0.97"
+    semantic_cache_threshold: float = 0.95  # 엔드포인트에 임계값을 지정하지 않았을 때의 최소 코사인 유사도
+    semantic_cache_size: int = 2048  # 최대 보관 응답 수
+    semantic_cache_ttl_seconds: int = 86400  # 유효 시간 (0이면 만료 없음)
+
+    # 조항 일괄 분석 설정 (짧은 조항 여러 개를 한 번의 요청으로 분석)
+    clause_batch_enabled: bool = False
+    clause_batch_token_budget: int = 3000  # 요청당 입력 토큰 예산
+    clause_batch_max_size: int = 8  # 요청당 최대 조항 수
+
+    # 일괄 분석 설정 (zip/다중 파일 포트폴리오 분석)
+    bulk_max_documents: int = 200  # 요청당 최대 문서 수
+    bulk_max_concurrency: int = 10  # 전체 문서가 공유하는 조항 분석 동시 실행 수 (적응형 동시 요청 제한을 끈 경우)
+    bulk_extraction_concurrency: int = 4  # 동시 텍스트 추출 수
+    bulk_max_archive_size_mb: int = 100  # zip 파일 크기와 압축 해제 후 전체 크기 제한 (MB)
+    bulk_max_upload_size_mb: int = 200  # 요청당 업로드 파일 전체 크기 제한 (MB)
+
+    # 개정본 증분 분석 설정
+    revision_match_threshold: float = 0.6  # 수정된 조항으로 볼 최소 유사도
+
+    # 분석 작업 큐 설정
+    job_db_path: str = "data/jobs.sqlite3"  # 작업 큐 SQLite 파일 경로
+    job_workers: int = 2  # 프로세스당 분석 워커 수
+
     # Pinecone (선택사항)
     pinecone_api_key: Optional[str] = None
     pinecone_index_name: str = "contract-pilot"
@@ -58,6 +165,7 @@ class Settings(BaseSettings):
             "upstage": self.upstage_api_key,
             "anthropic": self.anthropic_api_key,
             "local": None,  # 로컬은 API 키 불필요
+            "fake": None,
         }
         return provider_keys.get(self.llm_provider)
 
@@ -69,6 +177,7 @@ class Settings(BaseSettings):
             "upstage": self.upstage_model,
             "anthropic": self.anthropic_model,
             "local": self.local_llm_model,
+            "fake": self.fake_llm_model,
         }
         return provider_models.get(self.llm_provider, self.openai_model)
 
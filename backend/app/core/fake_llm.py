@@ -0,0 +1,189 @@
+"""
+가짜 LLM 제공자 (부하/회귀 테스트용)
+- 실제 API를 호출하지 않고 프롬프트에 따라 결정적인 응답 생성
+  (조항 분석은 스키마에 맞는 JSON, 수정안/상담은 그럴듯한 문장)
+- 지연 시간 분포(로그 정규), 오류율, 토큰 생성 속도를 설정으로 조절
+- 같은 시드면 지연 시간/오류 발생 순서도 같음
+"""
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+from typing import AsyncIterator, Dict, List, Optional
+
+from app.core.config import get_settings
+from app.core.llm_client import BaseLLMClient
+from app.core.tokens import count_message_tokens, count_tokens
+from app.core.usage import record_usage
+
+
+settings = get_settings()
+
+# 주입 오류 상태 코드 (재시도 대상)
+_ERROR_STATUS_CODES = (429, 500, 503)
+
+_CLAUSE_MARKER = re.compile(r"\[조항 (\d+)\]")
+
+_RISK_LEVELS = [(3, "low"), (6, "medium"), (8, "high"), (10, "critical")]
+
+_ISSUES = [
+    "일방 당사자에게 과도한 책임을 부과합니다.",
+    "손해배상 범위가 명확하지 않습니다.",
+    "계약 해지 사유가 불명확합니다.",
+    "통지 기간이 지나치게 짧습니다.",
+    "위약금이 과다하게 설정되어 있습니다.",
+    "분쟁 해결 절차가 일방에게 불리합니다.",
+]
+
+_LEGAL_BASES = [
+    "민법 제398조 (배상액의 예정)",
+    "약관의 규제에 관한 법률 제6조 (일반원칙)",
+    "민법 제103조 (반사회질서의 법률행위)",
+    "민법 제543조 (해지, 해제권)",
+    "근로기준법 제20조 (위약 예정의 금지)",
+]
+
+_SENTENCES = [
+    "해당 내용은 계약서의 구체적인 문구와 당사자 간 협상 경과에 따라 달리 판단될 수 있습니다.",
+    "관련 법령과 판례에 비추어 보면 일방에게 지나치게 불리한 조항은 무효로 볼 여지가 있습니다.",
+    "분쟁을 예방하려면 책임 범위와 기간을 구체적으로 정해 두는 것이 좋습니다.",
+    "계약 체결 전에 상대방과 해당 조항의 수정 가능성을 협의해 보시기 바랍니다.",
+    "정확한 판단이 필요하다면 관련 자료를 준비하여 전문가 상담을 받아보시기 바랍니다.",
+]
+
+
+class FakeLLMError(Exception):
+    """가짜 제공자가 주입하는 일시적 API 오류"""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"가짜 LLM 오류 (HTTP {status_code})")
+        self.status_code = status_code
+
+
+def _seed(*parts: str) -> int:
+    return int.from_bytes(hashlib.sha256("\x1f".join(parts).encode()).digest()[:8], "big")
+
+
+def _risk_level(score: int) -> str:
+    return next(level for limit, level in _RISK_LEVELS if score <= limit)
+
+
+def fake_clause_analysis(clause: str, extended: bool = False) -> Dict:
+    """조항 텍스트로 결정되는 분석 결과 (ClauseAnalysis 스키마)"""
+    rng = random.Random(_seed("analysis", clause))
+    score = rng.randint(1, 10)
+    result = {
+        "risk_score": score,
+        "risk_level": _risk_level(score),
+        "summary": f"위험도 {score}점으로 평가되는 조항입니다.",
+        "issues": rng.sample(_ISSUES, k=0 if score <= 2 else rng.randint(1, 3)),
+        "legal_basis": rng.choice(_LEGAL_BASES),
+        "suggestion": "책임 범위와 기간을 구체적으로 명시하고 양 당사자의 권리를 균형 있게 조정하세요.",
+        "confidence": round(rng.uniform(0.5, 0.95), 2),
+    }
+    if extended:
+        result["related_cases"] = []
+    return result
+
+
+class FakeLLMClient(BaseLLMClient):
+    """설정 가능한 지연 시간/오류율을 가진 결정적 가짜 LLM 클라이언트"""
+
+    embedding_batch_size = 2048
+    embedding_batch_tokens = 300000
+
+    def __init__(self, model: Optional[str] = None):
+        self.model = model or settings.fake_llm_model
+        self.embedding_model = f"{settings.fake_llm_model}-embedding"
+        self.rng = random.Random(settings.fake_llm_seed)
+
+    async def _simulate_call(self, latency_ms: float) -> None:
+        """지연 시간 대기 후 설정된 확률로 오류 발생"""
+        sigma = settings.fake_llm_latency_sigma
+        delay = latency_ms / 1000 * (self.rng.lognormvariate(0, sigma) if sigma > 0 else 1.0)
+        failed = self.rng.random() < settings.fake_llm_error_rate
+        status = self.rng.choice(_ERROR_STATUS_CODES)
+        await asyncio.sleep(delay)
+        if failed:
+            raise FakeLLMError(status)
+
+    def _generation_delay(self, tokens: int) -> float:
+        rate = settings.fake_llm_tokens_per_second
+        return tokens / rate if rate > 0 else 0.0
+
+    def _respond(self, messages: List[Dict[str, str]], json_response: bool, max_tokens: Optional[int]) -> str:
+        system = messages[0]["content"] if messages and messages[0]["role"] == "system" else ""
+        last = messages[-1]["content"] if messages else ""
+
+        if json_response:
+            if '"results"' in system:
+                # 일괄 분석: [조항 N] 구분자마다 결과 하나
+                sections = _CLAUSE_MARKER.split(last.split("\n\n컨텍스트:")[0])[1:]
+                results = [
+                    {"index": int(index), **fake_clause_analysis(text.strip())}
+                    for index, text in zip(sections[::2], sections[1::2])
+                ]
+                return json.dumps({"results": results}, ensure_ascii=False)
+            clause = last.split("\n\n")[0].split(":", 1)[-1].strip()
+            return json.dumps(
+                fake_clause_analysis(clause, extended='"related_cases"' in system),
+                ensure_ascii=False
+            )
+
+        rng = random.Random(_seed("text", system, last))
+        if "수정된 조항만 출력" in system:
+            # 사용자 메시지: "원본 조항:\n...\n\n문제점:\n..." (머리말은 익명화로 바뀔 수 있음)
+            original = last.split("\n", 1)[-1].split("\n\n")[0].strip()
+            text = f"{original}\n다만, 양 당사자는 상호 협의하여 본 조항의 내용을 변경할 수 있으며, 손해배상의 범위는 통상의 손해로 한정한다."
+        else:
+            text = " ".join(rng.sample(_SENTENCES, k=rng.randint(2, len(_SENTENCES))))
+
+        if max_tokens and count_tokens(text, self.model) > max_tokens:
+            text = text[:max(1, len(text) * max_tokens // count_tokens(text, self.model))]
+        return text
+
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        json_response: bool = False,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        reply = self._respond(messages, json_response, max_tokens)
+        completion_tokens = count_tokens(reply, self.model)
+        await self._simulate_call(settings.fake_llm_latency_ms)
+        await asyncio.sleep(self._generation_delay(completion_tokens))
+        record_usage(self.model, count_message_tokens(messages, self.model), completion_tokens)
+        return reply
+
+    async def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        reply = self._respond(messages, False, max_tokens)
+        # 첫 토큰까지 지연 후 어절 단위로 토큰 생성 속도에 맞춰 전달
+        await self._simulate_call(settings.fake_llm_latency_ms)
+        pieces = re.findall(r"\S+\s*", reply)
+        for piece in pieces:
+            await asyncio.sleep(self._generation_delay(count_tokens(piece, self.model)))
+            yield piece
+        record_usage(self.model, count_message_tokens(messages, self.model), count_tokens(reply, self.model))
+
+    def _vector(self, text: str) -> List[float]:
+        """텍스트로 결정되는 단위 벡터"""
+        rng = random.Random(_seed("embedding", text))
+        vector = [rng.gauss(0, 1) for _ in range(settings.fake_llm_embedding_dim)]
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    async def get_embedding(self, text: str) -> List[float]:
+        return (await self._embed_batch([text]))[0]
+
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        await self._simulate_call(settings.fake_llm_embedding_latency_ms)
+        record_usage(self.embedding_model, sum(count_tokens(text, self.model) for text in texts), 0)
+        return [self._vector(text) for text in texts]
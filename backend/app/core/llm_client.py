@@ -3,49 +3,250 @@
 OpenAI, Upstage Solar, Anthropic Claude, 로컬 LLM 지원
 개인정보보호법 준수를 위한 익명화 기능 내장
 """
+import asyncio
+import hashlib
 import json
-from typing import Optional, Dict, Any, List
+import logging
+import time
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple
 from abc import ABC, abstractmethod
 
+import httpx
+
+from app.core.adaptive_concurrency import AdaptiveConcurrencyLimiter, get_concurrency_limiter
 from app.core.config import get_settings
+from app.core.metrics import LLM_REQUEST_DURATION, LLM_REQUESTS
+from app.core.rate_limit import (
+    ProviderRateLimiter,
+    call_with_retry,
+    get_backoff_delay,
+    get_rate_limiter,
+    is_retryable_error,
+)
+from app.core.semantic_cache import (
+    CachedResponse,
+    get_semantic_cache,
+    get_semantic_cache_threshold,
+    make_namespace,
+    normalize_query,
+)
+from app.core.single_flight import SingleFlight
+from app.core.structured_output import repair_json
+from app.core.tokens import count_message_tokens, count_tokens, estimate_tokens
+from app.core.usage import current_endpoint, llm_endpoint, record_usage
 from app.services.anonymizer_service import anonymize_text, restore_text
 
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# 응답 길이를 지정하지 않은 요청의 토큰 예약량 (분당 토큰 제한 계산용)
+_RESERVED_COMPLETION_TOKENS = 1000
+
+# 모든 제공자가 공유하는 HTTP 연결 풀 (keep-alive)
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """LLM API 호출용 공유 비동기 HTTP 클라이언트 반환"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_keepalive_connections,
+                keepalive_expiry=settings.llm_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(settings.llm_request_timeout, connect=10.0),
+        )
+    return _http_client
+
+
+def _record_chat_usage(
+    model: str,
+    messages: List[Dict[str, str]],
+    reply: str,
+    prompt_tokens: Optional[int] = None,
+    completion_tokens: Optional[int] = None,
+    cached_tokens: int = 0
+) -> None:
+    """호출 토큰 사용량 기록 (API가 사용량을 주지 않으면 토크나이저로 계산)"""
+    if prompt_tokens is None:
+        prompt_tokens = count_message_tokens(messages, model)
+    if completion_tokens is None:
+        completion_tokens = count_tokens(reply or "", model)
+    record_usage(model, prompt_tokens, completion_tokens, cached_tokens)
+
+
+def _openai_cached_tokens(usage) -> int:
+    """OpenAI 호환 응답의 프롬프트 캐시 적중 토큰 수 (자동 접두사 캐시)"""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return getattr(details, "cached_tokens", None) or 0
+
+
+def _record_openai_usage(model: str, messages: List[Dict[str, str]], response) -> None:
+    usage = getattr(response, "usage", None)
+    _record_chat_usage(
+        model,
+        messages,
+        response.choices[0].message.content,
+        getattr(usage, "prompt_tokens", None),
+        getattr(usage, "completion_tokens", None),
+        _openai_cached_tokens(usage),
+    )
+
+
+def _record_embedding_usage(model: str, texts: List[str], response) -> None:
+    usage = getattr(response, "usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    if prompt_tokens is None:
+        prompt_tokens = sum(count_tokens(text, model) for text in texts)
+    record_usage(model, prompt_tokens, 0)
+
+
+def _with_json_instruction(messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """JSON 모드가 없는 제공자용: 시스템 프롬프트에 JSON 형식 요청을 덧붙인 새 메시지 목록 (원본은 수정하지 않음)"""
+    if not messages or messages[0]["role"] != "system":
+        return messages
+    first = {**messages[0], "content": messages[0]["content"] + "\n\n응답은 반드시 유효한 JSON 형식으로 해주세요."}
+    return [first, *messages[1:]]
+
+
+async def _stream_chat_completions(client, include_usage: bool = False, **kwargs) -> AsyncIterator[str]:
+    """
+    OpenAI 호환 API 스트리밍 응답에서 텍스트 조각만 추출
+
+    Args:
+        include_usage: 마지막 청크로 사용량을 요청 (지원하는 제공자만)
+    """
+    if include_usage:
+        kwargs["stream_options"] = {"include_usage": True}
+    stream = await client.chat.completions.create(stream=True, **kwargs)
+    chunks = []
+    usage = None
+    async for chunk in stream:
+        if getattr(chunk, "usage", None):
+            usage = chunk.usage
+        if chunk.choices and chunk.choices[0].delta.content:
+            chunks.append(chunk.choices[0].delta.content)
+            yield chunk.choices[0].delta.content
+    _record_chat_usage(
+        kwargs["model"],
+        kwargs["messages"],
+        "".join(chunks),
+        getattr(usage, "prompt_tokens", None),
+        getattr(usage, "completion_tokens", None),
+        _openai_cached_tokens(usage),
+    )
 
 
 class BaseLLMClient(ABC):
     """LLM 클라이언트 기본 클래스"""
 
+    # 임베딩 요청당 최대 입력 수 / 토큰 수 (제공자 한도)
+    embedding_batch_size = 100
+    embedding_batch_tokens = 100000
+
+    # 임베딩을 다른 제공자에 위임하는 경우 그 제공자 이름
+    embedding_provider: Optional[str] = None
+
+    # 임베딩 모델 이름 (임베딩 캐시 키에 사용)
+    embedding_model: Optional[str] = None
+
     @abstractmethod
     async def chat_completion(
         self,
         messages: List[Dict[str, str]],
         temperature: float = 0.3,
-        json_response: bool = False
+        json_response: bool = False,
+        max_tokens: Optional[int] = None
     ) -> str:
         """채팅 완료 API 호출"""
         pass
 
+    @abstractmethod
+    def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """채팅 완료 API 스트리밍 호출 (생성되는 텍스트 조각을 순서대로 반환)"""
+        pass
+
     @abstractmethod
     async def get_embedding(self, text: str) -> List[float]:
         """텍스트 임베딩 생성"""
         pass
 
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        여러 텍스트 임베딩 생성
+        - 제공자 한도에 맞춰 묶음으로 나누고 묶음들을 동시에 요청
+        - 입력 순서대로 반환
+        """
+        if not texts:
+            return []
+
+        semaphore = asyncio.Semaphore(max(1, settings.embedding_max_concurrency))
+
+        async def run(batch: List[int]) -> List[List[float]]:
+            async with semaphore:
+                return await self._embed_batch([texts[i] for i in batch])
+
+        batches = chunk_embedding_inputs(texts, self.embedding_batch_size, self.embedding_batch_tokens)
+        results = await asyncio.gather(*(run(batch) for batch in batches))
+        return [vector for vectors in results for vector in vectors]
+
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """한 번의 요청으로 여러 텍스트 임베딩 (배치 API가 없으면 개별 호출)"""
+        return list(await asyncio.gather(*(self.get_embedding(text) for text in texts)))
+
+
+def chunk_embedding_inputs(texts: List[str], max_items: int, max_tokens: int) -> List[List[int]]:
+    """
+    임베딩 입력을 요청 단위 묶음으로 구성 (입력 순서 유지)
+
+    Returns:
+        텍스트 인덱스 목록의 목록
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for i, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (len(current) >= max_items or current_tokens + tokens > max_tokens):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
 
 class OpenAIClient(BaseLLMClient):
     """OpenAI GPT 클라이언트"""
 
-    def __init__(self):
-        from openai import OpenAI
-        self.client = OpenAI(api_key=settings.openai_api_key)
-        self.model = settings.openai_model
+    embedding_batch_size = 2048
+    embedding_batch_tokens = 300000
+
+    def __init__(self, model: Optional[str] = None):
+        from openai import AsyncOpenAI
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=get_http_client(),
+            max_retries=0  # 재시도는 RateLimitedClient에서 처리
+        )
+        self.model = model or settings.openai_model
+        self.embedding_model = settings.embedding_model
 
     async def chat_completion(
         self,
         messages: List[Dict[str, str]],
         temperature: float = 0.3,
-        json_response: bool = False
+        json_response: bool = False,
+        max_tokens: Optional[int] = None
     ) -> str:
         kwargs = {
             "model": self.model,
@@ -54,66 +255,133 @@ class OpenAIClient(BaseLLMClient):
         }
         if json_response:
             kwargs["response_format"] = {"type": "json_object"}
+        if max_tokens:
+            kwargs["max_tokens"] = max_tokens
 
-        response = self.client.chat.completions.create(**kwargs)
+        response = await self.client.chat.completions.create(**kwargs)
+        _record_openai_usage(self.model, messages, response)
         return response.choices[0].message.content
 
+    async def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+        if max_tokens:
+            kwargs["max_tokens"] = max_tokens
+
+        async for token in _stream_chat_completions(self.client, include_usage=True, **kwargs):
+            yield token
+
     async def get_embedding(self, text: str) -> List[float]:
-        response = self.client.embeddings.create(
-            model=settings.embedding_model,
+        response = await self.client.embeddings.create(
+            model=self.embedding_model,
             input=text
         )
+        _record_embedding_usage(self.embedding_model, [text], response)
         return response.data[0].embedding
 
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        response = await self.client.embeddings.create(
+            model=self.embedding_model,
+            input=texts
+        )
+        _record_embedding_usage(self.embedding_model, texts, response)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
 
 class UpstageClient(BaseLLMClient):
     """Upstage Solar 클라이언트 (한국 로컬 LLM)"""
 
-    def __init__(self):
-        from openai import OpenAI
-        self.client = OpenAI(
+    embedding_batch_size = 100
+    embedding_batch_tokens = 200000
+
+    def __init__(self, model: Optional[str] = None):
+        from openai import AsyncOpenAI
+        self.client = AsyncOpenAI(
             api_key=settings.upstage_api_key,
-            base_url=settings.upstage_base_url
+            base_url=settings.upstage_base_url,
+            http_client=get_http_client(),
+            max_retries=0  # 재시도는 RateLimitedClient에서 처리
         )
-        self.model = settings.upstage_model
+        self.model = model or settings.upstage_model
+        self.embedding_model = "solar-embedding-1-large"
 
     async def chat_completion(
         self,
         messages: List[Dict[str, str]],
         temperature: float = 0.3,
-        json_response: bool = False
+        json_response: bool = False,
+        max_tokens: Optional[int] = None
     ) -> str:
+        # Upstage는 JSON 모드 지원 여부 확인 필요 → JSON 형식 요청을 시스템 프롬프트에 포함
+        if json_response:
+            messages = _with_json_instruction(messages)
         kwargs = {
             "model": self.model,
             "messages": messages,
             "temperature": temperature,
         }
-        # Upstage는 JSON 모드 지원 여부 확인 필요
-        if json_response:
-            # JSON 형식 요청을 시스템 프롬프트에 포함
-            if messages and messages[0]["role"] == "system":
-                messages[0]["content"] += "\n\n응답은 반드시 유효한 JSON 형식으로 해주세요."
+        if max_tokens:
+            kwargs["max_tokens"] = max_tokens
 
-        response = self.client.chat.completions.create(**kwargs)
+        response = await self.client.chat.completions.create(**kwargs)
+        _record_openai_usage(self.model, messages, response)
         return response.choices[0].message.content
 
+    async def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+        if max_tokens:
+            kwargs["max_tokens"] = max_tokens
+
+        async for token in _stream_chat_completions(self.client, **kwargs):
+            yield token
+
     async def get_embedding(self, text: str) -> List[float]:
         # Upstage 임베딩 API 사용
-        response = self.client.embeddings.create(
-            model="solar-embedding-1-large",
+        response = await self.client.embeddings.create(
+            model=self.embedding_model,
             input=text
         )
+        _record_embedding_usage(self.embedding_model, [text], response)
         return response.data[0].embedding
 
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        response = await self.client.embeddings.create(
+            model=self.embedding_model,
+            input=texts
+        )
+        _record_embedding_usage(self.embedding_model, texts, response)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
 
 class AnthropicClient(BaseLLMClient):
     """Anthropic Claude 클라이언트"""
 
-    def __init__(self):
+    def __init__(self, model: Optional[str] = None):
         try:
-            from anthropic import Anthropic
-            self.client = Anthropic(api_key=settings.anthropic_api_key)
-            self.model = settings.anthropic_model
+            from anthropic import AsyncAnthropic
+            self.client = AsyncAnthropic(
+                api_key=settings.anthropic_api_key,
+                http_client=get_http_client(),
+                max_retries=0  # 재시도는 RateLimitedClient에서 처리
+            )
+            self.model = model or settings.anthropic_model
         except ImportError:
             raise ImportError("anthropic 패키지가 필요합니다. pip install anthropic")
 
@@ -121,111 +389,400 @@ class AnthropicClient(BaseLLMClient):
         self,
         messages: List[Dict[str, str]],
         temperature: float = 0.3,
-        json_response: bool = False
+        json_response: bool = False,
+        max_tokens: Optional[int] = None
     ) -> str:
-        # Claude API는 system 메시지를 별도 파라미터로 받음
-        system_message = ""
-        chat_messages = []
+        system_message, chat_messages = self._split_system_message(messages, json_response)
 
-        for msg in messages:
-            if msg["role"] == "system":
-                system_message = msg["content"]
-                if json_response:
-                    system_message += "\n\n응답은 반드시 유효한 JSON 형식으로 해주세요."
-            else:
-                chat_messages.append(msg)
-
-        response = self.client.messages.create(
+        response = await self.client.messages.create(
             model=self.model,
-            max_tokens=4096,
+            max_tokens=max_tokens or 4096,
             system=system_message,
             messages=chat_messages,
             temperature=temperature,
         )
+        self._record_usage(messages, response.content[0].text, response.usage)
         return response.content[0].text
 
+    async def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        system_message, chat_messages = self._split_system_message(messages)
+
+        async with self.client.messages.stream(
+            model=self.model,
+            max_tokens=max_tokens or 4096,
+            system=system_message,
+            messages=chat_messages,
+            temperature=temperature,
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+            final = await stream.get_final_message()
+        self._record_usage(messages, "", final.usage)
+
+    def _record_usage(self, messages: List[Dict[str, str]], reply: str, usage) -> None:
+        # input_tokens에는 캐시에서 읽거나 캐시에 쓴 토큰이 빠져 있으므로 합산
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+        _record_chat_usage(
+            self.model,
+            messages,
+            reply,
+            usage.input_tokens + cache_read + cache_write,
+            usage.output_tokens,
+            cache_read,
+        )
+
+    @staticmethod
+    def _split_system_message(
+        messages: List[Dict[str, str]],
+        json_response: bool = False
+    ) -> tuple:
+        """
+        Claude API는 system 메시지를 별도 파라미터로 받음
+        - 맨 앞 고정 시스템 프롬프트는 프롬프트 캐시 지점(cache_control)으로 표시
+        - 대화 중간의 시스템 메시지(요청별 컨텍스트)는 다음 사용자 메시지 앞에 붙임
+          (고정 프롬프트 + 이전 대화 접두사가 요청마다 같게 유지됨)
+        """
+        system_message = ""
+        chat_messages = []
+        pending_context = []
+
+        for i, msg in enumerate(messages):
+            if msg["role"] == "system" and i == 0:
+                system_message = msg["content"]
+            elif msg["role"] == "system":
+                pending_context.append(msg["content"])
+            elif pending_context and msg["role"] == "user":
+                content = "\n\n".join(pending_context + [msg["content"]])
+                chat_messages.append({"role": "user", "content": content})
+                pending_context = []
+            else:
+                chat_messages.append(msg)
+        if pending_context:
+            chat_messages.append({"role": "user", "content": "\n\n".join(pending_context)})
+
+        if json_response:
+            json_instruction = "응답은 반드시 유효한 JSON 형식으로 해주세요."
+            system_message = f"{system_message}\n\n{json_instruction}" if system_message else json_instruction
+
+        if settings.llm_prompt_cache_enabled and system_message:
+            system = [{"type": "text", "text": system_message, "cache_control": {"type": "ephemeral"}}]
+            return system, chat_messages
+        return system_message, chat_messages
+
+    # Claude는 임베딩 API 없음, OpenAI 폴백 (연결 풀/속도 제한을 공유하는 팩토리 클라이언트 재사용)
+    embedding_provider = "openai"
+    embedding_model = settings.embedding_model
+
     async def get_embedding(self, text: str) -> List[float]:
-        # Claude는 임베딩 API 없음, OpenAI 폴백
-        fallback = OpenAIClient()
-        return await fallback.get_embedding(text)
+        return await LLMClientFactory.get_client(self.embedding_provider).get_embedding(text)
+
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return await LLMClientFactory.get_client(self.embedding_provider).get_embeddings(texts)
 
 
 class LocalLLMClient(BaseLLMClient):
     """로컬 LLM 클라이언트 (Ollama, vLLM 등)"""
 
-    def __init__(self):
-        from openai import OpenAI
-        self.client = OpenAI(
+    embedding_batch_size = 32
+    embedding_batch_tokens = 16000
+
+    def __init__(self, model: Optional[str] = None):
+        from openai import AsyncOpenAI
+        self.client = AsyncOpenAI(
             api_key="ollama",  # 로컬은 더미 키
-            base_url=settings.local_llm_base_url
+            base_url=settings.local_llm_base_url,
+            http_client=get_http_client(),
+            max_retries=0  # 재시도는 RateLimitedClient에서 처리
         )
-        self.model = settings.local_llm_model
+        self.model = model or settings.local_llm_model
+        self.embedding_model = "nomic-embed-text"
 
     async def chat_completion(
         self,
         messages: List[Dict[str, str]],
         temperature: float = 0.3,
-        json_response: bool = False
+        json_response: bool = False,
+        max_tokens: Optional[int] = None
     ) -> str:
+        if json_response:
+            messages = _with_json_instruction(messages)
         kwargs = {
             "model": self.model,
             "messages": messages,
             "temperature": temperature,
         }
+        if max_tokens:
+            kwargs["max_tokens"] = max_tokens
 
-        if json_response:
-            if messages and messages[0]["role"] == "system":
-                messages[0]["content"] += "\n\n응답은 반드시 유효한 JSON 형식으로 해주세요."
-
-        response = self.client.chat.completions.create(**kwargs)
+        response = await self.client.chat.completions.create(**kwargs)
+        _record_openai_usage(self.model, messages, response)
         return response.choices[0].message.content
 
+    async def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+        if max_tokens:
+            kwargs["max_tokens"] = max_tokens
+
+        async for token in _stream_chat_completions(self.client, **kwargs):
+            yield token
+
     async def get_embedding(self, text: str) -> List[float]:
         # Ollama 임베딩
-        response = self.client.embeddings.create(
-            model="nomic-embed-text",
+        response = await self.client.embeddings.create(
+            model=self.embedding_model,
             input=text
         )
+        _record_embedding_usage(self.embedding_model, [text], response)
         return response.data[0].embedding
 
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        response = await self.client.embeddings.create(
+            model=self.embedding_model,
+            input=texts
+        )
+        _record_embedding_usage(self.embedding_model, texts, response)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+class RateLimitedClient(BaseLLMClient):
+    """제공자별 속도 제한 + 적응형 동시 요청 제한 + 일시적 오류 재시도 래퍼"""
+
+    def __init__(
+        self,
+        client: BaseLLMClient,
+        limiter: ProviderRateLimiter,
+        concurrency: Optional[AdaptiveConcurrencyLimiter] = None
+    ):
+        self.client = client
+        self.limiter = limiter
+        self.concurrency = concurrency
+        self.model = client.model
+        self.embedding_batch_size = client.embedding_batch_size
+        self.embedding_batch_tokens = client.embedding_batch_tokens
+        self.embedding_provider = client.embedding_provider
+        self.embedding_model = client.embedding_model
+
+    def _request_tokens(self, messages: List[Dict[str, str]], max_tokens: Optional[int]) -> int:
+        return count_message_tokens(messages, self.model) + (max_tokens or _RESERVED_COMPLETION_TOKENS)
+
+    def _observe(self, operation: str, model: Optional[str], start: float, ok: bool) -> None:
+        """호출 1회(재시도 포함 각 시도)의 지연 시간과 결과 기록"""
+        labels = {
+            "provider": self.limiter.provider,
+            "model": model or "",
+            "endpoint": current_endpoint(),
+            "operation": operation,
+        }
+        LLM_REQUEST_DURATION.observe(time.perf_counter() - start, **labels)
+        LLM_REQUESTS.inc(status="success" if ok else "error", **labels)
+
+    async def _timed(self, operation: str, model: Optional[str], func):
+        if self.concurrency is not None:
+            await self.concurrency.acquire()
+        start = time.perf_counter()
+        error: Optional[BaseException] = None
+        try:
+            return await func()
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._observe(operation, model, start, error is None)
+            if self.concurrency is not None:
+                # 지연 시간 기준은 작업 + 엔드포인트별로 구분 (조항 분석과 상담 응답은 길이가 다름)
+                self.concurrency.release(
+                    f"{operation}:{current_endpoint()}", time.perf_counter() - start, error
+                )
+
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        json_response: bool = False,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        return await call_with_retry(
+            lambda: self._timed(
+                "chat", self.model,
+                # 시도마다 복사본 전달 (제공자 클라이언트가 메시지를 수정해도 재시도/요청 키에 영향 없음)
+                lambda: self.client.chat_completion(
+                    [dict(msg) for msg in messages], temperature, json_response, max_tokens
+                )
+            ),
+            limiter=self.limiter,
+            tokens=self._request_tokens(messages, max_tokens)
+        )
+
+    async def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        # 첫 토큰을 받기 전의 오류만 재시도 (이미 전달한 응답은 되돌릴 수 없음)
+        tokens = self._request_tokens(messages, max_tokens)
+        attempt = 0
+        while True:
+            await self.limiter.acquire(tokens)
+            if self.concurrency is not None:
+                await self.concurrency.acquire()
+            started = False
+            start = time.perf_counter()
+            first_token_latency: Optional[float] = None
+            error: Optional[BaseException] = None
+            try:
+                async for token in self.client.chat_completion_stream(
+                    [dict(msg) for msg in messages], temperature, max_tokens
+                ):
+                    if not started:
+                        started = True
+                        first_token_latency = time.perf_counter() - start
+                    yield token
+                self._observe("chat_stream", self.model, start, True)
+                return
+            except Exception as e:
+                error = e
+                self._observe("chat_stream", self.model, start, False)
+                if started or attempt >= settings.llm_max_retries or not is_retryable_error(e):
+                    raise
+            finally:
+                if self.concurrency is not None:
+                    # 스트림은 첫 토큰까지의 지연 시간으로 한도 조정 (응답 길이와 무관)
+                    self.concurrency.release(
+                        f"chat_stream:{current_endpoint()}", first_token_latency, error
+                    )
+            delay = get_backoff_delay(error, attempt)
+            attempt += 1
+            self.limiter.record_retry(error)
+            await asyncio.sleep(delay)
+
+    async def get_embedding(self, text: str) -> List[float]:
+        if self.embedding_provider:
+            # 위임받는 제공자 클라이언트에서 속도 제한 적용
+            return await self.client.get_embedding(text)
+        return await call_with_retry(
+            lambda: self._timed("embedding", self.embedding_model, lambda: self.client.get_embedding(text)),
+            limiter=self.limiter,
+            tokens=estimate_tokens(text)
+        )
+
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        if self.embedding_provider:
+            return await self.client.get_embeddings(texts)
+        return await super().get_embeddings(texts)
+
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return await call_with_retry(
+            lambda: self._timed("embedding", self.embedding_model, lambda: self.client._embed_batch(texts)),
+            limiter=self.limiter,
+            tokens=sum(estimate_tokens(text) for text in texts)
+        )
+
 
 class LLMClientFactory:
     """LLM 클라이언트 팩토리"""
 
     _clients: Dict[str, BaseLLMClient] = {}
+    _router: Optional[BaseLLMClient] = None
 
     @classmethod
-    def get_client(cls, provider: Optional[str] = None) -> BaseLLMClient:
-        """LLM 클라이언트 인스턴스 반환 (싱글톤)"""
+    def get_client(cls, provider: Optional[str] = None, model: Optional[str] = None) -> BaseLLMClient:
+        """
+        LLM 클라이언트 인스턴스 반환 (제공자 + 모델별 싱글톤)
+        - 제공자를 지정하지 않고 보조 제공자가 설정되어 있으면 헤지/장애 조치 라우터 반환
+        - model을 지정하면 제공자 기본 모델 대신 해당 모델 사용 (속도/동시 요청 제한은 제공자 단위로 공유)
+        """
+        if provider is None and model is None and settings.llm_fallback_provider:
+            return cls.get_router()
+
         provider = provider or settings.llm_provider
+        key = f"{provider}:{model}" if model else provider
 
-        if provider not in cls._clients:
-            cls._clients[provider] = cls._create_client(provider)
+        if key not in cls._clients:
+            cls._clients[key] = cls._create_client(provider, model)
 
-        return cls._clients[provider]
+        return cls._clients[key]
 
     @classmethod
-    def _create_client(cls, provider: str) -> BaseLLMClient:
+    def _create_client(cls, provider: str, model: Optional[str] = None) -> BaseLLMClient:
         """LLM 클라이언트 생성"""
+        from app.core.fake_llm import FakeLLMClient
+
         clients = {
             "openai": OpenAIClient,
             "upstage": UpstageClient,
             "anthropic": AnthropicClient,
             "local": LocalLLMClient,
+            "fake": FakeLLMClient,
         }
 
         if provider not in clients:
             raise ValueError(f"지원하지 않는 LLM 제공자: {provider}")
 
-        return clients[provider]()
+        concurrency = get_concurrency_limiter(provider) if settings.llm_adaptive_concurrency_enabled else None
+        return RateLimitedClient(clients[provider](model), get_rate_limiter(provider), concurrency)
+
+    @classmethod
+    def get_router(cls) -> BaseLLMClient:
+        """기본 제공자 + 보조 제공자(LLM_FALLBACK_PROVIDER) 라우터 반환 (싱글톤)"""
+        from app.core.llm_router import LLMRouter
+
+        if cls._router is None:
+            primary = settings.llm_provider
+            secondary = settings.llm_fallback_provider
+            cls._router = LLMRouter(
+                cls.get_client(primary),
+                cls.get_client(secondary) if secondary and secondary != primary else None,
+                primary_name=primary,
+                secondary_name=secondary
+            )
+        return cls._router
+
+    @classmethod
+    async def close_all(cls) -> None:
+        """생성된 클라이언트와 공유 연결 풀 정리 (서버 종료 시)"""
+        global _http_client
+        cls._clients.clear()
+        cls._router = None
+        if _http_client is not None:
+            await _http_client.aclose()
+            _http_client = None
+
+
+# 동일 요청 병합 (모든 SecureLLMClient 인스턴스가 공유)
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """LLM 요청 병합기 반환"""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight(window_seconds=settings.llm_single_flight_window_seconds)
+    return _single_flight
 
 
 # 개인정보 익명화가 적용된 LLM 호출 래퍼
 class SecureLLMClient:
     """개인정보 보호 기능이 내장된 LLM 클라이언트"""
 
-    def __init__(self, provider: Optional[str] = None):
-        self.client = LLMClientFactory.get_client(provider)
+    def __init__(self, provider: Optional[str] = None, model: Optional[str] = None):
+        self.client = LLMClientFactory.get_client(provider, model)
+        self.provider = provider or settings.llm_provider
         self.anonymize = settings.anonymize_personal_data
         self.preserve_amounts = settings.preserve_amounts_in_anonymization
 
@@ -234,7 +791,8 @@ class SecureLLMClient:
         messages: List[Dict[str, str]],
         temperature: float = 0.3,
         json_response: bool = False,
-        skip_anonymization: bool = False
+        skip_anonymization: bool = False,
+        max_tokens: Optional[int] = None
     ) -> str:
         """
         개인정보 익명화 후 LLM 호출
@@ -244,36 +802,136 @@ class SecureLLMClient:
             temperature: 생성 온도
             json_response: JSON 응답 요청
             skip_anonymization: 익명화 건너뛰기
+            max_tokens: 최대 응답 토큰 수
 
         Returns:
             LLM 응답 텍스트
         """
-        mappings = []
-
         # 익명화 적용
         if self.anonymize and not skip_anonymization:
-            processed_messages = []
-            for msg in messages:
-                if msg["role"] == "user":
-                    anonymized, mapping = anonymize_text(
-                        msg["content"],
-                        preserve_amounts=self.preserve_amounts
-                    )
-                    mappings.append(mapping)
-                    processed_messages.append({
-                        "role": msg["role"],
-                        "content": anonymized
-                    })
-                else:
-                    processed_messages.append(msg)
-            messages = processed_messages
-
-        # LLM 호출
-        response = await self.client.chat_completion(
-            messages, temperature, json_response
+            messages = self._anonymize_messages(messages)
+
+        # 의미 캐시 조회 (표현만 다른 같은 질문이면 저장된 응답 반환)
+        semantic = await self._semantic_lookup(messages, temperature, json_response, max_tokens)
+        if isinstance(semantic, CachedResponse):
+            return semantic
+
+        # LLM 호출 (동일한 요청이 진행 중이거나 방금 끝났으면 그 결과 공유)
+        call = lambda: self.client.chat_completion(messages, temperature, json_response, max_tokens)
+        if not settings.llm_single_flight_enabled:
+            reply = await call()
+        else:
+            key = self._request_key(messages, temperature, json_response, max_tokens)
+            reply = await get_single_flight().do(key, call)
+
+        if semantic is not None and self._is_cacheable(reply, json_response):
+            get_semantic_cache().store(current_endpoint(), *semantic, reply)
+        return reply
+
+    async def _semantic_lookup(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        json_response: bool,
+        max_tokens: Optional[int]
+    ) -> CachedResponse | Tuple[str, List[float]] | None:
+        """
+        의미 캐시 조회
+
+        Returns:
+            적중 시 CachedResponse, 미스 시 저장에 쓸 (네임스페이스, 질문 벡터),
+            현재 엔드포인트가 의미 캐시를 쓰지 않거나 조회할 수 없으면 None
+        """
+        endpoint = current_endpoint()
+        threshold = get_semantic_cache_threshold(endpoint)
+        if threshold is None or not messages or messages[-1].get("role") != "user":
+            return None
+
+        query = normalize_query(messages[-1].get("content") or "")
+        if not query:
+            return None
+        try:
+            # 임베딩 토큰은 응답 생성과 구분해 기록
+            with llm_endpoint("semantic_cache"):
+                vector = await self.client.get_embedding(query)
+        except Exception as e:
+            logger.warning(f"의미 캐시 임베딩 실패, 캐시 없이 호출합니다 ({endpoint}): {e}")
+            return None
+
+        namespace = make_namespace(endpoint, self.client.model, messages, temperature, json_response, max_tokens)
+        cached = get_semantic_cache().lookup(
+            endpoint, namespace, vector, threshold, provider=self.provider, model=self.client.model
+        )
+        return cached if cached is not None else (namespace, vector)
+
+    @staticmethod
+    def _is_cacheable(reply: str, json_response: bool) -> bool:
+        """빈 응답이나 형식이 깨진 JSON 응답은 비슷한 질문에 재사용하지 않음"""
+        if not reply or not reply.strip():
+            return False
+        return not json_response or repair_json(reply)[0] is not None
+
+    def _request_key(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        json_response: bool,
+        max_tokens: Optional[int]
+    ) -> str:
+        """익명화된 요청 내용 + 모델 + 생성 옵션 해시"""
+        raw = json.dumps(
+            [messages, self.client.model, temperature, json_response, max_tokens],
+            ensure_ascii=False,
+            sort_keys=True
         )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        skip_anonymization: bool = False,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        개인정보 익명화 후 LLM 스트리밍 호출
 
-        return response
+        의미 캐시 적중 시 저장된 응답 전체를 CachedResponse 조각 하나로 전달
+        """
+        if self.anonymize and not skip_anonymization:
+            messages = self._anonymize_messages(messages)
+
+        semantic = await self._semantic_lookup(messages, temperature, False, max_tokens)
+        if isinstance(semantic, CachedResponse):
+            yield semantic
+            return
+
+        chunks = []
+        async for token in self.client.chat_completion_stream(messages, temperature, max_tokens):
+            chunks.append(token)
+            yield token
+
+        # 끝까지 받은 응답만 저장 (중간에 끊긴 스트림은 저장하지 않음)
+        reply = "".join(chunks)
+        if semantic is not None and self._is_cacheable(reply, False):
+            get_semantic_cache().store(current_endpoint(), *semantic, reply)
+
+    def _anonymize_messages(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """사용자 메시지의 개인정보 익명화"""
+        processed_messages = []
+        for msg in messages:
+            if msg["role"] == "user":
+                anonymized, _ = anonymize_text(
+                    msg["content"],
+                    preserve_amounts=self.preserve_amounts
+                )
+                processed_messages.append({
+                    "role": msg["role"],
+                    "content": anonymized
+                })
+            else:
+                processed_messages.append(msg)
+        return processed_messages
 
     async def get_embedding(self, text: str, skip_anonymization: bool = False) -> List[float]:
         """개인정보 익명화 후 임베딩 생성"""
@@ -282,6 +940,13 @@ class SecureLLMClient:
 
         return await self.client.get_embedding(text)
 
+    async def get_embeddings(self, texts: List[str], skip_anonymization: bool = False) -> List[List[float]]:
+        """개인정보 익명화 후 여러 텍스트 임베딩 생성"""
+        if self.anonymize and not skip_anonymization:
+            texts = [anonymize_text(text, preserve_amounts=self.preserve_amounts)[0] for text in texts]
+
+        return await self.client.get_embeddings(texts)
+
 
 # 기본 클라이언트 인스턴스
 def get_llm_client(secure: bool = True) -> BaseLLMClient | SecureLLMClient:
@@ -296,6 +961,7 @@ def get_provider_info() -> Dict[str, Any]:
     return {
         "provider": settings.llm_provider,
         "model": settings.current_model,
+        "fallback_provider": settings.llm_fallback_provider or None,
         "anonymization_enabled": settings.anonymize_personal_data,
         "preserve_amounts": settings.preserve_amounts_in_anonymization,
     }
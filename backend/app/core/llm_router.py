@@ -0,0 +1,254 @@
+"""
+LLM 제공자 라우터 (헤지 요청 + 자동 장애 조치)
+- 기본 제공자 응답이 관측된 p95 지연 시간을 넘기면 보조 제공자에 같은 요청을 보내고 먼저 도착한 응답 사용
+- 기본 제공자 오류율이 임계값을 넘으면 일정 시간 동안 보조 제공자로 전환
+- 제공자 클라이언트를 주입받으므로 로컬 가짜 제공자로 테스트 가능
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.core.config import get_settings
+from app.core.llm_client import BaseLLMClient
+from app.core.metrics import LLM_FAILOVERS, LLM_HEDGES
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# p95 계산에 필요한 최소 표본 수 (부족하면 최소 헤지 지연 시간 사용)
+_MIN_LATENCY_SAMPLES = 20
+
+
+class ProviderRoute:
+    """라우팅 대상 제공자와 최근 지연 시간/오류 기록"""
+
+    def __init__(self, name: str, client: BaseLLMClient, window: int = 100):
+        self.name = name
+        self.client = client
+        self.latencies: deque = deque(maxlen=window)
+        self.outcomes: deque = deque(maxlen=window)
+        self.tripped_until = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.failovers = 0
+
+    def record(self, ok: bool, latency: Optional[float] = None) -> None:
+        self.requests += 1
+        self.outcomes.append(ok)
+        if not ok:
+            self.errors += 1
+        if ok and latency is not None:
+            self.latencies.append(latency)
+
+    def record_censored(self, latency: float) -> None:
+        """
+        끝나기 전에 취소된 요청의 경과 시간 기록 (실제 지연 시간의 하한)
+        - 헤지 요청이 이긴 느린 요청을 빼면 p95가 점점 낮아지므로 지연 시간 표본에만 포함
+        """
+        self.latencies.append(latency)
+
+    def p95(self) -> Optional[float]:
+        if len(self.latencies) < _MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def is_available(self) -> bool:
+        return time.monotonic() >= self.tripped_until
+
+    def trip(self, cooldown: float) -> None:
+        """장애 조치 전환 (쿨다운 후 새 표본으로 다시 판단)"""
+        self.tripped_until = time.monotonic() + cooldown
+        self.outcomes.clear()
+        self.failovers += 1
+        LLM_FAILOVERS.inc(provider=self.name)
+
+    def stats(self) -> Dict[str, Any]:
+        p95 = self.p95()
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate(), 3),
+            "p95_latency_seconds": round(p95, 3) if p95 is not None else None,
+            "available": self.is_available(),
+            "failovers": self.failovers,
+        }
+
+
+class LLMRouter(BaseLLMClient):
+    """기본/보조 제공자 간 헤지 요청 및 장애 조치 라우터"""
+
+    def __init__(
+        self,
+        primary: BaseLLMClient,
+        secondary: Optional[BaseLLMClient] = None,
+        primary_name: str = "primary",
+        secondary_name: str = "secondary",
+        hedge_enabled: Optional[bool] = None,
+        hedge_min_delay: Optional[float] = None,
+        failover_error_rate: Optional[float] = None,
+        failover_min_requests: Optional[int] = None,
+        failover_cooldown: Optional[float] = None,
+        window: Optional[int] = None
+    ):
+        window = window or settings.llm_latency_window
+        self.primary = ProviderRoute(primary_name, primary, window)
+        self.secondary = ProviderRoute(secondary_name, secondary, window) if secondary else None
+        self.model = primary.model
+        self.embedding_model = primary.embedding_model
+
+        self.hedge_enabled = settings.llm_hedge_enabled if hedge_enabled is None else hedge_enabled
+        self.hedge_min_delay = settings.llm_hedge_min_delay if hedge_min_delay is None else hedge_min_delay
+        self.failover_error_rate = (
+            settings.llm_failover_error_rate if failover_error_rate is None else failover_error_rate
+        )
+        self.failover_min_requests = (
+            settings.llm_failover_min_requests if failover_min_requests is None else failover_min_requests
+        )
+        self.failover_cooldown = (
+            settings.llm_failover_cooldown_seconds if failover_cooldown is None else failover_cooldown
+        )
+
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+
+    def _routes(self) -> List[ProviderRoute]:
+        """호출 순서 (기본 제공자 장애 조치 중이면 보조 제공자만)"""
+        if self.secondary is None:
+            return [self.primary]
+        if not self.primary.is_available():
+            return [self.secondary]
+        return [self.primary, self.secondary]
+
+    def _record(self, route: ProviderRoute, ok: bool, latency: Optional[float] = None) -> None:
+        route.record(ok, latency)
+        if (
+            route is self.primary
+            and self.secondary is not None
+            and len(route.outcomes) >= self.failover_min_requests
+            and route.error_rate() >= self.failover_error_rate
+        ):
+            logger.warning(
+                f"{route.name} 오류율 {route.error_rate():.0%}, "
+                f"{self.failover_cooldown:.0f}초 동안 {self.secondary.name}(으)로 전환"
+            )
+            route.trip(self.failover_cooldown)
+
+    def _hedge_delay(self) -> float:
+        p95 = self.primary.p95()
+        return max(self.hedge_min_delay, p95) if p95 is not None else self.hedge_min_delay
+
+    async def _call(self, route: ProviderRoute, messages, temperature, json_response, max_tokens) -> str:
+        start = time.monotonic()
+        try:
+            # 제공자에 따라 메시지를 수정하므로 요청마다 복사본 전달
+            result = await route.client.chat_completion(
+                [dict(msg) for msg in messages], temperature, json_response, max_tokens
+            )
+        except asyncio.CancelledError:
+            route.record_censored(time.monotonic() - start)
+            raise
+        except Exception:
+            self._record(route, False)
+            raise
+        self._record(route, True, time.monotonic() - start)
+        return result
+
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        json_response: bool = False,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        routes = self._routes()
+        first = asyncio.create_task(
+            self._call(routes[0], messages, temperature, json_response, max_tokens)
+        )
+        tasks = [first]
+        try:
+            if len(routes) == 1:
+                return await first
+
+            # 1. 기본 제공자가 p95 안에 끝나면 그대로 사용, 오류면 보조 제공자로 즉시 전환
+            timeout = self._hedge_delay() if self.hedge_enabled else None
+            done, _ = await asyncio.wait({first}, timeout=timeout)
+            if done:
+                try:
+                    return first.result()
+                except Exception as e:
+                    logger.warning(f"{routes[0].name} 호출 실패, {routes[1].name}(으)로 재요청: {e}")
+                    return await self._call(routes[1], messages, temperature, json_response, max_tokens)
+
+            # 2. 헤지 요청 후 먼저 성공한 응답 사용
+            self.hedged_requests += 1
+            hedge = asyncio.create_task(
+                self._call(routes[1], messages, temperature, json_response, max_tokens)
+            )
+            tasks.append(hedge)
+            pending = set(tasks)
+            errors = []
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        LLM_HEDGES.inc(provider=routes[1].name, won=str(task is hedge).lower())
+                        return task.result()
+                    errors.append(task.exception())
+            raise errors[0]
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        # 스트림은 헤지하지 않고, 첫 토큰 전에 실패하면 다음 제공자로 전환
+        routes = self._routes()
+        for position, route in enumerate(routes):
+            started = False
+            try:
+                async for token in route.client.chat_completion_stream(
+                    [dict(msg) for msg in messages], temperature, max_tokens
+                ):
+                    started = True
+                    yield token
+            except Exception as e:
+                self._record(route, False)
+                if started or position == len(routes) - 1:
+                    raise
+                logger.warning(f"{route.name} 스트리밍 실패, {routes[position + 1].name}(으)로 재요청: {e}")
+                continue
+            self._record(route, True)
+            return
+
+    async def get_embedding(self, text: str) -> List[float]:
+        # 제공자마다 임베딩 공간이 달라 섞어 쓸 수 없으므로 기본 제공자만 사용
+        return await self.primary.client.get_embedding(text)
+
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return await self.primary.client.get_embeddings(texts)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hedge_enabled": self.hedge_enabled,
+            "hedge_delay_seconds": round(self._hedge_delay(), 3),
+            "hedged_requests": self.hedged_requests,
+            "hedge_wins": self.hedge_wins,
+            "providers": {
+                route.name: route.stats()
+                for route in (self.primary, self.secondary) if route is not None
+            },
+        }
@@ -0,0 +1,265 @@
+"""
+Prometheus 형식 메트릭
+- 외부 라이브러리 없이 카운터/게이지/히스토그램과 텍스트 노출 형식(0.0.4) 지원
+- LLM 호출, 익명화, 법령 API, 문서 추출, 캐시 메트릭 정의
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# 지연 시간 히스토그램 기본 구간 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """라벨별 값을 가지는 메트릭 기본 클래스"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key: Tuple[str, ...], value) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(Metric):
+    """누적 카운터"""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """현재 값 게이지"""
+
+    type_name = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """구간별 분포 히스토그램"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._values[key] = state
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """블록 실행 시간 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _render_sample(self, key: Tuple[str, ...], state) -> List[str]:
+        lines = []
+        bounds = list(self.buckets) + [float("inf")]
+        counts = list(state["counts"]) + [state["count"]]
+        for bound, count in zip(bounds, counts):
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {count}")
+        lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(state['sum'])}")
+        lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {state['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 등록 및 텍스트 형식 출력"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets or DEFAULT_BUCKETS))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# LLM 호출
+LLM_REQUEST_DURATION = REGISTRY.histogram(
+    "llm_request_duration_seconds", "LLM API 호출 지연 시간",
+    ["provider", "model", "endpoint", "operation"]
+)
+LLM_REQUESTS = REGISTRY.counter(
+    "llm_requests_total", "LLM API 호출 수 (status: success | error)",
+    ["provider", "model", "endpoint", "operation", "status"]
+)
+LLM_TOKENS = REGISTRY.counter(
+    "llm_tokens_total", "LLM 토큰 사용량 (type: prompt | completion | cached_prompt)",
+    ["model", "endpoint", "type"]
+)
+LLM_RETRIES = REGISTRY.counter(
+    "llm_retries_total", "LLM API 재시도 수 (status: HTTP 상태 코드 또는 error)",
+    ["provider", "status"]
+)
+LLM_RATE_LIMIT_WAIT = REGISTRY.histogram(
+    "llm_rate_limit_wait_seconds", "속도 제한 대기 시간",
+    ["provider"]
+)
+LLM_COALESCED = REGISTRY.counter(
+    "llm_coalesced_requests_total", "동일 요청 병합 결과 (result: call | coalesced | window_hit)",
+    ["result"]
+)
+LLM_HEDGES = REGISTRY.counter(
+    "llm_hedged_requests_total", "헤지 요청 수 (won: 헤지 응답 채택 여부)",
+    ["provider", "won"]
+)
+LLM_FAILOVERS = REGISTRY.counter(
+    "llm_failovers_total", "보조 제공자 전환 수",
+    ["provider"]
+)
+LLM_CONCURRENCY_LIMIT = REGISTRY.gauge(
+    "llm_concurrency_limit", "제공자별 현재 동시 요청 한도 (AIMD)",
+    ["provider"]
+)
+LLM_IN_FLIGHT = REGISTRY.gauge(
+    "llm_in_flight_requests", "제공자별 진행 중인 요청 수",
+    ["provider"]
+)
+LLM_CONCURRENCY_DECREASES = REGISTRY.counter(
+    "llm_concurrency_decreases_total", "동시 요청 한도 감소 수 (reason: throttled | latency)",
+    ["provider", "reason"]
+)
+LLM_CASCADE_REQUESTS = REGISTRY.counter(
+    "llm_cascade_requests_total", "모델 단계별 요청 결과 (outcome: accepted | escalated | error)",
+    ["endpoint", "tier", "outcome"]
+)
+LLM_CASCADE_ESCALATIONS = REGISTRY.counter(
+    "llm_cascade_escalations_total",
+    "상위 모델 승급 수 (reason: invalid | no_confidence | low_confidence | borderline_risk | error)",
+    ["endpoint", "tier", "reason"]
+)
+LLM_CASCADE_TIER_DURATION = REGISTRY.histogram(
+    "llm_cascade_tier_duration_seconds", "모델 단계별 응답 지연 시간 (검증 포함)",
+    ["endpoint", "tier"]
+)
+STRUCTURED_OUTPUT = REGISTRY.counter(
+    "llm_structured_output_total",
+    "구조화 응답 처리 결과 (outcome: valid | repaired | reask | failed | escalated)",
+    ["schema", "outcome"]
+)
+
+# 캐시
+CACHE_REQUESTS = REGISTRY.counter(
+    "cache_requests_total",
+    "캐시 조회 수 (cache: document | clause | embedding | semantic, result: hit | miss, "
+    "model: 캐시된 응답을 만든 모델 또는 모델 단계 구성)",
+    ["cache", "provider", "model", "endpoint", "result"]
+)
+
+# 개인정보 익명화
+ANONYMIZATION_DURATION = REGISTRY.histogram(
+    "anonymization_duration_seconds", "개인정보 익명화 처리 시간",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+# 법령/판례 API
+LAW_API_DURATION = REGISTRY.histogram(
+    "law_api_request_duration_seconds", "법령/판례 API 호출 지연 시간",
+    ["api", "status"]
+)
+
+# 문서 텍스트 추출
+DOCUMENT_EXTRACTION_DURATION = REGISTRY.histogram(
+    "document_extraction_duration_seconds", "문서 텍스트 추출 시간",
+    ["format", "status"]
+)
+
+
+def render_metrics() -> str:
+    """전체 메트릭 (Prometheus 텍스트 형식)"""
+    return REGISTRY.render()
@@ -2,14 +2,80 @@
 계약서 분석용 AI 클라이언트
 다중 LLM 제공자 지원 + 개인정보 익명화
 """
-import json
+import asyncio
+import logging
 from typing import List, Dict, Optional
 
+from app.core.cascade import get_model_cascade, get_model_scope
 from app.core.config import get_settings
 from app.core.llm_client import SecureLLMClient, get_provider_info
+from app.core.structured_output import (
+    REASK_MESSAGE,
+    coerce_clause_analysis,
+    parse_clause_analysis,
+    record_outcome,
+    repair_json,
+)
+from app.core.token_budget import fit_messages, get_prompt_budget
+from app.core.tokens import estimate_tokens
+from app.core.usage import llm_endpoint
+from app.services.clause_cache import get_clause_cache
+from app.services.embedding_cache import get_embedding_cache
 
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# 분석 프롬프트 버전 (프롬프트 변경 시 올려서 기존 분석 캐시 무효화)
+ANALYSIS_PROMPT_VERSION = "2"
+
+# 조항 분석 시스템 프롬프트
+CLAUSE_ANALYSIS_SYSTEM_PROMPT = """당신은 한국 계약법 전문가입니다.
+계약서 조항을 분석하여 위험도를 평가합니다.
+
+주의사항:
+- 개인정보가 마스킹된 형태로 제공될 수 있습니다 (예: 홍**, ***-****-1234)
+- 마스킹된 정보는 그대로 유지하면서 분석해주세요.
+
+응답 형식 (JSON):
+{
+    "risk_score": 1-10 (10이 가장 위험),
+    "risk_level": "low" | "medium" | "high" | "critical",
+    "summary": "위험 요약 (1문장)",
+    "issues": ["문제점1", "문제점2"],
+    "legal_basis": "관련 법조항 또는 판례",
+    "suggestion": "수정 제안",
+    "confidence": 0.0-1.0 (분석 확신도, 판단 근거가 부족하거나 해석이 갈리면 낮게)
+}"""
+
+# 여러 조항 일괄 분석 시스템 프롬프트
+BATCH_CLAUSE_ANALYSIS_SYSTEM_PROMPT = """당신은 한국 계약법 전문가입니다.
+여러 개의 계약서 조항을 각각 분석하여 위험도를 평가합니다.
+
+주의사항:
+- 개인정보가 마스킹된 형태로 제공될 수 있습니다 (예: 홍**, ***-****-1234)
+- 마스킹된 정보는 그대로 유지하면서 분석해주세요.
+- 각 조항은 [조항 N] 형태로 구분되어 제공됩니다.
+- 모든 조항에 대해 하나씩 결과를 작성하고, index는 조항 번호 N과 같아야 합니다.
+
+응답 형식 (JSON):
+{
+    "results": [
+        {
+            "index": N,
+            "risk_score": 1-10 (10이 가장 위험),
+            "risk_level": "low" | "medium" | "high" | "critical",
+            "summary": "위험 요약 (1문장)",
+            "issues": ["문제점1", "문제점2"],
+            "legal_basis": "관련 법조항 또는 판례",
+            "suggestion": "수정 제안",
+            "confidence": 0.0-1.0 (분석 확신도)
+        }
+    ]
+}"""
+
+# 조항 하나당 예상 응답 토큰 수 (일괄 분석 예산 계산용)
+_EXPECTED_ANALYSIS_TOKENS = 200
 
 # 보안 LLM 클라이언트 (개인정보 익명화 적용)
 _secure_client: Optional[SecureLLMClient] = None
@@ -23,10 +89,137 @@ def _get_client() -> SecureLLMClient:
     return _secure_client
 
 
+async def _chat(
+    endpoint: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    json_response: bool,
+    client: Optional[SecureLLMClient] = None
+) -> str:
+    """분석 프롬프트 예산에 맞춘 뒤 LLM 호출 (토큰 사용량은 endpoint 이름으로 기록)"""
+    # 단계별 라우팅의 저가 모델 요청이면 해당 모델 기준으로 토큰 계산
+    model = client.client.model if client is not None else settings.current_model
+    messages = fit_messages(messages, get_prompt_budget("analysis"), model, endpoint)
+    with llm_endpoint(endpoint):
+        return await (client or _get_client()).chat_completion(
+            messages=messages,
+            temperature=temperature,
+            json_response=json_response
+        )
+
+
+async def _chat_clause_analysis(endpoint: str, messages: List[Dict[str, str]]) -> Optional[dict]:
+    """
+    조항 분석 JSON 요청 + ClauseAnalysis 스키마 검증
+    - 단계별 라우팅 적용 시 저가 모델 응답을 먼저 검토하고 필요할 때만 기본 모델로 승급
+
+    Returns:
+        검증된 분석 결과, 다시 요청해도 실패하면 None
+    """
+    cascade = get_model_cascade(endpoint)
+    if cascade is None:
+        return await _request_clause_analysis(None, endpoint, messages, reask=True)
+
+    return await cascade.run(
+        endpoint,
+        lambda client, final: _request_clause_analysis(client, endpoint, messages, reask=final),
+        _analysis_escalation_reason
+    )
+
+
+def _analysis_escalation_reason(result: Optional[dict]) -> Optional[str]:
+    """저가 모델 분석 결과를 기본 모델로 다시 요청할 사유 (믿을 수 있으면 None)"""
+    if result is None:
+        return "invalid"
+    confidence = result.get("confidence")
+    if confidence is None:
+        return "no_confidence"
+    if confidence < settings.llm_cascade_min_confidence:
+        return "low_confidence"
+    # 판례 검색/수정안 생성 여부가 갈리는 경계값 근처 점수는 기본 모델로 확인
+    if abs(result["risk_score"] - settings.llm_cascade_risk_threshold) <= settings.llm_cascade_risk_margin:
+        return "borderline_risk"
+    return None
+
+
+async def _request_clause_analysis(
+    client: Optional[SecureLLMClient],
+    endpoint: str,
+    messages: List[Dict[str, str]],
+    reask: bool
+) -> Optional[dict]:
+    """
+    조항 분석 요청 1회
+    - 형식 오류는 로컬에서 복구하고, 복구할 수 없으면 reask일 때만 한 번 다시 요청
+    """
+    response = await _chat(endpoint, messages, temperature=0.3, json_response=True, client=client)
+    result, outcome = parse_clause_analysis(response)
+    if result is not None:
+        record_outcome("clause_analysis", outcome)
+        return result
+
+    if not reask:
+        # 상위 모델로 승급하므로 같은 모델에 다시 요청하지 않음
+        record_outcome("clause_analysis", "escalated")
+        return None
+
+    record_outcome("clause_analysis", "reask")
+    logger.warning(f"조항 분석 응답 형식 오류, 다시 요청합니다 ({endpoint}): {response[:200]!r}")
+    retry_messages = messages + [
+        {"role": "assistant", "content": response or ""},
+        {"role": "user", "content": REASK_MESSAGE},
+    ]
+    response = await _chat(f"{endpoint}_reask", retry_messages, temperature=0.0, json_response=True, client=client)
+    result, outcome = parse_clause_analysis(response)
+    record_outcome("clause_analysis", outcome if result is not None else "failed")
+    return result
+
+
 async def get_embedding(text: str) -> List[float]:
-    """텍스트를 벡터 임베딩으로 변환 (개인정보 익명화 적용)"""
+    """텍스트를 벡터 임베딩으로 변환 (개인정보 익명화 적용, 임베딩 캐시 사용)"""
+    return (await get_embeddings([text]))[0]
+
+
+async def get_embeddings(texts: List[str]) -> List[List[float]]:
+    """
+    여러 텍스트를 한 번에 벡터 임베딩으로 변환
+    - 개인정보 익명화 적용, 입력 순서 유지
+    - 이전에 임베딩한 텍스트는 캐시에서 가져오고 나머지만 요청
+    """
     client = _get_client()
-    return await client.get_embedding(text)
+    if not settings.embedding_cache_enabled or not texts:
+        return await client.get_embeddings(texts)
+
+    cache = get_embedding_cache()
+    model = client.client.embedding_model or settings.embedding_model
+    keys = [cache.make_key(text, model, anonymized=client.anonymize) for text in texts]
+
+    provider = client.client.embedding_provider or client.provider
+    cached = await asyncio.to_thread(lambda: [cache.get(model, key, provider) for key in keys])
+    vectors: List[Optional[List[float]]] = [
+        vector.tolist() if vector is not None else None for vector in cached
+    ]
+
+    # 캐시에 없는 텍스트만 중복 없이 요청
+    missing: Dict[str, str] = {
+        keys[i]: texts[i] for i, vector in enumerate(vectors) if vector is None
+    }
+    if missing:
+        embedded = dict(zip(missing, await client.get_embeddings(list(missing.values()))))
+        for i, key in enumerate(keys):
+            if vectors[i] is None:
+                vectors[i] = embedded[key]
+
+        def store() -> None:
+            for key, vector in embedded.items():
+                cache.put(model, key, vector)
+
+        try:
+            await asyncio.to_thread(store)
+        except (OSError, ValueError) as e:
+            logger.warning(f"임베딩 캐시 저장 실패: {e}")
+
+    return vectors
 
 
 async def analyze_clause(clause: str, context: str = "") -> dict:
@@ -34,48 +227,145 @@ async def analyze_clause(clause: str, context: str = "") -> dict:
     계약 조항 위험도 분석
     - 개인정보 자동 익명화 후 분석
     - 다중 LLM 제공자 지원
+    - 동일(정규화 기준) 조항의 이전 분석 결과가 있으면 재사용
     """
-    system_prompt = """당신은 한국 계약법 전문가입니다.
-계약서 조항을 분석하여 위험도를 평가합니다.
-
-주의사항:
-- 개인정보가 마스킹된 형태로 제공될 수 있습니다 (예: 홍**, ***-****-1234)
-- 마스킹된 정보는 그대로 유지하면서 분석해주세요.
-
-응답 형식 (JSON):
-{
-    "risk_score": 1-10 (10이 가장 위험),
-    "risk_level": "low" | "medium" | "high" | "critical",
-    "summary": "위험 요약 (1문장)",
-    "issues": ["문제점1", "문제점2"],
-    "legal_basis": "관련 법조항 또는 판례",
-    "suggestion": "수정 제안"
-}"""
+    cache_key = None
+    if settings.clause_cache_enabled:
+        model_scope = get_model_scope("clause_analysis")
+        cache_key = get_clause_cache().make_key(clause, context, model_scope, ANALYSIS_PROMPT_VERSION)
+        cached = get_clause_cache().get(cache_key, model_scope, "clause_analysis")
+        if cached is not None:
+            return cached
 
     messages = [
-        {"role": "system", "content": system_prompt},
+        {"role": "system", "content": CLAUSE_ANALYSIS_SYSTEM_PROMPT},
         {"role": "user", "content": f"조항: {clause}\n\n컨텍스트: {context}"}
     ]
 
-    client = _get_client()
-    response = await client.chat_completion(
-        messages=messages,
-        temperature=0.3,
-        json_response=True
-    )
+    result = await _chat_clause_analysis("clause_analysis", messages)
+    if result is None:
+        # 다시 요청해도 형식이 맞지 않으면 기본값 반환 (캐시하지 않음)
+        return _unparsed_analysis()
+
+    if cache_key is not None:
+        get_clause_cache().set(cache_key, result)
+    return result
+
+
+def _unparsed_analysis() -> dict:
+    """응답을 해석할 수 없을 때의 기본 분석 결과"""
+    return {
+        "risk_score": 5,
+        "risk_level": "medium",
+        "summary": "분석 결과를 파싱할 수 없습니다.",
+        "issues": ["분석 재시도가 필요합니다."],
+        "legal_basis": "",
+        "suggestion": "",
+        "failed": True
+    }
+
+
+def is_failed_analysis(analysis: dict) -> bool:
+    """분석 실패 시의 기본 결과인지 여부 (캐시하지 않음)"""
+    return bool(analysis.get("failed"))
+
 
+def pack_clause_batches(clauses: List[str]) -> List[List[int]]:
+    """
+    토큰 예산 안에서 조항들을 묶음으로 구성
+    - 조항 순서를 유지하며, 한 조항이 예산을 넘으면 단독 묶음으로 처리
+
+    Returns:
+        조항 인덱스 목록의 목록
+    """
+    budget = settings.clause_batch_token_budget - estimate_tokens(BATCH_CLAUSE_ANALYSIS_SYSTEM_PROMPT)
+    max_size = max(1, settings.clause_batch_max_size)
+
+    batches: List[List[int]] = []
+    current: List[int] = []
+    used = 0
+
+    for index, clause in enumerate(clauses):
+        cost = estimate_tokens(clause) + _EXPECTED_ANALYSIS_TOKENS
+        if current and (used + cost > budget or len(current) >= max_size):
+            batches.append(current)
+            current, used = [], 0
+        current.append(index)
+        used += cost
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def analyze_clauses_batch(clauses: List[str], context: str = "") -> List[dict]:
+    """
+    여러 조항을 한 번의 요청으로 분석
+    - 캐시된 조항은 요청에서 제외
+    - 응답에서 누락되었거나 형식이 잘못된 조항은 개별 분석으로 재시도
+
+    Returns:
+        입력 순서와 같은 분석 결과 목록
+    """
+    results: List[Optional[dict]] = [None] * len(clauses)
+    cache_keys: List[Optional[str]] = [None] * len(clauses)
+
+    if settings.clause_cache_enabled:
+        model_scope = get_model_scope("clause_analysis")
+        for i, clause in enumerate(clauses):
+            cache_keys[i] = get_clause_cache().make_key(clause, context, model_scope, ANALYSIS_PROMPT_VERSION)
+            results[i] = get_clause_cache().get(cache_keys[i], model_scope, "clause_batch")
+
+    pending = [i for i, result in enumerate(results) if result is None]
+
+    if len(pending) > 1:
+        numbered = "\n\n".join(f"[조항 {n}]\n{clauses[i]}" for n, i in enumerate(pending, 1))
+        messages = [
+            {"role": "system", "content": BATCH_CLAUSE_ANALYSIS_SYSTEM_PROMPT},
+            {"role": "user", "content": f"{numbered}\n\n컨텍스트: {context}"}
+        ]
+
+        # 형식 오류는 로컬에서 복구, 복구할 수 없는 조항만 아래에서 개별 분석
+        response = await _chat("clause_batch", messages, temperature=0.3, json_response=True)
+        parsed, repaired = repair_json(response)
+        if parsed is None:
+            parsed = {}
+
+        # 배열을 그대로 반환한 경우도 허용
+        items = parsed if isinstance(parsed, list) else parsed.get("results", [])
+        for item in items if isinstance(items, list) else []:
+            if not _is_valid_batch_item(item, len(pending)):
+                continue
+            i = pending[int(item["index"]) - 1]
+            if results[i] is not None:
+                continue
+            analysis, coerced = coerce_clause_analysis({k: v for k, v in item.items() if k != "index"})
+            if analysis is None:
+                continue
+            record_outcome("clause_batch", "repaired" if repaired or coerced else "valid")
+            results[i] = analysis
+            if cache_keys[i] is not None:
+                get_clause_cache().set(cache_keys[i], analysis)
+
+    # 누락/손상된 조항은 개별 분석
+    retry = [i for i in pending if results[i] is None]
+    if retry:
+        retried = await asyncio.gather(*(analyze_clause(clauses[i], context) for i in retry))
+        for i, analysis in zip(retry, retried):
+            results[i] = analysis
+
+    return results
+
+
+def _is_valid_batch_item(item, batch_size: int) -> bool:
+    """일괄 분석 응답 항목의 조항 번호 검증 (분석 내용은 coerce_clause_analysis로 검증)"""
+    if not isinstance(item, dict):
+        return False
     try:
-        return json.loads(response)
-    except json.JSONDecodeError:
-        # JSON 파싱 실패 시 기본값 반환
-        return {
-            "risk_score": 5,
-            "risk_level": "medium",
-            "summary": "분석 결과를 파싱할 수 없습니다.",
-            "issues": ["분석 재시도가 필요합니다."],
-            "legal_basis": "",
-            "suggestion": ""
-        }
+        index = int(item.get("index"))
+    except (TypeError, ValueError):
+        return False
+    return 1 <= index <= batch_size
 
 
 async def generate_alternative_clause(original: str, issues: List[str]) -> str:
@@ -96,12 +386,7 @@ async def generate_alternative_clause(original: str, issues: List[str]) -> str:
         {"role": "user", "content": f"원본 조항:\n{original}\n\n문제점:\n" + "\n".join(issues)}
     ]
 
-    client = _get_client()
-    return await client.chat_completion(
-        messages=messages,
-        temperature=0.5,
-        json_response=False
-    )
+    return await _chat("alternative_clause", messages, temperature=0.5, json_response=False)
 
 
 async def analyze_with_context(
@@ -140,17 +425,8 @@ async def analyze_with_context(
         {"role": "user", "content": user_content}
     ]
 
-    client = _get_client()
-    response = await client.chat_completion(
-        messages=messages,
-        temperature=0.3,
-        json_response=True
-    )
-
-    try:
-        return json.loads(response)
-    except json.JSONDecodeError:
-        return await analyze_clause(clause, context)
+    result = await _chat_clause_analysis("analysis_with_context", messages)
+    return result if result is not None else _unparsed_analysis()
 
 
 def get_current_provider_info() -> Dict:
@@ -0,0 +1,253 @@
+"""
+LLM API 호출 속도 제한 및 재시도 유틸리티
+- 제공자별 토큰 버킷 (분당 요청 수, 분당 토큰 수)
+- 429/일시적 5xx/연결 오류 시 지수 백오프(지터) 재시도, Retry-After 헤더 우선
+- 대기 시간/재시도 통계
+"""
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from app.core.config import get_settings
+from app.core.metrics import LLM_RATE_LIMIT_WAIT, LLM_RETRIES
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# 재시도 대상 HTTP 상태 코드 (그 외 5xx 포함)
+_RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+# SDK 연결/타임아웃 예외 (openai, anthropic 공통 이름)
+_RETRYABLE_ERROR_NAMES = {"APIConnectionError", "APITimeoutError"}
+
+
+class TokenBucket:
+    """분당 보충량 기준 토큰 버킷 (먼저 요청한 순서대로 대기)"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        # 버킷 용량보다 큰 요청은 용량만큼만 차감 (무한 대기 방지)
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class ProviderRateLimiter:
+    """제공자별 요청/토큰 속도 제한 + 대기 통계"""
+
+    def __init__(self, provider: str, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self.provider = provider
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+
+        self.requests = 0
+        self.waiting = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.retries = 0
+        self.rate_limited = 0
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """
+        요청 1건과 예상 토큰 수만큼 대기 후 차감
+
+        Returns:
+            대기한 시간 (초)
+        """
+        start = time.monotonic()
+        self.waiting += 1
+        try:
+            if self.request_bucket:
+                await self.request_bucket.acquire(1)
+            if self.token_bucket and tokens > 0:
+                await self.token_bucket.acquire(tokens)
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - start
+        self.requests += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        LLM_RATE_LIMIT_WAIT.observe(waited, provider=self.provider)
+        return waited
+
+    def record_retry(self, error: Exception) -> None:
+        self.retries += 1
+        status = get_status_code(error)
+        if status == 429:
+            self.rate_limited += 1
+        LLM_RETRIES.inc(provider=self.provider, status=status or "error")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "requests": self.requests,
+            "waiting": self.waiting,
+            "total_wait_seconds": round(self.total_wait_seconds, 3),
+            "average_wait_seconds": round(self.total_wait_seconds / self.requests, 3) if self.requests else 0.0,
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+        }
+
+
+def get_status_code(error: Exception) -> Optional[int]:
+    """예외에서 HTTP 상태 코드 추출 (없으면 None)"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """재시도하면 성공할 수 있는 오류인지 (429, 일시적 5xx, 연결/타임아웃)"""
+    status = get_status_code(error)
+    if status is not None:
+        return status in _RETRYABLE_STATUS_CODES or status >= 500
+    if isinstance(error, (httpx.TransportError, asyncio.TimeoutError)):
+        return True
+    return any(cls.__name__ in _RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+
+def is_timeout_error(error: BaseException) -> bool:
+    """응답 대기 시간 초과 오류인지 (asyncio, httpx, 제공자 SDK의 APITimeoutError)"""
+    if isinstance(error, (httpx.TimeoutException, asyncio.TimeoutError)):
+        return True
+    return any(cls.__name__ == "APITimeoutError" for cls in type(error).__mro__)
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """응답의 Retry-After 헤더 값 (초), 없으면 None"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def get_backoff_delay(error: Exception, attempt: int) -> float:
+    """재시도 전 대기 시간 (Retry-After 우선, 없으면 full jitter 지수 백오프)"""
+    retry_after = get_retry_after(error)
+    if retry_after is not None:
+        return min(retry_after, settings.llm_retry_max_delay)
+    return random.uniform(0, min(settings.llm_retry_max_delay, settings.llm_retry_base_delay * (2 ** attempt)))
+
+
+async def call_with_retry(
+    func: Callable[[], Awaitable[Any]],
+    limiter: Optional[ProviderRateLimiter] = None,
+    tokens: int = 0,
+    max_retries: Optional[int] = None
+) -> Any:
+    """
+    속도 제한 대기 후 호출, 일시적 오류는 백오프 후 재시도
+
+    Args:
+        func: 호출할 코루틴 함수 (재시도마다 다시 호출)
+        limiter: 제공자 속도 제한기
+        tokens: 요청 예상 토큰 수
+        max_retries: 최대 재시도 횟수 (기본값: 설정값)
+    """
+    max_retries = settings.llm_max_retries if max_retries is None else max_retries
+    attempt = 0
+    while True:
+        if limiter:
+            await limiter.acquire(tokens)
+        try:
+            return await func()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable_error(e):
+                raise
+            delay = get_backoff_delay(e, attempt)
+            attempt += 1
+            if limiter:
+                limiter.record_retry(e)
+            logger.warning(
+                f"LLM API 호출 실패, {delay:.1f}초 후 재시도 ({attempt}/{max_retries}): {e}"
+            )
+            await asyncio.sleep(delay)
+
+
+def parse_rate_limit_overrides(value: str) -> Dict[str, tuple]:
+    """
+    제공자별 속도 제한 설정 파싱
+
+    형식: "upstage:100:50000,anthropic:50:40000" (제공자:분당 요청 수:분당 토큰 수)
+    """
+    overrides = {}
+    for item in (value or "").split(","):
+        parts = [part.strip() for part in item.split(":")]
+        if len(parts) != 3 or not parts[0]:
+            continue
+        try:
+            overrides[parts[0]] = (int(parts[1]), int(parts[2]))
+        except ValueError:
+            logger.warning(f"잘못된 속도 제한 설정 무시: {item}")
+    return overrides
+
+
+# 제공자별 속도 제한기
+_limiters: Dict[str, ProviderRateLimiter] = {}
+
+
+def get_rate_limiter(provider: str) -> ProviderRateLimiter:
+    """제공자 속도 제한기 반환 (싱글톤)"""
+    if provider not in _limiters:
+        overrides = parse_rate_limit_overrides(settings.llm_rate_limit_overrides)
+        rpm, tpm = overrides.get(
+            provider,
+            (settings.llm_requests_per_minute, settings.llm_tokens_per_minute)
+        )
+        _limiters[provider] = ProviderRateLimiter(provider, rpm, tpm)
+    return _limiters[provider]
+
+
+def get_rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """제공자별 속도 제한/재시도 통계"""
+    return {provider: limiter.stats() for provider, limiter in _limiters.items()}
@@ -0,0 +1,298 @@
+"""
+의미 기반 LLM 응답 캐시
+- 마지막 사용자 메시지(정규화)를 임베딩해 같은 네임스페이스의 저장된 질문과 코사인 유사도 비교
+  ("퇴직금 못 받았어요" / "퇴직금을 못 받았습니다"처럼 표현만 다른 질문에 저장된 응답 재사용)
+- 네임스페이스: 엔드포인트 + 모델 + 생성 옵션 + 앞선 메시지(시스템 프롬프트, 대화, 컨텍스트) 해시
+- 정규화된 벡터를 하나의 NumPy 행렬에 보관하고 행렬-벡터 곱 한 번으로 전체 검색
+- 크기 제한(가장 오래 사용되지 않은 항목 제거) + TTL, 엔드포인트별 사용 설정
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.metrics import CACHE_REQUESTS
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = re.compile(r"[\s.?!~…]+$")
+
+
+class CachedResponse(str):
+    """캐시에서 가져온 응답 (일반 문자열처럼 사용, cache_hit/similarity 속성 추가)"""
+
+    cache_hit = True
+
+    def __new__(cls, text: str, similarity: float = 1.0):
+        response = super().__new__(cls, text)
+        response.similarity = similarity
+        return response
+
+
+def is_cache_hit(response: Any) -> bool:
+    """응답이 의미 캐시에서 온 것인지 여부"""
+    return getattr(response, "cache_hit", False)
+
+
+def normalize_query(text: str) -> str:
+    """임베딩 전 질문 정규화 (전각/반각, 대소문자, 공백, 끝의 문장 부호 차이 제거)"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = _WHITESPACE.sub(" ", text).strip()
+    return _TRAILING_PUNCTUATION.sub("", text)
+
+
+def parse_semantic_cache_endpoints(value: str, default_threshold: float) -> Dict[str, float]:
+    """
+    의미 캐시 적용 엔드포인트 설정 파싱
+
+    형식: "labor_chat:0.92,chat,clause_analysis:0.97" (엔드포인트[:유사도 임계값])
+    """
+    endpoints = {}
+    for item in (value or "").split(","):
+        parts = [part.strip() for part in item.split(":")]
+        if not parts[0]:
+            continue
+        try:
+            endpoints[parts[0]] = float(parts[1]) if len(parts) > 1 and parts[1] else default_threshold
+        except ValueError:
+            logger.warning(f"잘못된 의미 캐시 설정 무시: {item}")
+    return endpoints
+
+
+def make_namespace(
+    endpoint: str,
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    json_response: bool,
+    max_tokens: Optional[int]
+) -> str:
+    """마지막 메시지를 제외한 요청 내용 해시 (같은 맥락의 질문끼리만 비교)"""
+    raw = json.dumps(
+        [endpoint, model, messages[:-1], temperature, json_response, max_tokens],
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class SemanticCache:
+    """정규화된 질문 벡터 행렬 + 응답 목록 (스레드 안전)"""
+
+    def __init__(self, max_size: int = 2048, ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            max_size: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+            ttl_seconds: 항목 유효 시간 (None이면 만료 없음)
+        """
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._reset()
+
+        self.evictions = 0
+        # 엔드포인트별 적중/미스/저장 수
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def _reset(self) -> None:
+        self.dim: Optional[int] = None
+        self._vectors: Optional[np.ndarray] = None
+        # 행별 네임스페이스 번호 (-1이면 빈 행)
+        self._namespace_rows = np.full(self.max_size, -1, dtype=np.int64)
+        self._stored_at = np.zeros(self.max_size)
+        self._last_used = np.zeros(self.max_size)
+        self._responses: List[Optional[str]] = [None] * self.max_size
+        self._namespace_ids: Dict[str, int] = {}
+        self._namespace_sizes: Dict[int, int] = {}
+        self._next_namespace_id = 0
+        # 한 번이라도 사용한 행 수 (검색 범위)
+        self._used_rows = 0
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> Optional[np.ndarray]:
+        array = np.asarray(vector, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(array))
+        return array / norm if norm > 0 else None
+
+    def _count(self, endpoint: str, result: str) -> None:
+        counts = self._counts.setdefault(endpoint, {"hits": 0, "misses": 0, "stores": 0})
+        counts[result] += 1
+
+    def lookup(
+        self,
+        endpoint: str,
+        namespace: str,
+        vector: List[float],
+        threshold: float,
+        provider: str = "",
+        model: str = ""
+    ) -> Optional[CachedResponse]:
+        """
+        같은 네임스페이스에서 유사도가 임계값 이상인 가장 가까운 질문의 응답
+
+        Args:
+            provider / model: 메트릭 라벨 (응답을 만드는 제공자/모델)
+
+        Returns:
+            CachedResponse (similarity 포함) 또는 None
+        """
+        query = self._normalize(vector)
+        with self._lock:
+            response = self._lookup(namespace, query, threshold)
+            self._count(endpoint, "misses" if response is None else "hits")
+        CACHE_REQUESTS.inc(
+            cache="semantic",
+            provider=provider,
+            model=model,
+            endpoint=endpoint,
+            result="miss" if response is None else "hit"
+        )
+        return response
+
+    def _lookup(self, namespace: str, query: Optional[np.ndarray], threshold: float) -> Optional[CachedResponse]:
+        namespace_id = self._namespace_ids.get(namespace)
+        if query is None or namespace_id is None or self.dim is None or query.shape[0] != self.dim:
+            return None
+
+        rows = self._used_rows
+        mask = self._namespace_rows[:rows] == namespace_id
+        if self.ttl_seconds is not None:
+            mask &= self._stored_at[:rows] >= time.monotonic() - self.ttl_seconds
+        if not mask.any():
+            return None
+
+        # 정규화된 벡터이므로 내적이 곧 코사인 유사도
+        scores = np.where(mask, self._vectors[:rows] @ query, -np.inf)
+        best = int(np.argmax(scores))
+        similarity = float(scores[best])
+        if similarity < threshold:
+            return None
+
+        self._last_used[best] = time.monotonic()
+        return CachedResponse(self._responses[best], similarity=similarity)
+
+    def store(self, endpoint: str, namespace: str, vector: List[float], response: str) -> None:
+        """질문 벡터와 응답 저장 (가득 차면 만료된 항목, 없으면 가장 오래 사용되지 않은 항목 교체)"""
+        query = self._normalize(vector)
+        if query is None:
+            return
+
+        with self._lock:
+            if self.dim is not None and query.shape[0] != self.dim:
+                # 임베딩 모델이 바뀌면 기존 벡터와 비교할 수 없으므로 비움
+                logger.info(f"임베딩 차원 변경 ({self.dim} → {query.shape[0]}), 의미 캐시를 비웁니다")
+                self._reset()
+            if self._vectors is None:
+                self.dim = query.shape[0]
+                self._vectors = np.zeros((self.max_size, self.dim), dtype=np.float32)
+
+            row = self._free_row()
+            if self._namespace_rows[row] >= 0:
+                self._remove_row(row)
+                self.evictions += 1
+
+            namespace_id = self._namespace_ids.get(namespace)
+            if namespace_id is None:
+                namespace_id = self._next_namespace_id
+                self._next_namespace_id += 1
+                self._namespace_ids[namespace] = namespace_id
+            self._namespace_sizes[namespace_id] = self._namespace_sizes.get(namespace_id, 0) + 1
+
+            now = time.monotonic()
+            self._vectors[row] = query
+            self._namespace_rows[row] = namespace_id
+            self._stored_at[row] = now
+            self._last_used[row] = now
+            self._responses[row] = str(response)
+            self._used_rows = max(self._used_rows, row + 1)
+            self._count(endpoint, "stores")
+
+    def _free_row(self) -> int:
+        if self._used_rows < self.max_size:
+            return self._used_rows
+        empty = np.flatnonzero(self._namespace_rows < 0)
+        if empty.size:
+            return int(empty[0])
+        if self.ttl_seconds is not None:
+            expired = np.flatnonzero(self._stored_at < time.monotonic() - self.ttl_seconds)
+            if expired.size:
+                return int(expired[0])
+        return int(np.argmin(self._last_used))
+
+    def _remove_row(self, row: int) -> None:
+        namespace_id = int(self._namespace_rows[row])
+        self._namespace_rows[row] = -1
+        self._responses[row] = None
+        remaining = self._namespace_sizes.get(namespace_id, 1) - 1
+        if remaining > 0:
+            self._namespace_sizes[namespace_id] = remaining
+            return
+        # 더 이상 항목이 없는 네임스페이스 정리 (대화마다 새 네임스페이스가 생기므로)
+        self._namespace_sizes.pop(namespace_id, None)
+        for namespace, value in list(self._namespace_ids.items()):
+            if value == namespace_id:
+                del self._namespace_ids[namespace]
+                break
+
+    def clear(self) -> int:
+        with self._lock:
+            count = int((self._namespace_rows >= 0).sum())
+            self._reset()
+            return count
+
+    def __len__(self) -> int:
+        return int((self._namespace_rows >= 0).sum())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints = {}
+            for endpoint, counts in self._counts.items():
+                lookups = counts["hits"] + counts["misses"]
+                endpoints[endpoint] = {
+                    **counts,
+                    "hit_rate": round(counts["hits"] / lookups, 3) if lookups else 0.0,
+                }
+            return {
+                "size": int((self._namespace_rows >= 0).sum()),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "dim": self.dim,
+                "namespaces": len(self._namespace_ids),
+                "evictions": self.evictions,
+                "endpoints": endpoints,
+            }
+
+
+# 싱글톤 인스턴스
+_semantic_cache: Optional[SemanticCache] = None
+
+
+def get_semantic_cache() -> SemanticCache:
+    """의미 캐시 인스턴스 반환"""
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache(
+            max_size=settings.semantic_cache_size,
+            ttl_seconds=settings.semantic_cache_ttl_seconds or None
+        )
+    return _semantic_cache
+
+
+def get_semantic_cache_threshold(endpoint: str) -> Optional[float]:
+    """엔드포인트의 유사도 임계값 (의미 캐시를 쓰지 않으면 None)"""
+    if not settings.semantic_cache_enabled:
+        return None
+    endpoints = parse_semantic_cache_endpoints(
+        settings.semantic_cache_endpoints, settings.semantic_cache_threshold
+    )
+    return endpoints.get(endpoint)
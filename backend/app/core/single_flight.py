@@ -0,0 +1,66 @@
+"""
+동일 요청 병합 (single-flight)
+- 같은 키의 요청이 진행 중이면 새로 호출하지 않고 진행 중인 호출 결과를 함께 기다림
+- 완료된 결과는 짧은 시간 동안 보관해 직후의 재시도/중복 요청에도 재사용
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from app.core.cache import LRUCache
+from app.core.metrics import LLM_COALESCED
+
+
+class SingleFlight:
+    """키 단위 진행 중 호출 병합 + 완료 결과 단기 보관"""
+
+    def __init__(self, window_seconds: float = 0, max_size: int = 1024):
+        """
+        Args:
+            window_seconds: 완료된 결과 보관 시간 (0이면 보관하지 않음)
+            max_size: 보관할 최대 결과 수
+        """
+        self.window_seconds = window_seconds
+        self.recent = LRUCache(max_size=max_size, ttl_seconds=window_seconds) if window_seconds > 0 else None
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.window_hits = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        if self.recent is not None:
+            result = self.recent.get(key)
+            if result is not None:
+                self.window_hits += 1
+                LLM_COALESCED.inc(result="window_hit")
+                return result
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            LLM_COALESCED.inc(result="call")
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+            LLM_COALESCED.inc(result="coalesced")
+
+        # 기다리던 요청 하나가 취소되어도 다른 대기자의 호출은 계속 진행
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled():
+            return
+        if task.exception() is None and self.recent is not None and task.result() is not None:
+            self.recent.set(key, task.result())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "window_hits": self.window_hits,
+            "in_flight": len(self._inflight),
+            "window_seconds": self.window_seconds,
+        }
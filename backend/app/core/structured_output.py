@@ -0,0 +1,274 @@
+"""
+LLM 구조화 응답(JSON) 검증 및 로컬 복구
+- ClauseAnalysis 스키마로 검증
+- 흔한 형식 오류는 다시 요청하지 않고 직접 고침
+  (코드 블록 표시, 앞뒤 설명 문장, 끝의 쉼표, 잘린 객체, 문자열/실수 점수, 누락된 위험 등급)
+- 결과(valid | repaired | reask | failed | escalated)를 스키마별로 집계
+"""
+import json
+import re
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.core.metrics import STRUCTURED_OUTPUT
+from app.models.schemas import ClauseAnalysis
+
+
+_CODE_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)(?:```|$)", re.S)
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_DANGLING_KEY = re.compile(r',?\s*"(?:[^"\\]|\\.)*"\s*:?\s*$')
+_KEY_AT_END = re.compile(r'[{,]\s*"(?:[^"\\]|\\.)*"$')
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+_REQUIRED_FIELDS = ("risk_score", "risk_level", "summary", "issues")
+
+_RISK_LEVELS = ("low", "medium", "high", "critical")
+_RISK_LEVEL_ALIASES = {
+    "낮음": "low",
+    "보통": "medium",
+    "중간": "medium",
+    "높음": "high",
+    "매우 높음": "critical",
+    "심각": "critical",
+}
+
+# 형식 오류 시 다시 요청할 때 덧붙이는 메시지
+REASK_MESSAGE = "이전 응답이 지정된 JSON 형식이 아닙니다. 설명 없이 지정된 형식의 JSON 객체만 다시 응답해주세요."
+
+
+def _close_truncated(text: str) -> str:
+    """응답 길이 제한 등으로 잘린 JSON의 열린 문자열/괄호 닫기"""
+    stack = []
+    in_string = False
+    escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+
+    if in_string:
+        text += '"'
+    text = text.rstrip()
+    # 값이 없는 마지막 키 또는 끝의 쉼표 제거
+    if stack and stack[-1] == "}" and _ends_with_key(text):
+        text = _DANGLING_KEY.sub("", text)
+    text = text.rstrip().rstrip(",")
+    return text + "".join(reversed(stack))
+
+
+def _ends_with_key(text: str) -> bool:
+    """마지막 토큰이 값이 아닌 키인지 ('"key":' 또는 '{"key' / ', "key"')"""
+    stripped = text.rstrip()
+    if stripped.endswith(":"):
+        return True
+    return _KEY_AT_END.search(stripped) is not None
+
+
+def repair_json(text: str) -> Tuple[Optional[Any], bool]:
+    """
+    JSON 파싱 (실패 시 로컬 복구 시도)
+
+    Returns:
+        (파싱 결과 또는 None, 복구 여부)
+    """
+    if not text:
+        return None, False
+    try:
+        return json.loads(text), False
+    except json.JSONDecodeError:
+        pass
+
+    candidate = text.strip()
+    fence = _CODE_FENCE.search(candidate)
+    if fence:
+        candidate = fence.group(1).strip()
+
+    # 앞뒤 설명 문장 제거
+    starts = [i for i in (candidate.find("{"), candidate.find("[")) if i >= 0]
+    if not starts:
+        return None, False
+    candidate = candidate[min(starts):]
+
+    attempts = [candidate]
+    end = max(candidate.rfind("}"), candidate.rfind("]"))
+    if end >= 0:
+        attempts.append(candidate[:end + 1])
+    attempts.append(_close_truncated(candidate))
+
+    for attempt in attempts:
+        for fixed in (attempt, _TRAILING_COMMA.sub(r"\1", attempt)):
+            try:
+                return json.loads(fixed), True
+            except json.JSONDecodeError:
+                continue
+    return None, False
+
+
+def _coerce_score(value: Any) -> Optional[int]:
+    """"7", "7/10", "7점", 7.4 → 7 (1~10 범위로 제한)"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        score = value
+    elif isinstance(value, str):
+        match = _NUMBER.search(value)
+        if not match:
+            return None
+        score = float(match.group())
+    else:
+        return None
+    return max(1, min(10, int(round(score))))
+
+
+def _coerce_confidence(value: Any) -> Optional[float]:
+    """"0.8", "80%", 80 → 0.8 (백분율로 보이는 값만 100으로 나누고, 나머지는 0~1 범위로 제한)"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        confidence = float(value)
+        suffix = False
+    elif isinstance(value, str):
+        match = _NUMBER.search(value)
+        if not match:
+            return None
+        confidence = float(match.group())
+        suffix = "%" in value
+    else:
+        return None
+    # 1.5처럼 1을 조금 넘는 실수는 백분율이 아니라 범위를 벗어난 확신도로 보고 1로 제한
+    if 1 < confidence <= 100 and (suffix or confidence.is_integer()):
+        confidence /= 100
+    return max(0.0, min(1.0, confidence))
+
+
+def _level_for_score(score: int) -> str:
+    if score >= 9:
+        return "critical"
+    if score >= 7:
+        return "high"
+    if score >= 4:
+        return "medium"
+    return "low"
+
+
+def coerce_clause_analysis(data: Any) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    ClauseAnalysis 스키마 검증 (고칠 수 있는 값은 고침)
+
+    Returns:
+        (검증된 결과 또는 None, 값을 고쳤는지 여부)
+        스키마 밖의 추가 필드(related_cases, confidence 등)는 그대로 유지
+    """
+    # {"analysis": {...}}처럼 한 번 감싼 응답
+    unwrapped = isinstance(data, dict) and isinstance(data.get("analysis"), dict)
+    if unwrapped:
+        data = data["analysis"]
+    if not isinstance(data, dict):
+        return None, False
+
+    result = dict(data)
+    # 실패 표시는 서버가 붙이는 값이므로 모델 응답에서는 무시
+    result.pop("failed", None)
+    score = _coerce_score(result.get("risk_score"))
+    if score is None:
+        return None, False
+
+    level = str(result.get("risk_level", "")).strip()
+    level = _RISK_LEVEL_ALIASES.get(level, level.lower())
+    if level not in _RISK_LEVELS:
+        level = _level_for_score(score)
+
+    issues = result.get("issues", [])
+    if isinstance(issues, str):
+        issues = [issues] if issues.strip() else []
+    elif isinstance(issues, list):
+        issues = [str(issue) for issue in issues if issue]
+    else:
+        issues = []
+
+    result.update({
+        "risk_score": score,
+        "risk_level": level,
+        "summary": str(result.get("summary") or ""),
+        "issues": issues,
+    })
+    for field in ("legal_basis", "suggestion"):
+        if isinstance(result.get(field), list):
+            result[field] = ", ".join(str(item) for item in result[field])
+    if "confidence" in result:
+        confidence = _coerce_confidence(result["confidence"])
+        if confidence is None:
+            # 해석할 수 없는 확신도는 없는 것으로 처리
+            del result["confidence"]
+        else:
+            result["confidence"] = confidence
+
+    try:
+        ClauseAnalysis.model_validate(result)
+    except ValidationError:
+        return None, False
+
+    coerced = unwrapped or any(key not in data or data[key] != result[key] for key in _REQUIRED_FIELDS)
+    coerced = coerced or any(
+        key in data and data[key] != result.get(key) for key in ("legal_basis", "suggestion", "confidence")
+    )
+    return result, coerced
+
+
+class StructuredOutputStats:
+    """스키마별 구조화 응답 처리 결과 집계"""
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, schema: str, outcome: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(
+                schema, {"valid": 0, "repaired": 0, "reask": 0, "failed": 0, "escalated": 0}
+            )
+            counts[outcome] = counts.get(outcome, 0) + 1
+        STRUCTURED_OUTPUT.inc(schema=schema, outcome=outcome)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {schema: dict(counts) for schema, counts in self._counts.items()}
+
+
+# 싱글톤 인스턴스
+_stats = StructuredOutputStats()
+
+
+def record_outcome(schema: str, outcome: str) -> None:
+    _stats.record(schema, outcome)
+
+
+def get_structured_output_stats() -> Dict[str, Any]:
+    """스키마별 구조화 응답 처리 결과 (valid, repaired, reask, failed, escalated)"""
+    return _stats.stats()
+
+
+def parse_clause_analysis(text: str) -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    조항 분석 응답 파싱
+
+    Returns:
+        (검증된 결과 또는 None, "valid" | "repaired" | "invalid")
+    """
+    data, repaired = repair_json(text)
+    result, coerced = coerce_clause_analysis(data)
+    if result is None:
+        return None, "invalid"
+    return result, "repaired" if repaired or coerced else "valid"
@@ -0,0 +1,141 @@
+"""
+프롬프트 토큰 예산 관리
+- 전송 전에 프롬프트 토큰 수를 측정하고 엔드포인트별 예산에 맞춤
+- 예산 초과 시 오래된 대화부터 요약으로 대체 → 동적 컨텍스트 → 시스템 프롬프트 → 마지막 메시지 순으로 줄임
+"""
+import logging
+from typing import Dict, List, Optional
+
+from app.core.config import get_settings
+from app.core.tokens import count_message_tokens, count_tokens, truncate_to_tokens
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class PromptBudgetError(ValueError):
+    """고정 시스템 프롬프트만으로 프롬프트 토큰 예산을 넘는 경우"""
+
+# 요약에 남길 이전 대화 한 건의 최대 글자 수
+_SUMMARY_LINE_CHARS = 80
+
+_ROLE_LABELS = {"user": "사용자", "assistant": "상담사"}
+
+
+def get_prompt_budget(endpoint: str) -> int:
+    """엔드포인트별 프롬프트 토큰 예산"""
+    budgets = {
+        "chat": settings.prompt_budget_chat,
+        "labor_chat": settings.prompt_budget_labor_chat,
+        "analysis": settings.prompt_budget_analysis,
+    }
+    return budgets.get(endpoint, settings.prompt_budget_analysis)
+
+
+def fit_messages(
+    messages: List[Dict[str, str]],
+    max_tokens: int,
+    model: Optional[str] = None,
+    endpoint: str = ""
+) -> List[Dict[str, str]]:
+    """
+    메시지 목록을 프롬프트 토큰 예산에 맞춤
+
+    메시지 구성: [고정 시스템 프롬프트, 이전 대화..., (동적 컨텍스트 시스템 메시지), 마지막 메시지]
+    고정 시스템 프롬프트(지시문, 출력 형식)는 자르지 않음 (응답 형식 유지, 제공자 프롬프트 캐시)
+
+    1. 맨 앞 시스템 메시지와 마지막 메시지는 유지하고 오래된 대화부터 제외
+       (제외된 대화는 짧은 요약으로 동적 컨텍스트 메시지에 덧붙임)
+    2. 그래도 넘치면 동적 컨텍스트(판례, 계약서 정보 등) 뒷부분을 자름
+    3. 그래도 넘치면 마지막 메시지(질문, 조항)를 자름
+    2~3단계에서 내용을 자르면 경고 로그를 남김 (endpoint로 요청 구분)
+
+    Returns:
+        예산 안에 들어오는 새 메시지 목록 (원본은 수정하지 않음)
+
+    Raises:
+        PromptBudgetError: 고정 시스템 프롬프트만으로 예산을 넘는 경우
+    """
+    if count_message_tokens(messages, model) <= max_tokens or len(messages) < 2:
+        return messages
+
+    has_system = messages[0]["role"] == "system"
+    if has_system:
+        # 시스템 프롬프트 + 빈 마지막 메시지도 들어가지 않으면 어떻게 줄여도 맞출 수 없음
+        minimum = count_message_tokens([messages[0], {"role": messages[-1]["role"], "content": ""}], model)
+        if minimum > max_tokens:
+            raise PromptBudgetError(
+                f"시스템 프롬프트({minimum}토큰)가 프롬프트 토큰 예산({max_tokens})을 넘습니다 ({endpoint or 'unknown'})"
+            )
+
+    has_context = len(messages) >= (3 if has_system else 2) and messages[-2]["role"] == "system"
+    system = dict(messages[0]) if has_system else None
+    context = dict(messages[-2]) if has_context else None
+    history = [dict(msg) for msg in messages[1 if has_system else 0:-2 if has_context else -1]]
+    last = dict(messages[-1])
+
+    def assemble(summary: str = "") -> List[Dict[str, str]]:
+        parts = []
+        if summary:
+            parts.append(f"이전 대화 요약:\n{summary}")
+        if context is not None:
+            parts.append(context["content"])
+        head = [system] if system is not None else []
+        tail = [{**(context or {"role": "system"}), "content": "\n\n".join(parts)}] if parts else []
+        return head + history + tail + [last]
+
+    # 1. 오래된 대화부터 제외하고 요약으로 대체
+    dropped: List[Dict[str, str]] = []
+    while history and count_message_tokens(assemble(), model) > max_tokens:
+        dropped.append(history.pop(0))
+
+    if dropped:
+        lines = [_summarize_turn(msg) for msg in dropped]
+        # 최근 대화 요약부터 예산이 허락하는 만큼만 유지
+        while lines and count_message_tokens(assemble("\n".join(lines)), model) > max_tokens:
+            lines.pop(0)
+        if lines:
+            # 요약을 동적 컨텍스트 메시지에 합침 (없으면 새로 만듦)
+            context = dict(assemble("\n".join(lines))[-2])
+
+    fitted = assemble()
+    overflow = count_message_tokens(fitted, model) - max_tokens
+    if overflow <= 0:
+        return fitted
+
+    def warn_truncated(part: str, tokens: int) -> None:
+        logger.warning(
+            f"프롬프트 토큰 예산({max_tokens}) 초과로 {part} 뒷부분을 잘랐습니다 "
+            f"({endpoint or 'unknown'}, {tokens}토큰 중 {min(tokens, overflow)}토큰 제외)"
+        )
+
+    # 2. 동적 컨텍스트 뒷부분 자르기
+    if context is not None:
+        context_tokens = count_tokens(context["content"], model)
+        context["content"] = truncate_to_tokens(
+            context["content"], max(0, context_tokens - overflow), model
+        )
+        warn_truncated("동적 컨텍스트", context_tokens)
+        fitted = assemble()
+        overflow = count_message_tokens(fitted, model) - max_tokens
+        if overflow <= 0:
+            return fitted
+
+    # 3. 마지막 메시지 자르기
+    last_tokens = count_tokens(last["content"], model)
+    last["content"] = truncate_to_tokens(last["content"], max(0, last_tokens - overflow), model)
+    warn_truncated("마지막 메시지", last_tokens)
+    fitted = assemble()
+    if count_message_tokens(fitted, model) > max_tokens and context is not None:
+        # 생략 표시만 남은 동적 컨텍스트 때문에 넘치면 컨텍스트 제외
+        context = None
+        fitted = assemble()
+    return fitted
+
+
+def _summarize_turn(message: Dict[str, str]) -> str:
+    content = " ".join(message.get("content", "").split())
+    if len(content) > _SUMMARY_LINE_CHARS:
+        content = content[:_SUMMARY_LINE_CHARS] + "…"
+    return f"- {_ROLE_LABELS.get(message.get('role'), message.get('role', ''))}: {content}"
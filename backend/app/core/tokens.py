@@ -0,0 +1,141 @@
+"""
+토큰 수 계산 유틸리티
+- tiktoken이 설치되어 있으면 실제 토크나이저로 계산
+- 없거나 인코딩을 불러올 수 없으면 글자 수 기반 추정치 사용
+- 인코딩 파일은 처음 불러올 때 내려받으므로 서버 시작 시 스레드에서 미리 불러옴
+  (이벤트 루프에서 아직 불러오지 않은 인코딩이 필요하면 기다리지 않고 추정치 사용)
+"""
+import asyncio
+import logging
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+try:
+    import tiktoken
+except ImportError:  # 선택 의존성
+    tiktoken = None
+
+
+logger = logging.getLogger(__name__)
+
+_HANGUL = re.compile(r'[가-힣ㄱ-ㅎㅏ-ㅣ]')
+
+# 모델을 모를 때 사용할 인코딩 (gpt-4o 계열)
+_DEFAULT_ENCODING = "o200k_base"
+
+# 채팅 메시지당 역할/구분자 토큰
+_MESSAGE_OVERHEAD_TOKENS = 4
+_REPLY_PRIMING_TOKENS = 2
+
+_TRUNCATION_MARKER = "\n...(이하 생략)"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    텍스트 토큰 수 추정
+    - 한글은 글자당 약 1토큰, 그 외 문자는 약 4글자당 1토큰으로 계산
+    """
+    if not text:
+        return 0
+    hangul = len(_HANGUL.findall(text))
+    others = len(text) - hangul
+    return hangul + (others + 3) // 4
+
+
+# 인코딩 이름 → 인코딩 (불러오지 못했으면 None)
+_encodings: Dict[str, Any] = {}
+# 백그라운드에서 불러오는 중인 인코딩 이름
+_loading: Set[str] = set()
+_loading_lock = threading.Lock()
+
+
+def _encoding_name(model: Optional[str]) -> str:
+    """모델별 인코딩 이름 (내려받지 않음)"""
+    if model:
+        try:
+            return tiktoken.encoding_name_for_model(model)
+        except KeyError:
+            pass
+    return _DEFAULT_ENCODING
+
+
+def _load_encoding(name: str):
+    """인코딩 불러오기 (처음이면 파일을 내려받으므로 블로킹)"""
+    try:
+        encoding = tiktoken.get_encoding(name)
+    except Exception as e:
+        # 인코딩 파일 다운로드 실패 등 (오프라인 환경)
+        logger.warning(f"tiktoken 인코딩을 불러올 수 없어 추정치를 사용합니다: {e}")
+        encoding = None
+    with _loading_lock:
+        _encodings[name] = encoding
+        _loading.discard(name)
+    return encoding
+
+
+def _get_encoding(model: Optional[str]):
+    """모델별 tiktoken 인코딩 (불러올 수 없거나 아직 불러오는 중이면 None)"""
+    if tiktoken is None:
+        return None
+    name = _encoding_name(model)
+    if name in _encodings:
+        return _encodings[name]
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # 이벤트 루프 밖 (스크립트, 작업 스레드)에서는 바로 불러옴
+        return _load_encoding(name)
+
+    # 이벤트 루프를 막지 않도록 백그라운드 스레드에서 불러오고 그동안은 추정치 사용
+    with _loading_lock:
+        if name not in _loading and name not in _encodings:
+            _loading.add(name)
+            threading.Thread(target=_load_encoding, args=(name,), daemon=True).start()
+    return None
+
+
+async def load_encodings(models: Iterable[Optional[str]]) -> None:
+    """모델들의 인코딩을 스레드에서 미리 불러옴 (서버 시작 시)"""
+    if tiktoken is None:
+        return
+    names = {_encoding_name(model) for model in models} - set(_encodings)
+    for name in names:
+        await asyncio.to_thread(_load_encoding, name)
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """텍스트 토큰 수 (토크나이저 우선, 없으면 추정치)"""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: List[Dict[str, str]], model: Optional[str] = None) -> int:
+    """채팅 메시지 목록의 프롬프트 토큰 수"""
+    return sum(
+        count_tokens(msg.get("content", ""), model) + _MESSAGE_OVERHEAD_TOKENS
+        for msg in messages
+    ) + _REPLY_PRIMING_TOKENS
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """텍스트를 토큰 수 이내로 자름 (앞부분 유지, 잘린 경우 생략 표시)"""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+
+    budget = max(0, max_tokens - count_tokens(_TRUNCATION_MARKER, model))
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        return encoding.decode(tokens[:budget]) + _TRUNCATION_MARKER
+
+    # 추정치 기준: 비율로 자른 뒤 넘치면 조금씩 줄임
+    end = int(len(text) * budget / max(1, estimate_tokens(text)))
+    while end > 0 and estimate_tokens(text[:end]) > budget:
+        end = int(end * 0.9)
+    return text[:end] + _TRUNCATION_MARKER
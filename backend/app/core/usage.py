@@ -0,0 +1,97 @@
+"""
+LLM 토큰 사용량 기록
+- 호출마다 프롬프트/응답 토큰 수를 엔드포인트(호출 위치) + 모델별로 집계
+- 엔드포인트 이름은 contextvar로 전달 (llm_endpoint 블록 안의 모든 LLM 호출에 적용)
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Tuple
+
+from app.core.metrics import LLM_TOKENS
+
+
+_current_endpoint: ContextVar[str] = ContextVar("llm_endpoint", default="unknown")
+
+
+@contextmanager
+def llm_endpoint(name: str):
+    """블록 안의 LLM 호출 사용량을 name 엔드포인트로 기록"""
+    token = _current_endpoint.set(name)
+    try:
+        yield
+    finally:
+        try:
+            _current_endpoint.reset(token)
+        except ValueError:
+            # 스트리밍 제너레이터가 다른 컨텍스트에서 닫힌 경우
+            pass
+
+
+def current_endpoint() -> str:
+    return _current_endpoint.get()
+
+
+class TokenUsageRecorder:
+    """엔드포인트 + 모델별 토큰 사용량 집계"""
+
+    def __init__(self):
+        self._usage: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> None:
+        key = (current_endpoint(), model)
+        with self._lock:
+            usage = self._usage.setdefault(
+                key,
+                {
+                    "calls": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "cached_prompt_tokens": 0,
+                    "prompt_cache_hits": 0,
+                }
+            )
+            usage["calls"] += 1
+            usage["prompt_tokens"] += prompt_tokens or 0
+            usage["completion_tokens"] += completion_tokens or 0
+            usage["cached_prompt_tokens"] += cached_tokens or 0
+            if cached_tokens:
+                usage["prompt_cache_hits"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints: Dict[str, Dict[str, Any]] = {}
+            for (endpoint, model), usage in self._usage.items():
+                entry = dict(usage)
+                # 프롬프트 토큰 중 제공자 캐시에서 읽은 비율 (캐시 토큰은 할인된 요금으로 과금)
+                entry["prompt_cache_hit_rate"] = (
+                    round(usage["cached_prompt_tokens"] / usage["prompt_tokens"], 3)
+                    if usage["prompt_tokens"] else 0.0
+                )
+                endpoints.setdefault(endpoint, {})[model] = entry
+        return endpoints
+
+
+# 싱글톤 인스턴스
+_recorder = TokenUsageRecorder()
+
+
+def record_usage(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> None:
+    """
+    현재 엔드포인트의 LLM 호출 토큰 사용량 기록
+
+    Args:
+        prompt_tokens: 전체 입력 토큰 수 (캐시에서 읽은 토큰 포함)
+        cached_tokens: 그중 제공자 프롬프트 캐시에서 읽은 토큰 수
+    """
+    _recorder.record(model, prompt_tokens, completion_tokens, cached_tokens)
+    endpoint = current_endpoint()
+    LLM_TOKENS.inc(prompt_tokens, model=model, endpoint=endpoint, type="prompt")
+    LLM_TOKENS.inc(completion_tokens, model=model, endpoint=endpoint, type="completion")
+    LLM_TOKENS.inc(cached_tokens or 0, model=model, endpoint=endpoint, type="cached_prompt")
+
+
+def get_usage_stats() -> Dict[str, Any]:
+    """엔드포인트 + 모델별 토큰 사용량"""
+    return _recorder.stats()
@@ -1,7 +1,12 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import router
 from app.core.config import get_settings
+from app.core.llm_client import LLMClientFactory
+from app.core.metrics import render_metrics
+from app.core.tokens import load_encodings
+from app.services.job_service import get_job_service
 import logging
 
 # 로깅 설정
@@ -33,6 +38,33 @@ app.add_middleware(
 app.include_router(router, prefix="/api/v1")
 
 
+@app.on_event("startup")
+async def start_job_workers():
+    """분석 작업 워커 시작"""
+    await get_job_service().start()
+
+
+@app.on_event("startup")
+async def load_token_encodings():
+    """토큰 계산용 인코딩 미리 불러오기 (요청 처리 중 다운로드 방지)"""
+    models = [settings.current_model]
+    if settings.llm_cascade_enabled:
+        models.append(settings.llm_cascade_model)
+    await load_encodings(models)
+
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    """분석 작업 워커 종료"""
+    await get_job_service().stop()
+
+
+@app.on_event("shutdown")
+async def close_llm_clients():
+    """LLM API 연결 풀 정리"""
+    await LLMClientFactory.close_all()
+
+
 @app.get("/")
 async def root():
     return {
@@ -42,6 +74,12 @@ async def root():
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus 수집용 메트릭 (텍스트 노출 형식)"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=settings.debug)
@@ -9,6 +9,8 @@ class ClauseAnalysis(BaseModel):
     issues: list[str]
     legal_basis: Optional[str] = None
     suggestion: Optional[str] = None
+    confidence: Optional[float] = None  # 모델이 평가한 분석 확신도 (0~1)
+    failed: bool = False  # 분석 실패 시의 기본 결과 (다시 분석 필요)
 
 
 class SimilarCase(BaseModel):
@@ -26,6 +28,7 @@ class AnalyzedClause(BaseModel):
     analysis: ClauseAnalysis
     similar_cases: list[SimilarCase]
     alternative: Optional[str] = None
+    prescreened: bool = False  # 규칙 기반 사전 분류로 LLM 분석 생략
 
 
 class ContractAnalysisResponse(BaseModel):
@@ -34,11 +37,39 @@ class ContractAnalysisResponse(BaseModel):
     high_risk_clauses: int
     average_risk_score: float
     overall_risk_level: str
+    llm_calls_saved: int = 0  # 사전 분류로 생략된 LLM 호출 수
     clauses: list[AnalyzedClause]
     summary: str
     disclaimer: Optional[str] = None  # 면책 조항
 
 
+class ClauseRevision(BaseModel):
+    number: int
+    status: str  # unchanged, modified, added
+    previous_number: Optional[int] = None
+
+
+class RemovedClause(BaseModel):
+    previous_number: Optional[int] = None
+    title: str = ""
+
+
+class RevisionSummary(BaseModel):
+    unchanged: int
+    modified: int
+    added: int
+    removed: int
+    reanalyzed_clauses: int
+    clauses: list[ClauseRevision]
+    removed_clauses: list[RemovedClause] = []
+
+
+class RevisionAnalysisResponse(ContractAnalysisResponse):
+    revision: RevisionSummary
+    share_id: Optional[str] = None
+    version_number: Optional[int] = None
+
+
 class HealthResponse(BaseModel):
     status: str
     version: str
@@ -71,6 +102,7 @@ class CitedCase(BaseModel):
 class ChatResponse(BaseModel):
     reply: str
     cited_cases: list[CitedCase] = []
+    cache_hit: bool = False  # 의미 캐시에 저장된 응답 재사용 여부
 
 
 # 계약서 생성 관련 스키마
@@ -109,6 +141,7 @@ class LaborChatResponse(BaseModel):
     reply: str
     cited_cases: list[CitedCase] = []
     needs_expert: bool = False
+    cache_hit: bool = False
 
 
 class ExpertConnectRequest(BaseModel):
@@ -0,0 +1,190 @@
+"""
+계약서 분석 결과 캐시
+- 업로드 파일 내용(SHA-256) + LLM 제공자/모델(단계별 라우팅 구성) + 프롬프트 버전으로 키 생성
+- 메모리(LRU) → 디스크(JSON) 2단계 저장
+- 프롬프트 버전이 바뀌면 이전 결과는 조회되지 않으며 invalidate로 정리
+"""
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+from typing import Optional, Dict, Any
+
+from app.core.cache import LRUCache
+from app.core.cascade import get_model_scope
+from app.core.config import get_settings
+from app.core.metrics import CACHE_REQUESTS
+from app.core.openai_client import ANALYSIS_PROMPT_VERSION
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class AnalysisResultCache:
+    """문서 단위 분석 결과 캐시"""
+
+    def __init__(
+        self,
+        memory_size: int = 128,
+        cache_dir: Optional[str] = None,
+        prompt_version: str = ANALYSIS_PROMPT_VERSION
+    ):
+        self.memory = LRUCache(max_size=memory_size)
+        self.cache_dir = cache_dir or None
+        self.prompt_version = prompt_version
+        self.disk_hits = 0
+        self.stores = 0
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def make_key(self, file_bytes: bytes) -> str:
+        """파일 내용 + 제공자 + 모델 + 프롬프트 버전 기반 키"""
+        digest = hashlib.sha256(file_bytes).hexdigest()
+        scope = f"{settings.llm_provider}|{get_model_scope('clause_analysis')}|{self.prompt_version}"
+        scope_hash = hashlib.sha256(scope.encode()).hexdigest()[:16]
+        return f"{digest}-{scope_hash}"
+
+    @staticmethod
+    def _count(result: str) -> None:
+        CACHE_REQUESTS.inc(
+            cache="document",
+            provider=settings.llm_provider,
+            model=get_model_scope("clause_analysis"),
+            endpoint="contract_analysis",
+            result=result
+        )
+
+    async def get(self, file_bytes: bytes) -> Optional[Dict[str, Any]]:
+        """캐시된 분석 결과 조회 (메모리 → 디스크)"""
+        key = self.make_key(file_bytes)
+
+        result = self.memory.get(key)
+        if result is not None:
+            self._count("hit")
+            # 호출자가 결과를 수정해도 캐시가 오염되지 않도록 복사본 반환
+            return copy.deepcopy(result)
+
+        if not self.cache_dir:
+            self._count("miss")
+            return None
+
+        entry = await asyncio.to_thread(self._read_disk, key)
+        if entry is None or entry.get("prompt_version") != self.prompt_version:
+            self._count("miss")
+            return None
+
+        self.disk_hits += 1
+        self._count("hit")
+        result = entry["result"]
+        self.memory.set(key, copy.deepcopy(result))
+        return result
+
+    async def set(self, file_bytes: bytes, result: Dict[str, Any]) -> None:
+        """분석 결과 저장"""
+        key = self.make_key(file_bytes)
+        self.memory.set(key, copy.deepcopy(result))
+        self.stores += 1
+
+        if self.cache_dir:
+            entry = {
+                "provider": settings.llm_provider,
+                "model": get_model_scope("clause_analysis"),
+                "prompt_version": self.prompt_version,
+                "result": result,
+            }
+            await asyncio.to_thread(self._write_disk, key, entry)
+
+    def invalidate(self, stale_only: bool = False) -> int:
+        """
+        캐시 무효화
+
+        Args:
+            stale_only: True면 현재 프롬프트 버전이 아닌 디스크 항목만 삭제
+
+        Returns:
+            삭제된 디스크 항목 수
+        """
+        if not stale_only:
+            self.memory.clear()
+
+        removed = 0
+        if not self.cache_dir:
+            return removed
+
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            if stale_only:
+                entry = self._read_path(path)
+                if entry is not None and entry.get("prompt_version") == self.prompt_version:
+                    continue
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        memory_stats = self.memory.stats()
+        lookups = memory_stats["hits"] + memory_stats["misses"]
+        hits = memory_stats["hits"] + self.disk_hits
+        return {
+            "prompt_version": self.prompt_version,
+            "memory": memory_stats,
+            "disk_enabled": bool(self.cache_dir),
+            "disk_hits": self.disk_hits,
+            "hits": hits,
+            "misses": lookups - hits,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "stores": self.stores,
+        }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._read_path(self._path(key))
+
+    def _read_path(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"분석 캐시 파일을 읽을 수 없습니다 ({path}): {e}")
+            return None
+
+    def _write_disk(self, key: str, entry: Dict[str, Any]) -> None:
+        # 임시 파일에 쓴 뒤 교체하여 동시 읽기 시 깨진 파일이 보이지 않도록 함
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"분석 캐시 저장 실패 ({path}): {e}")
+
+
+# 싱글톤 인스턴스
+_analysis_cache: Optional[AnalysisResultCache] = None
+
+
+def get_analysis_cache() -> AnalysisResultCache:
+    """분석 결과 캐시 인스턴스 반환"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        _analysis_cache = AnalysisResultCache(
+            memory_size=settings.analysis_cache_memory_size,
+            cache_dir=settings.analysis_cache_dir
+        )
+    return _analysis_cache
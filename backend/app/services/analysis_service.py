@@ -1,5 +1,12 @@
+import asyncio
+import logging
+from typing import Optional
+
+from app.core.config import get_settings
 from app.services.pdf_service import split_into_clauses, get_contract_type
 from app.services.document_service import extract_text_from_document
+from app.services.analysis_cache import get_analysis_cache
+from app.services.triage_service import prescreen_clause, predicts_high_risk
 from app.services.rag_service import search_similar_cases, SAMPLE_CASES
 from app.services.korean_law_service import (
     get_relevant_laws,
@@ -7,7 +14,17 @@ from app.services.korean_law_service import (
     check_missing_clauses,
     get_contract_checklist
 )
-from app.core.openai_client import analyze_clause, generate_alternative_clause
+from app.core.openai_client import (
+    analyze_clause,
+    analyze_clauses_batch,
+    generate_alternative_clause,
+    is_failed_analysis,
+    pack_clause_batches,
+)
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 # 면책 조항 문구
@@ -19,9 +36,20 @@ ContractPilot은 분석 결과의 정확성이나 완전성을 보장하지 않
 이를 근거로 한 결정에 대한 책임을 지지 않습니다.
 """
 
+# 조항 분석 실패 시 사용하는 기본 분석 결과
+FAILED_CLAUSE_ANALYSIS = {
+    "risk_score": 5,
+    "risk_level": "medium",
+    "summary": "이 조항의 분석 중 오류가 발생했습니다.",
+    "issues": ["분석 재시도가 필요합니다."],
+    "legal_basis": "",
+    "suggestion": "",
+    "failed": True
+}
 
-async def analyze_contract(file_bytes: bytes, filename: str = "document.pdf") -> dict:
-    """계약서 전체 분석 (PDF, HWP, HWPX 지원)"""
+
+def prepare_contract(file_bytes: bytes, filename: str = "document.pdf") -> dict:
+    """문서에서 텍스트를 추출하고 계약서 유형 감지 및 조항 분리"""
     # 1. 문서에서 텍스트 추출 (파일 형식 자동 감지)
     text = extract_text_from_document(file_bytes, filename)
 
@@ -31,68 +59,187 @@ async def analyze_contract(file_bytes: bytes, filename: str = "document.pdf") ->
     # 3. 조항별 분리
     clauses = split_into_clauses(text)
 
-    # 4. 각 조항 분석
-    analyzed_clauses = []
-    total_risk_score = 0
-    high_risk_count = 0
+    return {"contract_type": contract_type, "clauses": clauses}
 
-    for clause in clauses:
-        # AI 분석
-        analysis = await analyze_clause(
-            clause["content"],
-            context=f"계약서 유형: {contract_type}"
-        )
 
-        # 유사 판례 검색 (위험도 높은 경우만)
-        similar_cases = []
-        relevant_laws = []
+async def analyze_contract(file_bytes: bytes, filename: str = "document.pdf") -> dict:
+    """계약서 전체 분석 (PDF, HWP, HWPX 지원)"""
+    # 동일 문서의 이전 분석 결과 재사용
+    cached = await get_cached_analysis(file_bytes)
+    if cached is not None:
+        return cached
 
-        if analysis.get("risk_score", 0) >= 6:
-            high_risk_count += 1
+    prepared = await asyncio.to_thread(prepare_contract, file_bytes, filename)
+    contract_type = prepared["contract_type"]
+    clauses = prepared["clauses"]
 
-            # 실제 판례 검색 시도
-            try:
-                court_cases = await search_court_cases(clause["content"], top_k=2)
-                if court_cases:
-                    similar_cases = [
-                        {
-                            "case_number": c.case_number,
-                            "summary": c.summary,
-                            "court": c.court,
-                            "date": c.decision_date,
-                            "relevant_text": c.summary
-                        }
-                        for c in court_cases
-                    ]
-                else:
-                    # API 실패 시 샘플 사용
-                    similar_cases = SAMPLE_CASES[:2]
-            except Exception:
-                similar_cases = SAMPLE_CASES[:2]
-
-            # 관련 법령 조회
-            try:
-                relevant_laws = await get_relevant_laws(clause["content"], contract_type)
-            except Exception:
-                relevant_laws = []
+    # 4. 각 조항 분석 (결과는 조항 순서 유지)
+    analyzed_clauses: list[dict] = [None] * len(clauses)
+    async for index, analyzed in iter_analyzed_clauses(clauses, contract_type):
+        analyzed_clauses[index] = analyzed
 
-        # 수정안 생성 (위험도 높은 경우)
-        alternative = ""
-        if analysis.get("risk_score", 0) >= 7:
-            alternative = await generate_alternative_clause(
-                clause["content"],
-                analysis.get("issues", [])
+    result = build_analysis_result(contract_type, analyzed_clauses)
+    await cache_analysis(file_bytes, result)
+    return result
+
+
+async def get_cached_analysis(file_bytes: bytes) -> Optional[dict]:
+    """캐시된 문서 분석 결과 조회"""
+    if not settings.analysis_cache_enabled:
+        return None
+    return await get_analysis_cache().get(file_bytes)
+
+
+async def cache_analysis(file_bytes: bytes, result: dict) -> None:
+    """문서 분석 결과 캐시 저장 (분석 오류/응답 해석 실패 조항이 있으면 저장하지 않음)"""
+    if not settings.analysis_cache_enabled:
+        return
+    if any(is_failed_analysis(c["analysis"]) for c in result["clauses"]):
+        return
+    await get_analysis_cache().set(file_bytes, result)
+
+
+async def stream_contract_analysis(
+    contract_type: str,
+    clauses: list[dict],
+    file_bytes: Optional[bytes] = None
+):
+    """
+    조항 분석 결과를 완료되는 순서대로 스트리밍
+    - file_bytes가 주어지면 완료된 결과를 분석 캐시에 저장
+
+    이벤트 순서:
+        start  - 계약서 유형과 조항 목록 (분석 전 골격)
+        clause - 분석이 끝난 조항 (index는 조항 목록 내 위치)
+        result - 전체 위험도 요약 (clauses 제외)
+    """
+    yield {
+        "event": "start",
+        "contract_type": contract_type,
+        "total_clauses": len(clauses),
+        "clauses": [
+            {"number": c["number"], "title": c["title"], "content": c["content"]}
+            for c in clauses
+        ]
+    }
+
+    analyzed_clauses: list[dict] = [None] * len(clauses)
+    async for index, analyzed in iter_analyzed_clauses(clauses, contract_type):
+        analyzed_clauses[index] = analyzed
+        yield {"event": "clause", "index": index, "clause": analyzed}
+
+    result = build_analysis_result(contract_type, analyzed_clauses)
+    if file_bytes is not None:
+        await cache_analysis(file_bytes, result)
+
+    summary = {k: v for k, v in result.items() if k != "clauses"}
+    yield {"event": "result", **summary}
+
+
+async def replay_contract_analysis(result: dict):
+    """완료된 분석 결과를 스트리밍 이벤트 형식으로 재생 (캐시 적중 시)"""
+    clauses = result["clauses"]
+    yield {
+        "event": "start",
+        "contract_type": result["contract_type"],
+        "total_clauses": len(clauses),
+        "clauses": [
+            {"number": c["number"], "title": c["title"], "content": c["content"]}
+            for c in clauses
+        ]
+    }
+    for index, clause in enumerate(clauses):
+        yield {"event": "clause", "index": index, "clause": clause}
+
+    summary = {k: v for k, v in result.items() if k != "clauses"}
+    yield {"event": "result", **summary}
+
+
+async def iter_analyzed_clauses(
+    clauses: list[dict],
+    contract_type: str,
+    semaphore: Optional[asyncio.Semaphore] = None
+):
+    """
+    조항을 동시에 분석하고 완료되는 순서대로 (index, 결과) 반환
+    - 동시 실행 수는 analysis_max_concurrency로 제한
+      (여러 문서가 한도를 공유하려면 semaphore를 전달)
+    - clause_batch_enabled인 경우 위험도 분석은 토큰 예산 단위 묶음으로 요청
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, settings.analysis_max_concurrency))
+    context = f"계약서 유형: {contract_type}"
+
+    # 규칙 기반 사전 분류 (명백한 저위험 조항은 LLM 호출 생략)
+    prescreened: dict[int, dict] = {}
+    if settings.clause_prescreen_enabled:
+        for i, clause in enumerate(clauses):
+            verdict = prescreen_clause(clause["content"])
+            if verdict is not None:
+                prescreened[i] = verdict
+
+    # 묶음별 위험도 분석 작업 (조항 인덱스 → (묶음 작업, 묶음 내 위치))
+    batch_of: dict[int, tuple[asyncio.Task, int]] = {}
+    if settings.clause_batch_enabled:
+        remaining = [i for i in range(len(clauses)) if i not in prescreened]
+        for batch in pack_clause_batches([clauses[i]["content"] for i in remaining]):
+            indices = [remaining[b] for b in batch]
+            if len(indices) < 2:
+                continue
+            batch_task = asyncio.create_task(
+                _run_batch_analysis([clauses[i]["content"] for i in indices], context, semaphore)
             )
+            for position, i in enumerate(indices):
+                batch_of[i] = (batch_task, position)
+
+    async def run(index: int, clause: dict) -> tuple[int, dict]:
+        if index in prescreened:
+            return index, {
+                **clause,
+                "analysis": prescreened[index],
+                "similar_cases": [],
+                "relevant_laws": [],
+                "alternative": "",
+                "prescreened": True
+            }
+
+        analysis = None
+        if index in batch_of:
+            batch_task, position = batch_of[index]
+            try:
+                analysis = (await batch_task)[position]
+            except Exception as e:
+                # 묶음 요청 실패 시 개별 분석으로 재시도
+                logger.warning(f"조항 일괄 분석 실패, 개별 분석으로 전환: {e}")
+
+        async with semaphore:
+            return index, await analyze_single_clause(clause, contract_type, analysis)
+
+    batch_tasks = {task for task, _ in batch_of.values()}
+    tasks = [asyncio.create_task(run(i, clause)) for i, clause in enumerate(clauses)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # 스트림이 중간에 끊긴 경우 남은 분석 취소
+        for task in [*tasks, *batch_tasks]:
+            if not task.done():
+                task.cancel()
+
+
+async def _run_batch_analysis(
+    contents: list[str],
+    context: str,
+    semaphore: asyncio.Semaphore
+) -> list[dict]:
+    async with semaphore:
+        return await analyze_clauses_batch(contents, context)
 
-        analyzed_clauses.append({
-            **clause,
-            "analysis": analysis,
-            "similar_cases": similar_cases,
-            "relevant_laws": relevant_laws,
-            "alternative": alternative
-        })
 
-        total_risk_score += analysis.get("risk_score", 0)
+def build_analysis_result(contract_type: str, analyzed_clauses: list[dict]) -> dict:
+    """분석된 조항 목록으로 전체 분석 결과 구성"""
+    total_risk_score = sum(c["analysis"].get("risk_score", 0) for c in analyzed_clauses)
+    high_risk_count = sum(1 for c in analyzed_clauses if c["analysis"].get("risk_score", 0) >= 6)
 
     # 5. 누락 조항 체크
     missing_clauses = check_missing_clauses(contract_type, analyzed_clauses)
@@ -101,14 +248,18 @@ async def analyze_contract(file_bytes: bytes, filename: str = "document.pdf") ->
     checklist = get_contract_checklist(contract_type)
 
     # 7. 전체 요약
-    avg_risk = total_risk_score / len(clauses) if clauses else 0
+    avg_risk = total_risk_score / len(analyzed_clauses) if analyzed_clauses else 0
+
+    # 사전 분류로 생략된 LLM 호출 수
+    llm_calls_saved = sum(1 for c in analyzed_clauses if c.get("prescreened"))
 
     return {
         "contract_type": contract_type,
-        "total_clauses": len(clauses),
+        "total_clauses": len(analyzed_clauses),
         "high_risk_clauses": high_risk_count,
         "average_risk_score": round(avg_risk, 1),
         "overall_risk_level": get_overall_risk_level(avg_risk, high_risk_count),
+        "llm_calls_saved": llm_calls_saved,
         "clauses": analyzed_clauses,
         "missing_clauses": missing_clauses,
         "checklist": checklist,
@@ -117,6 +268,123 @@ async def analyze_contract(file_bytes: bytes, filename: str = "document.pdf") ->
     }
 
 
+async def analyze_single_clause(
+    clause: dict,
+    contract_type: str,
+    analysis: Optional[dict] = None
+) -> dict:
+    """
+    단일 조항 분석
+    - 한 조항의 오류가 전체 분석을 실패시키지 않도록 예외를 격리
+    - analysis가 주어지면 (일괄 분석 결과) 위험도 분석 요청을 생략
+    """
+    try:
+        return await _analyze_clause_pipeline(clause, contract_type, analysis)
+    except Exception as e:
+        logger.warning(f"조항 {clause.get('number')} 분석 실패: {e}")
+        return {
+            **clause,
+            "analysis": dict(FAILED_CLAUSE_ANALYSIS),
+            "similar_cases": [],
+            "relevant_laws": [],
+            "alternative": ""
+        }
+
+
+async def _analyze_clause_pipeline(
+    clause: dict,
+    contract_type: str,
+    analysis: Optional[dict] = None
+) -> dict:
+    """
+    조항 분석 → 판례/법령 검색 + 수정안 생성
+
+    판례 검색, 법령 조회, 수정안 생성은 서로 독립적이므로 동시에 실행한다.
+    위험 키워드로 고위험이 예상되는 조항은 위험도 분석과 동시에 법령 조회를
+    미리 시작하고, 분석 결과 필요 없으면 취소한다.
+    """
+    content = clause["content"]
+
+    # 고위험 예상 조항은 법령 조회를 미리 시작
+    laws_task: Optional[asyncio.Task] = None
+    if analysis is None and predicts_high_risk(content):
+        laws_task = asyncio.create_task(_lookup_relevant_laws(content, contract_type))
+
+    try:
+        # AI 분석
+        if analysis is None:
+            analysis = await analyze_clause(
+                content,
+                context=f"계약서 유형: {contract_type}"
+            )
+
+        risk_score = analysis.get("risk_score", 0)
+        similar_cases = []
+        relevant_laws = []
+        alternative = ""
+
+        # 유사 판례 검색 / 관련 법령 조회 (위험도 높은 경우만)
+        if risk_score >= 6:
+            if laws_task is None:
+                laws_task = asyncio.create_task(_lookup_relevant_laws(content, contract_type))
+            stages = [_search_similar_cases(content), laws_task]
+
+            # 수정안 생성 (위험도 높은 경우)
+            if risk_score >= 7:
+                stages.append(generate_alternative_clause(content, analysis.get("issues", [])))
+
+            results = await asyncio.gather(*stages)
+            similar_cases, relevant_laws = results[0], results[1]
+            if risk_score >= 7:
+                alternative = results[2]
+        elif laws_task is not None:
+            # 미리 시작한 법령 조회가 필요 없어진 경우
+            laws_task.cancel()
+    except BaseException:
+        if laws_task is not None and not laws_task.done():
+            laws_task.cancel()
+        raise
+
+    return {
+        **clause,
+        "analysis": analysis,
+        "similar_cases": similar_cases,
+        "relevant_laws": relevant_laws,
+        "alternative": alternative
+    }
+
+
+async def _search_similar_cases(content: str) -> list[dict]:
+    """실제 판례 검색 (실패 시 샘플 판례 사용)"""
+    try:
+        court_cases = await search_court_cases(content, top_k=2)
+    except Exception:
+        return SAMPLE_CASES[:2]
+
+    if not court_cases:
+        # API 실패 시 샘플 사용
+        return SAMPLE_CASES[:2]
+
+    return [
+        {
+            "case_number": c.case_number,
+            "summary": c.summary,
+            "court": c.court,
+            "date": c.decision_date,
+            "relevant_text": c.summary
+        }
+        for c in court_cases
+    ]
+
+
+async def _lookup_relevant_laws(content: str, contract_type: str) -> list[dict]:
+    """관련 법령 조회 (실패 시 빈 목록)"""
+    try:
+        return await get_relevant_laws(content, contract_type)
+    except Exception:
+        return []
+
+
 def get_overall_risk_level(avg_score: float, high_risk_count: int) -> str:
     """전체 위험 수준 결정"""
     if high_risk_count >= 3 or avg_score >= 7:
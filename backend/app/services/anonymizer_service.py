@@ -7,6 +7,8 @@ from typing import Tuple, Dict, List
 from dataclasses import dataclass
 import hashlib
 
+from app.core.metrics import ANONYMIZATION_DURATION
+
 
 @dataclass
 class AnonymizationResult:
@@ -195,7 +197,8 @@ def anonymize_text(text: str, preserve_amounts: bool = True) -> Tuple[str, Dict[
     Returns:
         (익명화된 텍스트, 복원용 매핑)
     """
-    result = _anonymizer.anonymize(text, preserve_amounts=preserve_amounts)
+    with ANONYMIZATION_DURATION.time():
+        result = _anonymizer.anonymize(text, preserve_amounts=preserve_amounts)
     return result.anonymized_text, result.mapping
 
 
@@ -0,0 +1,231 @@
+"""
+다중 계약서 일괄 분석 서비스
+- zip 파일 또는 여러 파일을 한 번에 분석 (포트폴리오 검토)
+- 텍스트 추출은 스레드 풀에서, 조항 분석은 전체 문서가 하나의 동시 실행 한도를 공유
+- 문서별 진행률과 결과, 포트폴리오 전체 위험도 요약을 이벤트로 전달
+"""
+import asyncio
+import io
+import logging
+import os
+import zipfile
+import zlib
+from collections import Counter
+from typing import List, Dict, Any, Tuple, AsyncIterator
+
+from app.core.config import get_settings
+from app.services.analysis_service import (
+    prepare_contract,
+    iter_analyzed_clauses,
+    build_analysis_result,
+    get_cached_analysis,
+    cache_analysis,
+)
+from app.services.document_service import (
+    get_file_extension,
+    is_supported_file,
+    MAX_FILE_SIZE,
+)
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def expand_uploads(uploads: List[Tuple[str, bytes]]) -> Tuple[List[Tuple[str, bytes]], List[Dict[str, str]]]:
+    """
+    업로드 파일 목록을 분석 대상 문서 목록으로 펼침 (zip은 압축 해제)
+
+    Returns:
+        (문서 목록 [(파일명, 내용)], 건너뛴 파일 목록 [{filename, reason}])
+    """
+    documents: List[Tuple[str, bytes]] = []
+    skipped: List[Dict[str, str]] = []
+
+    max_archive_size = settings.bulk_max_archive_size_mb * 1024 * 1024
+
+    for filename, contents in uploads:
+        if get_file_extension(filename) != ".zip":
+            documents.append((filename, contents))
+            continue
+
+        # 압축 파일 자체 크기는 열기 전에 확인
+        if len(contents) > max_archive_size:
+            skipped.append({"filename": filename, "reason": "zip 파일 크기 제한을 초과합니다."})
+            continue
+
+        try:
+            archive = zipfile.ZipFile(io.BytesIO(contents))
+        except zipfile.BadZipFile:
+            skipped.append({"filename": filename, "reason": "손상된 zip 파일입니다."})
+            continue
+
+        with archive:
+            # 지금까지 압축 해제한 전체 크기 (다음 항목은 헤더의 크기로 미리 확인)
+            extracted_size = 0
+            for info in archive.infolist():
+                if len(documents) > settings.bulk_max_documents:
+                    # 문서 수 제한을 넘으면 요청이 거부되므로 더 풀지 않음
+                    break
+                name = info.filename
+                basename = os.path.basename(name)
+                if info.is_dir() or name.startswith("__MACOSX/") or basename.startswith("."):
+                    continue
+                if not is_supported_file(name):
+                    skipped.append({"filename": name, "reason": "지원하지 않는 파일 형식입니다."})
+                    continue
+                # 압축 해제 전 크기 확인 (압축 폭탄 방지)
+                if info.file_size > MAX_FILE_SIZE:
+                    skipped.append({"filename": name, "reason": "파일 크기 제한을 초과합니다."})
+                    continue
+                if extracted_size + info.file_size > max_archive_size:
+                    skipped.append({"filename": name, "reason": "zip 파일의 전체 압축 해제 크기 제한을 초과합니다."})
+                    continue
+                try:
+                    data = archive.read(info)
+                except NotImplementedError:
+                    # RuntimeError의 하위 클래스이므로 먼저 처리
+                    skipped.append({"filename": name, "reason": "지원하지 않는 압축 방식입니다."})
+                    continue
+                except RuntimeError:
+                    # 암호화된 항목
+                    skipped.append({"filename": name, "reason": "암호로 보호된 파일입니다."})
+                    continue
+                except (zipfile.BadZipFile, zlib.error, EOFError) as e:
+                    logger.warning(f"zip 항목 압축 해제 실패 ({filename}/{name}): {e}")
+                    skipped.append({"filename": name, "reason": "손상된 파일입니다."})
+                    continue
+                extracted_size += len(data)
+                documents.append((name, data))
+
+    return documents, skipped
+
+
+async def analyze_portfolio(documents: List[Tuple[str, bytes]]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    여러 계약서 일괄 분석
+
+    이벤트:
+        document_started - 문서 텍스트 추출 완료 (조항 수 포함)
+        progress         - 문서별 조항 분석 진행률
+        document         - 문서 분석 결과
+        document_error   - 문서 분석 실패
+        portfolio        - 전체 위험도 요약 (마지막)
+    """
+    # 적응형 동시 요청 제한을 쓰면 제공자가 허용하는 만큼 보내고 한도는 제공자별 제한기가 조절
+    clause_limit = (
+        settings.llm_concurrency_max if settings.llm_adaptive_concurrency_enabled
+        else settings.bulk_max_concurrency
+    )
+    clause_semaphore = asyncio.Semaphore(max(1, clause_limit))
+    extraction_semaphore = asyncio.Semaphore(max(1, settings.bulk_extraction_concurrency))
+    events: asyncio.Queue = asyncio.Queue()
+    results: List[Dict[str, Any]] = [None] * len(documents)
+
+    async def run(index: int, filename: str, contents: bytes) -> None:
+        try:
+            result = await get_cached_analysis(contents)
+            if result is None:
+                async with extraction_semaphore:
+                    prepared = await asyncio.to_thread(prepare_contract, contents, filename)
+                clauses = prepared["clauses"]
+                contract_type = prepared["contract_type"]
+                await events.put({
+                    "event": "document_started",
+                    "index": index,
+                    "filename": filename,
+                    "contract_type": contract_type,
+                    "total_clauses": len(clauses)
+                })
+
+                analyzed_clauses: List[dict] = [None] * len(clauses)
+                completed = 0
+                async for clause_index, analyzed in iter_analyzed_clauses(
+                    clauses, contract_type, semaphore=clause_semaphore
+                ):
+                    analyzed_clauses[clause_index] = analyzed
+                    completed += 1
+                    await events.put({
+                        "event": "progress",
+                        "index": index,
+                        "completed_clauses": completed,
+                        "total_clauses": len(clauses)
+                    })
+
+                result = build_analysis_result(contract_type, analyzed_clauses)
+                await cache_analysis(contents, result)
+
+            results[index] = result
+            await events.put({"event": "document", "index": index, "filename": filename, "result": result})
+        except Exception as e:
+            logger.warning(f"일괄 분석 중 문서 분석 실패 ({filename}): {e}")
+            await events.put({
+                "event": "document_error",
+                "index": index,
+                "filename": filename,
+                "detail": str(e)
+            })
+
+    tasks = [
+        asyncio.create_task(run(i, filename, contents))
+        for i, (filename, contents) in enumerate(documents)
+    ]
+    try:
+        pending = len(tasks)
+        while pending:
+            event = await events.get()
+            if event["event"] in ("document", "document_error"):
+                pending -= 1
+            yield event
+    finally:
+        # 스트림이 중간에 끊긴 경우 남은 분석 취소
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    filenames = [filename for filename, _ in documents]
+    yield {"event": "portfolio", **build_portfolio_summary(filenames, results)}
+
+
+def build_portfolio_summary(filenames: List[str], results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """포트폴리오 전체 위험도 요약"""
+    succeeded = [(name, r) for name, r in zip(filenames, results) if r is not None]
+
+    total_clauses = sum(r["total_clauses"] for _, r in succeeded)
+    weighted_risk = sum(r["average_risk_score"] * r["total_clauses"] for _, r in succeeded)
+    risk_levels = Counter(r["overall_risk_level"] for _, r in succeeded)
+    contract_types = Counter(r["contract_type"] for _, r in succeeded)
+    missing = Counter(
+        m["clause"] for _, r in succeeded for m in r.get("missing_clauses", [])
+    )
+
+    riskiest = sorted(
+        succeeded,
+        key=lambda item: (item[1]["high_risk_clauses"], item[1]["average_risk_score"]),
+        reverse=True
+    )[:5]
+
+    return {
+        "total_documents": len(filenames),
+        "analyzed_documents": len(succeeded),
+        "failed_documents": len(filenames) - len(succeeded),
+        "total_clauses": total_clauses,
+        "high_risk_clauses": sum(r["high_risk_clauses"] for _, r in succeeded),
+        "average_risk_score": round(weighted_risk / total_clauses, 1) if total_clauses else 0,
+        "risk_level_distribution": dict(risk_levels),
+        "contract_types": dict(contract_types),
+        "common_missing_clauses": [
+            {"clause": clause, "documents": count}
+            for clause, count in missing.most_common(5)
+        ],
+        "riskiest_documents": [
+            {
+                "filename": name,
+                "contract_type": r["contract_type"],
+                "overall_risk_level": r["overall_risk_level"],
+                "high_risk_clauses": r["high_risk_clauses"],
+                "average_risk_score": r["average_risk_score"],
+            }
+            for name, r in riskiest
+        ],
+    }
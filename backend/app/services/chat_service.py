@@ -1,9 +1,13 @@
-from openai import OpenAI
+from typing import AsyncIterator
+
 from app.core.config import get_settings
+from app.core.llm_client import get_llm_client
+from app.core.semantic_cache import is_cache_hit
+from app.core.token_budget import fit_messages, get_prompt_budget
+from app.core.usage import llm_endpoint
 from app.services.rag_service import search_similar_cases, SAMPLE_CASES
 
 settings = get_settings()
-client = OpenAI(api_key=settings.openai_api_key)
 
 SYSTEM_PROMPT = """당신은 한국 계약법 전문 AI 상담사입니다.
 
@@ -29,17 +33,81 @@ async def generate_chat_response(
     contract_context: dict = None
 ) -> dict:
     """챗봇 응답 생성"""
+    messages, similar_cases = await _build_chat_messages(
+        message, conversation_history, contract_context
+    )
+
+    # LLM API 호출
+    with llm_endpoint("chat"):
+        reply = await get_llm_client().chat_completion(
+            messages,
+            temperature=0.7,
+            skip_anonymization=True,
+            max_tokens=1000
+        )
+
+    return {
+        "reply": reply,
+        "cited_cases": _extract_cited_cases(reply, similar_cases),
+        "cache_hit": is_cache_hit(reply)
+    }
+
+
+async def stream_chat_response(
+    message: str,
+    conversation_history: list[dict],
+    contract_context: dict = None
+) -> AsyncIterator[dict]:
+    """
+    챗봇 응답 스트리밍 생성
+
+    이벤트:
+        token - 생성된 텍스트 조각
+        done  - 전체 응답과 인용 판례 (마지막)
+    """
+    messages, similar_cases = await _build_chat_messages(
+        message, conversation_history, contract_context
+    )
+
+    chunks = []
+    cache_hit = False
+    with llm_endpoint("chat"):
+        async for token in get_llm_client().chat_completion_stream(
+            messages,
+            temperature=0.7,
+            skip_anonymization=True,
+            max_tokens=1000
+        ):
+            cache_hit = cache_hit or is_cache_hit(token)
+            chunks.append(token)
+            yield {"event": "token", "content": token}
+
+    reply = "".join(chunks)
+    yield {
+        "event": "done",
+        "reply": reply,
+        "cited_cases": _extract_cited_cases(reply, similar_cases),
+        "cache_hit": cache_hit
+    }
+
+
+async def _build_chat_messages(
+    message: str,
+    conversation_history: list[dict],
+    contract_context: dict = None
+) -> tuple[list[dict], list[dict]]:
+    """관련 판례 검색 후 LLM 요청 메시지 구성"""
 
     # 1. 관련 판례 검색
     similar_cases = await search_similar_cases(message, top_k=3)
 
-    # 2. 시스템 프롬프트 구성
-    system_content = SYSTEM_PROMPT
+    # 2. 요청별 컨텍스트 구성
+    # (고정 시스템 프롬프트를 바이트 단위로 유지해 제공자 프롬프트 캐시가 적용되도록 별도 메시지로 전달)
+    context_parts = []
 
     # 계약서 컨텍스트가 있으면 추가
     if contract_context:
-        context_info = f"""
-현재 사용자가 분석 중인 계약서 정보:
+        context_info = f"""현재 사용자가 분석 중인 계약서 정보:
 - 계약서 유형: {contract_context.get('contract_type', '알 수 없음')}
 - 요약: {contract_context.get('summary', '없음')}
 """
@@ -48,17 +116,17 @@ async def generate_chat_response(
             for clause in contract_context['high_risk_clauses'][:3]:
                 context_info += f"- {clause.get('title', '조항')}: {clause.get('summary', '')}\n"
 
-        system_content += f"\n\n{context_info}"
+        context_parts.append(context_info.strip())
 
     # 판례 정보 추가
     if similar_cases:
-        cases_info = "\n\n참고할 수 있는 관련 판례:\n"
+        cases_info = "참고할 수 있는 관련 판례:\n"
         for case in similar_cases:
             cases_info += f"- {case['case_number']}: {case['summary']}\n"
-        system_content += cases_info
+        context_parts.append(cases_info.strip())
 
-    # 3. 메시지 구성
-    messages = [{"role": "system", "content": system_content}]
+    # 3. 메시지 구성: 고정 시스템 프롬프트 → 대화 히스토리 → 요청별 컨텍스트 → 현재 메시지
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
 
     # 대화 히스토리 추가
     for msg in conversation_history[-10:]:  # 최근 10개만
@@ -67,20 +135,20 @@ async def generate_chat_response(
             "content": msg.get("content", "")
         })
 
+    if context_parts:
+        messages.append({"role": "system", "content": "\n\n".join(context_parts)})
+
     # 현재 메시지 추가
     messages.append({"role": "user", "content": message})
 
-    # 4. OpenAI API 호출
-    response = client.chat.completions.create(
-        model=settings.openai_model,
-        messages=messages,
-        temperature=0.7,
-        max_tokens=1000
-    )
+    # 프롬프트 예산 초과 시 오래된 대화 요약, 컨텍스트 축소
+    messages = fit_messages(messages, get_prompt_budget("chat"), settings.current_model, "chat")
+
+    return messages, similar_cases
 
-    reply = response.choices[0].message.content
 
-    # 5. 인용된 판례 추출 (응답에서 언급된 판례만)
+def _extract_cited_cases(reply: str, similar_cases: list[dict]) -> list[dict]:
+    """인용된 판례 추출 (응답에서 언급된 판례만)"""
     cited_cases = []
     for case in similar_cases:
         if case['case_number'] in reply:
@@ -99,7 +167,4 @@ async def generate_chat_response(
                 "relevance": "관련 판례"
             })
 
-    return {
-        "reply": reply,
-        "cited_cases": cited_cases
-    }
+    return cited_cases
@@ -0,0 +1,112 @@
+"""
+조항 단위 분석 결과 캐시
+- 분쟁 해결, 비밀유지, 계약 해지 등 반복되는 정형 조항의 LLM 재호출 방지
+- 공백, 조항 번호, 당사자 명칭을 제거한 정규화 텍스트 + 컨텍스트 + 모델로 키 생성
+"""
+import copy
+import hashlib
+import re
+from typing import Optional, Dict, Any
+
+from app.core.cache import LRUCache
+from app.core.config import get_settings
+from app.core.metrics import CACHE_REQUESTS
+
+
+settings = get_settings()
+
+# 조항/항/호 번호 (제1조(목적), 제 2 항, 1., 1), (1), ①)
+# 숫자 번호는 뒤에 공백이 있어야 번호로 봄 ("2.5% 지연이자"의 소수점은 유지)
+_NUMBERING_PATTERNS = [
+    re.compile(r'^\s*제\s*\d+\s*조(?:의\s*\d+)?\s*(?:\([^)]*\))?'),
+    re.compile(r'^\s*제\s*\d+\s*[항호]'),
+    re.compile(r'^\s*\(?\d{1,3}[.)](?=\s|$)\s*'),
+    re.compile(r'^\s*[①-⑳]\s*'),
+]
+
+# 당사자 명칭 (회사명, 정의된 당사자 이름)
+_PARTY_PATTERNS = [
+    re.compile(r'(?:주식회사|유한회사|\(주\)|㈜)\s*[가-힣A-Za-z0-9&]+'),
+    re.compile(r'[가-힣A-Za-z0-9&]+\s*(?:주식회사|유한회사|\(주\)|㈜)'),
+    re.compile(r'["“][^"”]{1,30}["”]\s*\(\s*이하\s*["“]?'),
+]
+
+# 당사자 명칭 뒤에 붙는 조사 (명칭과 함께 치환되지 않도록 보존)
+_PARTICLES = ("에게", "으로", "의", "은", "는", "이", "가", "을", "를", "에", "와", "과", "로")
+
+_WHITESPACE = re.compile(r'\s+')
+_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+
+def normalize_clause_text(text: str) -> str:
+    """조항 비교용 정규화 (번호, 당사자 명칭, 공백 차이 제거)"""
+    lines = []
+    for line in text.translate(_QUOTES).splitlines():
+        for pattern in _NUMBERING_PATTERNS:
+            line = pattern.sub("", line, count=1)
+        lines.append(line)
+    normalized = " ".join(lines)
+
+    for pattern in _PARTY_PATTERNS:
+        normalized = pattern.sub(_replace_party, normalized)
+
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def _replace_party(match: re.Match) -> str:
+    name = match.group(0)
+    for particle in _PARTICLES:
+        if name.endswith(particle) and not name.endswith(("(주)", "㈜")):
+            return "[당사자]" + particle
+    return "[당사자]"
+
+
+class ClauseAnalysisCache:
+    """정규화된 조항 텍스트 기반 분석 결과 캐시 (TTL + 크기 제한)"""
+
+    def __init__(self, max_size: int = 2048, ttl_seconds: Optional[float] = None):
+        self.cache = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    def make_key(self, clause: str, context: str, model: str, prompt_version: str) -> str:
+        raw = "\x1f".join([normalize_clause_text(clause), context, model, prompt_version])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str, model: str = "", endpoint: str = "clause_analysis") -> Optional[Dict[str, Any]]:
+        """
+        Args:
+            model / endpoint: 메트릭 라벨 (키를 만들 때 사용한 모델 구성, 호출 엔드포인트)
+        """
+        result = self.cache.get(key)
+        CACHE_REQUESTS.inc(
+            cache="clause",
+            provider=settings.llm_provider,
+            model=model,
+            endpoint=endpoint,
+            result="miss" if result is None else "hit"
+        )
+        # 호출자가 결과를 수정해도 캐시가 오염되지 않도록 복사본 반환
+        return copy.deepcopy(result) if result is not None else None
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        self.cache.set(key, copy.deepcopy(result))
+
+    def clear(self) -> int:
+        return self.cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.cache.stats(), "ttl_seconds": self.cache.ttl_seconds}
+
+
+# 싱글톤 인스턴스
+_clause_cache: Optional[ClauseAnalysisCache] = None
+
+
+def get_clause_cache() -> ClauseAnalysisCache:
+    """조항 분석 캐시 인스턴스 반환"""
+    global _clause_cache
+    if _clause_cache is None:
+        _clause_cache = ClauseAnalysisCache(
+            max_size=settings.clause_cache_size,
+            ttl_seconds=settings.clause_cache_ttl_seconds or None
+        )
+    return _clause_cache
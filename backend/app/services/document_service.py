@@ -2,7 +2,9 @@
 통합 문서 처리 서비스
 PDF, HWP, HWPX 파일 지원
 """
+import time
 from typing import Tuple
+from app.core.metrics import DOCUMENT_EXTRACTION_DURATION
 from app.services.pdf_service import extract_text_from_pdf, split_into_clauses, get_contract_type
 from app.services.hwp_service import extract_text_from_hwp, is_hwp_file, get_supported_extensions
 
@@ -37,14 +39,23 @@ def extract_text_from_document(file_bytes: bytes, filename: str) -> str:
         추출된 텍스트
     """
     ext = get_file_extension(filename)
-
-    if ext == '.pdf':
-        return extract_text_from_pdf(file_bytes)
-    elif ext in ['.hwp', '.hwpx']:
-        return extract_text_from_hwp(file_bytes)
-    else:
+    if ext not in SUPPORTED_EXTENSIONS:
         raise ValueError(f"지원하지 않는 파일 형식입니다: {ext}")
 
+    start = time.perf_counter()
+    status = "error"
+    try:
+        if ext == '.pdf':
+            text = extract_text_from_pdf(file_bytes)
+        else:
+            text = extract_text_from_hwp(file_bytes)
+        status = "success"
+        return text
+    finally:
+        DOCUMENT_EXTRACTION_DURATION.observe(
+            time.perf_counter() - start, format=ext.lstrip('.'), status=status
+        )
+
 
 def validate_file(filename: str, file_size: int) -> Tuple[bool, str]:
     """
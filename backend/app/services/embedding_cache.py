@@ -0,0 +1,201 @@
+"""
+임베딩 캐시 (메모리 맵 벡터 저장소)
+- 텍스트 해시 + 임베딩 모델로 키 생성, 같은 조항/판례를 다시 임베딩하지 않음
+- 모델별 추가 전용 float32 파일 + 키 색인 파일로 저장 (재시작 후에도 유지)
+- 조회 결과는 메모리 맵 위의 NumPy 뷰 (복사 없음), 여러 워커 프로세스가 같은 파일 공유
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.metrics import CACHE_REQUESTS
+from app.core.usage import current_endpoint
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 동작
+    fcntl = None
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_ITEM_SIZE = np.dtype(np.float32).itemsize
+
+
+@contextmanager
+def _file_lock(path: str):
+    """프로세스 간 배타 잠금 (추가 쓰기 직렬화)"""
+    with open(path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class EmbeddingStore:
+    """
+    한 임베딩 모델의 벡터 저장소
+
+    vectors.f32: 벡터를 행 단위로 이어 붙인 float32 파일 (추가 전용)
+    index.tsv:   "키<TAB>행 번호<TAB>차원" 줄 목록 (추가 전용)
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.index_path = os.path.join(directory, "index.tsv")
+        self.lock_path = os.path.join(directory, ".lock")
+        os.makedirs(directory, exist_ok=True)
+
+        self.dim: Optional[int] = None
+        self._index: Dict[str, int] = {}
+        self._index_offset = 0
+        self._vectors: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+
+        self._refresh_index()
+
+    def _refresh_index(self) -> None:
+        """다른 프로세스가 추가한 색인 줄까지 읽어 반영"""
+        try:
+            with open(self.index_path, "rb") as f:
+                f.seek(self._index_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        # 쓰는 중인 마지막 줄은 다음 조회 때 반영
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("utf-8").splitlines():
+            try:
+                key, row, dim = line.split("\t")
+                self._index[key] = int(row)
+                self.dim = int(dim)
+            except ValueError:
+                logger.warning(f"임베딩 색인의 잘못된 줄 무시: {line!r}")
+        self._index_offset += end
+
+    def _row_view(self, row: int) -> np.ndarray:
+        # 파일이 늘어난 경우에만 다시 매핑 (이전에 반환한 뷰는 기존 매핑을 그대로 참조)
+        if self._vectors is None or row >= self._vectors.shape[0]:
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r").reshape(-1, self.dim)
+        return self._vectors[row]
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """저장된 벡터 (읽기 전용 뷰), 없으면 None"""
+        with self._lock:
+            row = self._index.get(key)
+            if row is None:
+                self._refresh_index()
+                row = self._index.get(key)
+            if row is None:
+                return None
+            return self._row_view(row)
+
+    def put(self, key: str, vector: List[float]) -> None:
+        """벡터 추가 (이미 있는 키면 무시)"""
+        array = np.asarray(vector, dtype=np.float32).ravel()
+        with self._lock, _file_lock(self.lock_path):
+            self._refresh_index()
+            if key in self._index:
+                return
+            if self.dim is None:
+                self.dim = array.shape[0]
+            elif array.shape[0] != self.dim:
+                raise ValueError(f"임베딩 차원이 다릅니다: {array.shape[0]} != {self.dim}")
+
+            row_size = self.dim * _ITEM_SIZE
+            mode = "r+b" if os.path.exists(self.vectors_path) else "wb"
+            with open(self.vectors_path, mode) as f:
+                f.seek(0, os.SEEK_END)
+                row = f.tell() // row_size
+                # 중단된 쓰기로 남은 불완전한 행 제거
+                f.truncate(row * row_size)
+                f.seek(row * row_size)
+                f.write(array.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+            with open(self.index_path, "ab") as f:
+                f.write(f"{key}\t{row}\t{self.dim}\n".encode("utf-8"))
+
+            self._index[key] = row
+
+
+class EmbeddingCache:
+    """모델별 임베딩 저장소 모음"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self._stores: Dict[str, EmbeddingStore] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def make_key(self, text: str, model: str, anonymized: bool = False) -> str:
+        """텍스트 + 모델 (+ 익명화 여부) 기반 키"""
+        raw = "\x1f".join([model, "anonymized" if anonymized else "raw", text])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _store(self, model: str) -> EmbeddingStore:
+        with self._lock:
+            if model not in self._stores:
+                name = re.sub(r"[^A-Za-z0-9._-]", "_", model)
+                self._stores[model] = EmbeddingStore(os.path.join(self.cache_dir, name))
+            return self._stores[model]
+
+    def get(self, model: str, key: str, provider: str = "") -> Optional[np.ndarray]:
+        vector = self._store(model).get(key)
+        if vector is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        CACHE_REQUESTS.inc(
+            cache="embedding",
+            provider=provider,
+            model=model,
+            endpoint=current_endpoint(),
+            result="miss" if vector is None else "hit"
+        )
+        return vector
+
+    def put(self, model: str, key: str, vector: List[float]) -> None:
+        self._store(model).put(key, vector)
+        self.stores += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "stores": self.stores,
+            "models": {model: {"vectors": len(store), "dim": store.dim} for model, store in self._stores.items()},
+        }
+
+
+# 싱글톤 인스턴스
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """임베딩 캐시 인스턴스 반환"""
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(settings.embedding_cache_dir)
+    return _embedding_cache
@@ -0,0 +1,399 @@
+"""
+계약서 분석 작업 큐 서비스
+- 분석 요청을 작업으로 등록하고 즉시 반환 (HTTP 연결을 오래 붙잡지 않음)
+- SQLite 기반 로컬 큐 (서버 재시작 후에도 작업 유지)
+- 프로세스 내 워커 풀이 작업을 처리
+- 조항 단위 진행률 조회 및 이벤트 구독
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from enum import Enum
+from typing import Optional, Dict, Any, List, AsyncIterator
+
+from app.core.config import get_settings
+from app.services.analysis_service import (
+    prepare_contract,
+    iter_analyzed_clauses,
+    build_analysis_result,
+    get_cached_analysis,
+    cache_analysis,
+)
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(Enum):
+    """작업 상태"""
+    QUEUED = "queued"  # 대기 중
+    RUNNING = "running"  # 분석 중
+    COMPLETED = "completed"  # 완료
+    FAILED = "failed"  # 실패
+
+
+TERMINAL_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED)
+
+
+@dataclass
+class AnalysisJob:
+    """분석 작업"""
+    job_id: str
+    filename: str
+    status: JobStatus
+    created_at: str
+    total_clauses: int = 0
+    completed_clauses: int = 0
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["status"] = self.status.value
+        data["progress"] = (
+            round(self.completed_clauses / self.total_clauses, 3)
+            if self.total_clauses else 0.0
+        )
+        return data
+
+
+class JobStore:
+    """SQLite 작업 저장소 (여러 워커 프로세스가 공유 가능)"""
+
+    _COLUMNS = (
+        "job_id, filename, status, created_at, total_clauses, "
+        "completed_clauses, started_at, finished_at, error"
+    )
+
+    def __init__(self, db_path: str):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.Lock()
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS analysis_jobs (
+                job_id TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                total_clauses INTEGER NOT NULL DEFAULT 0,
+                completed_clauses INTEGER NOT NULL DEFAULT 0,
+                started_at TEXT,
+                finished_at TEXT,
+                error TEXT,
+                file_bytes BLOB,
+                result TEXT
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_analysis_jobs_status "
+            "ON analysis_jobs (status, created_at)"
+        )
+
+    def insert(self, job: AnalysisJob, file_bytes: bytes) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO analysis_jobs (job_id, filename, status, created_at, file_bytes) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job.job_id, job.filename, job.status.value, job.created_at, file_bytes)
+            )
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM analysis_jobs WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+        return self._to_job(row) if row else None
+
+    def claim_next(self) -> Optional[tuple[AnalysisJob, bytes]]:
+        """가장 오래된 대기 작업을 실행 상태로 전환하여 반환"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    f"SELECT {self._COLUMNS}, file_bytes FROM analysis_jobs "
+                    "WHERE status = ? ORDER BY created_at LIMIT 1",
+                    (JobStatus.QUEUED.value,)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+
+                started_at = datetime.now().isoformat()
+                self._conn.execute(
+                    "UPDATE analysis_jobs SET status = ?, started_at = ? WHERE job_id = ?",
+                    (JobStatus.RUNNING.value, started_at, row[0])
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        job = self._to_job(row[:-1])
+        job.status = JobStatus.RUNNING
+        job.started_at = started_at
+        return job, row[-1]
+
+    def update_progress(self, job_id: str, total_clauses: int, completed_clauses: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE analysis_jobs SET total_clauses = ?, completed_clauses = ? WHERE job_id = ?",
+                (total_clauses, completed_clauses, job_id)
+            )
+
+    def complete(self, job_id: str, result: Dict[str, Any], finished_at: str) -> None:
+        """작업 완료 처리 (원본 파일은 삭제)"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE analysis_jobs SET status = ?, finished_at = ?, result = ?, "
+                "file_bytes = NULL WHERE job_id = ?",
+                (
+                    JobStatus.COMPLETED.value,
+                    finished_at,
+                    json.dumps(result, ensure_ascii=False),
+                    job_id
+                )
+            )
+
+    def fail(self, job_id: str, error: str, finished_at: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE analysis_jobs SET status = ?, finished_at = ?, error = ?, "
+                "file_bytes = NULL WHERE job_id = ?",
+                (JobStatus.FAILED.value, finished_at, error, job_id)
+            )
+
+    def get_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM analysis_jobs WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+        if not row or row[0] is None:
+            return None
+        return json.loads(row[0])
+
+    def requeue_running(self) -> int:
+        """
+        중단된(실행 중이던) 작업을 대기 상태로 되돌림
+        - 서버 시작 시 호출 (단일 프로세스 배포 기준)
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE analysis_jobs SET status = ?, started_at = NULL, "
+                "completed_clauses = 0 WHERE status = ?",
+                (JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _to_job(self, row: tuple) -> AnalysisJob:
+        return AnalysisJob(
+            job_id=row[0],
+            filename=row[1],
+            status=JobStatus(row[2]),
+            created_at=row[3],
+            total_clauses=row[4],
+            completed_clauses=row[5],
+            started_at=row[6],
+            finished_at=row[7],
+            error=row[8],
+        )
+
+
+class JobService:
+    """분석 작업 서비스 (워커 풀 + 구독)"""
+
+    # 다른 프로세스에서 처리 중인 작업을 구독할 때의 폴링 주기 (초)
+    POLL_INTERVAL = 1.0
+
+    def __init__(self, store: JobStore, num_workers: int = 2):
+        self.store = store
+        self.num_workers = max(1, num_workers)
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+
+    async def start(self) -> None:
+        """워커 풀 시작 (중단된 작업은 다시 대기열로)"""
+        if self._workers:
+            return
+
+        requeued = await asyncio.to_thread(self.store.requeue_running)
+        if requeued:
+            logger.info(f"중단된 분석 작업 {requeued}개를 다시 대기열에 추가했습니다.")
+
+        self._wakeup = asyncio.Event()
+        self._wakeup.set()  # 기존 대기 작업 즉시 처리
+        self._workers = [
+            asyncio.create_task(self._worker_loop(i))
+            for i in range(self.num_workers)
+        ]
+
+    async def stop(self) -> None:
+        """워커 풀 종료 (실행 중이던 작업은 다음 시작 시 재처리)"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, file_bytes: bytes, filename: str) -> AnalysisJob:
+        """분석 작업 등록"""
+        job = AnalysisJob(
+            job_id=str(uuid.uuid4()),
+            filename=filename,
+            status=JobStatus.QUEUED,
+            created_at=datetime.now().isoformat(),
+        )
+        await asyncio.to_thread(self.store.insert, job, file_bytes)
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[AnalysisJob]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def get_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.store.get_result, job_id)
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        작업 이벤트 구독
+
+        이벤트:
+            status - 작업 상태 및 진행률 (처음과 상태 변경 시)
+            clause - 분석이 끝난 조항 (이 프로세스에서 처리 중인 경우)
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, []).append(queue)
+        try:
+            job = await self.get_job(job_id)
+            if job is None:
+                return
+            last_snapshot = job.to_dict()
+            yield {"event": "status", **last_snapshot}
+
+            while job.status not in TERMINAL_STATUSES:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=self.POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    # 다른 프로세스에서 처리 중일 수 있으므로 저장소에서 직접 확인
+                    job = await self.get_job(job_id)
+                    snapshot = job.to_dict()
+                    if snapshot != last_snapshot:
+                        last_snapshot = snapshot
+                        yield {"event": "status", **snapshot}
+                    continue
+
+                yield event
+                if event["event"] == "status":
+                    last_snapshot = {k: v for k, v in event.items() if k != "event"}
+                    job.status = JobStatus(event["status"])
+        finally:
+            subscribers = self._subscribers.get(job_id, [])
+            if queue in subscribers:
+                subscribers.remove(queue)
+            if not subscribers:
+                self._subscribers.pop(job_id, None)
+
+    def _publish(self, job_id: str, event: Dict[str, Any]) -> None:
+        for queue in self._subscribers.get(job_id, []):
+            queue.put_nowait(event)
+
+    async def _worker_loop(self, worker_index: int) -> None:
+        while True:
+            claimed = await asyncio.to_thread(self.store.claim_next)
+            if claimed is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.POLL_INTERVAL * 5)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job, file_bytes = claimed
+            logger.info(f"[worker-{worker_index}] 분석 작업 시작: {job.job_id}")
+            await self._run_job(job, file_bytes)
+
+    async def _run_job(self, job: AnalysisJob, file_bytes: bytes) -> None:
+        try:
+            # 동일 문서의 이전 분석 결과가 있으면 바로 완료 처리
+            cached = await get_cached_analysis(file_bytes)
+            if cached is not None:
+                job.total_clauses = job.completed_clauses = cached["total_clauses"]
+                await asyncio.to_thread(
+                    self.store.update_progress,
+                    job.job_id, job.total_clauses, job.completed_clauses
+                )
+                job.finished_at = datetime.now().isoformat()
+                await asyncio.to_thread(self.store.complete, job.job_id, cached, job.finished_at)
+                job.status = JobStatus.COMPLETED
+                self._publish(job.job_id, {"event": "status", **job.to_dict()})
+                return
+
+            # 텍스트 추출은 CPU 작업이므로 스레드에서 실행
+            prepared = await asyncio.to_thread(prepare_contract, file_bytes, job.filename)
+            clauses = prepared["clauses"]
+            contract_type = prepared["contract_type"]
+
+            job.total_clauses = len(clauses)
+            await asyncio.to_thread(self.store.update_progress, job.job_id, job.total_clauses, 0)
+            self._publish(job.job_id, {"event": "status", **job.to_dict()})
+
+            analyzed_clauses: List[dict] = [None] * len(clauses)
+            async for index, analyzed in iter_analyzed_clauses(clauses, contract_type):
+                analyzed_clauses[index] = analyzed
+                job.completed_clauses += 1
+                await asyncio.to_thread(
+                    self.store.update_progress,
+                    job.job_id, job.total_clauses, job.completed_clauses
+                )
+                self._publish(job.job_id, {"event": "clause", "index": index, "clause": analyzed})
+
+            result = build_analysis_result(contract_type, analyzed_clauses)
+            await cache_analysis(file_bytes, result)
+            job.finished_at = datetime.now().isoformat()
+            await asyncio.to_thread(self.store.complete, job.job_id, result, job.finished_at)
+            job.status = JobStatus.COMPLETED
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"분석 작업 실패 {job.job_id}: {e}")
+            job.finished_at = datetime.now().isoformat()
+            await asyncio.to_thread(self.store.fail, job.job_id, str(e), job.finished_at)
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+
+        self._publish(job.job_id, {"event": "status", **job.to_dict()})
+
+
+# 싱글톤 인스턴스
+_job_service: Optional[JobService] = None
+
+
+def get_job_service() -> JobService:
+    """작업 서비스 인스턴스 반환"""
+    global _job_service
+    if _job_service is None:
+        _job_service = JobService(
+            JobStore(settings.job_db_path),
+            num_workers=settings.job_workers
+        )
+    return _job_service
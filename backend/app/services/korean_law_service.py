@@ -11,12 +11,27 @@ from dataclasses import dataclass
 from enum import Enum
 import asyncio
 import re
+import time
 
 from app.core.config import get_settings
+from app.core.metrics import LAW_API_DURATION
 
 settings = get_settings()
 
 
+async def _api_get(client: httpx.AsyncClient, url: str, params: Dict[str, Any], api: str) -> httpx.Response:
+    """법령/판례 API GET 요청 (지연 시간 및 결과 기록)"""
+    start = time.perf_counter()
+    status = "error"
+    try:
+        response = await client.get(url, params=params)
+        status = str(response.status_code)
+        response.raise_for_status()
+        return response
+    finally:
+        LAW_API_DURATION.observe(time.perf_counter() - start, api=api, status=status)
+
+
 class ContractType(Enum):
     """계약서 유형"""
     INVESTMENT = "투자계약서"
@@ -82,8 +97,7 @@ class KoreanLawAPIClient:
         }
 
         try:
-            response = await self.client.get(self.BASE_URL, params=params)
-            response.raise_for_status()
+            response = await _api_get(self.client, self.BASE_URL, params, api="law_search")
             return self._parse_law_search_result(response.text)
         except Exception as e:
             print(f"법령 검색 오류: {e}")
@@ -99,8 +113,7 @@ class KoreanLawAPIClient:
         }
 
         try:
-            response = await self.client.get(self.BASE_URL, params=params)
-            response.raise_for_status()
+            response = await _api_get(self.client, self.BASE_URL, params, api="law_detail")
             return self._parse_law_detail(response.text)
         except Exception as e:
             print(f"법령 상세 조회 오류: {e}")
@@ -182,8 +195,7 @@ class CourtCaseSearchClient:
         }
 
         try:
-            response = await self.client.get(self.BASE_URL, params=params)
-            response.raise_for_status()
+            response = await _api_get(self.client, self.BASE_URL, params, api="case_search")
             return self._parse_case_search_result(response.text, court)
         except Exception as e:
             print(f"판례 검색 오류: {e}")
@@ -199,8 +211,7 @@ class CourtCaseSearchClient:
         }
 
         try:
-            response = await self.client.get(self.BASE_URL, params=params)
-            response.raise_for_status()
+            response = await _api_get(self.client, self.BASE_URL, params, api="case_detail")
             return self._parse_case_detail(response.text)
         except Exception as e:
             print(f"판례 상세 조회 오류: {e}")
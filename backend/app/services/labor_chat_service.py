@@ -1,9 +1,13 @@
 # 노동상담 챗봇 서비스
-from openai import OpenAI
+from typing import AsyncIterator
+
 from app.core.config import get_settings
+from app.core.llm_client import get_llm_client
+from app.core.semantic_cache import is_cache_hit
+from app.core.token_budget import fit_messages, get_prompt_budget
+from app.core.usage import llm_endpoint
 
 settings = get_settings()
-client = OpenAI(api_key=settings.openai_api_key)
 
 LABOR_SYSTEM_PROMPT = """# 역할
 당신은 대한민국 노동법 전문 AI 상담사 "노동톡"입니다.
@@ -173,33 +177,100 @@ async def generate_labor_chat_response(
     consultation_info: dict = None
 ) -> dict:
     """노동상담 챗봇 응답 생성"""
+    messages, similar_cases = await _build_labor_chat_messages(
+        message, conversation_history, consultation_info
+    )
+
+    # LLM API 호출
+    with llm_endpoint("labor_chat"):
+        reply = await get_llm_client().chat_completion(
+            messages,
+            temperature=0.7,
+            skip_anonymization=True,
+            max_tokens=1000
+        )
+
+    return {
+        "reply": reply,
+        "cited_cases": _extract_cited_cases(reply, similar_cases),
+        "needs_expert": needs_expert_consultation(message),
+        "cache_hit": is_cache_hit(reply)
+    }
+
+
+async def stream_labor_chat_response(
+    message: str,
+    conversation_history: list[dict],
+    consultation_info: dict = None
+) -> AsyncIterator[dict]:
+    """
+    노동상담 챗봇 응답 스트리밍 생성
+
+    이벤트:
+        token - 생성된 텍스트 조각
+        done  - 전체 응답, 인용 판례, 전문가 연결 필요 여부 (마지막)
+    """
+    messages, similar_cases = await _build_labor_chat_messages(
+        message, conversation_history, consultation_info
+    )
+
+    chunks = []
+    cache_hit = False
+    with llm_endpoint("labor_chat"):
+        async for token in get_llm_client().chat_completion_stream(
+            messages,
+            temperature=0.7,
+            skip_anonymization=True,
+            max_tokens=1000
+        ):
+            cache_hit = cache_hit or is_cache_hit(token)
+            chunks.append(token)
+            yield {"event": "token", "content": token}
+
+    reply = "".join(chunks)
+    yield {
+        "event": "done",
+        "reply": reply,
+        "cited_cases": _extract_cited_cases(reply, similar_cases),
+        "needs_expert": needs_expert_consultation(message),
+        "cache_hit": cache_hit
+    }
+
+
+async def _build_labor_chat_messages(
+    message: str,
+    conversation_history: list[dict],
+    consultation_info: dict = None
+) -> tuple[list[dict], list[dict]]:
+    """관련 판례 검색 후 LLM 요청 메시지 구성"""
 
     # 1. 관련 판례 검색
     similar_cases = await search_labor_cases(message, top_k=3)
 
-    # 2. 시스템 프롬프트 구성
-    system_content = LABOR_SYSTEM_PROMPT
+    # 2. 요청별 컨텍스트 구성
+    # (고정 시스템 프롬프트를 바이트 단위로 유지해 제공자 프롬프트 캐시가 적용되도록 별도 메시지로 전달)
+    context_parts = []
 
     # 상담 정보가 있으면 추가
     if consultation_info:
-        context_info = "\n\n현재 상담 정보:\n"
+        context_info = "현재 상담 정보:\n"
         if consultation_info.get('category'):
             context_info += f"- 상담 유형: {consultation_info['category']}\n"
         if consultation_info.get('employment_status'):
             context_info += f"- 고용 상태: {consultation_info['employment_status']}\n"
         if consultation_info.get('company_size'):
             context_info += f"- 회사 규모: {consultation_info['company_size']}\n"
-        system_content += context_info
+        context_parts.append(context_info.strip())
 
     # 판례 정보 추가
     if similar_cases:
-        cases_info = "\n\n참고할 수 있는 관련 판례:\n"
+        cases_info = "참고할 수 있는 관련 판례:\n"
         for case in similar_cases:
             cases_info += f"- {case['case_number']}: {case['summary']}\n"
-        system_content += cases_info
+        context_parts.append(cases_info.strip())
 
-    # 3. 메시지 구성
-    messages = [{"role": "system", "content": system_content}]
+    # 3. 메시지 구성: 고정 시스템 프롬프트 → 대화 히스토리 → 요청별 컨텍스트 → 현재 메시지
+    messages = [{"role": "system", "content": LABOR_SYSTEM_PROMPT}]
 
     # 대화 히스토리 추가 (최근 10개)
     for msg in conversation_history[-10:]:
@@ -208,20 +279,20 @@ async def generate_labor_chat_response(
             "content": msg.get("content", "")
         })
 
+    if context_parts:
+        messages.append({"role": "system", "content": "\n\n".join(context_parts)})
+
     # 현재 메시지 추가
     messages.append({"role": "user", "content": message})
 
-    # 4. OpenAI API 호출
-    response = client.chat.completions.create(
-        model=settings.openai_model,
-        messages=messages,
-        temperature=0.7,
-        max_tokens=1000
-    )
+    # 프롬프트 예산 초과 시 오래된 대화 요약, 컨텍스트 축소
+    messages = fit_messages(messages, get_prompt_budget("labor_chat"), settings.current_model, "labor_chat")
 
-    reply = response.choices[0].message.content
+    return messages, similar_cases
 
-    # 5. 인용된 판례 추출
+
+def _extract_cited_cases(reply: str, similar_cases: list[dict]) -> list[dict]:
+    """인용된 판례 추출"""
     cited_cases = []
     for case in similar_cases:
         if case['case_number'] in reply:
@@ -240,14 +311,12 @@ async def generate_labor_chat_response(
                 "relevance": "관련 판례"
             })
 
-    # 6. 전문가 연결 필요 여부 판단
-    needs_expert = any(keyword in message.lower() for keyword in [
+    return cited_cases
+
+
+def needs_expert_consultation(message: str) -> bool:
+    """전문가 연결 필요 여부 판단"""
+    return any(keyword in message.lower() for keyword in [
         "소송", "진정", "고소", "신고", "얼마", "받을 수 있", "청구",
         "퇴직금", "해고", "체불", "300만원", "500만원", "1000만원"
     ])
-
-    return {
-        "reply": reply,
-        "cited_cases": cited_cases,
-        "needs_expert": needs_expert
-    }
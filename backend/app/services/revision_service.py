@@ -0,0 +1,186 @@
+"""
+개정 계약서 증분 분석 서비스
+- 이전 분석 결과와 새 문서의 조항을 내용 해시 + 유사도로 정렬
+- 변경되었거나 새로 추가된 조항만 다시 분석하고 나머지는 이전 결과 재사용
+"""
+import asyncio
+import hashlib
+from difflib import SequenceMatcher
+from typing import Optional, List, Dict, Any
+
+from app.core.config import get_settings
+from app.services.analysis_service import (
+    prepare_contract,
+    iter_analyzed_clauses,
+    build_analysis_result,
+    get_cached_analysis,
+    cache_analysis,
+)
+from app.services.clause_cache import normalize_clause_text
+
+
+settings = get_settings()
+
+
+def _content_hash(content: str) -> str:
+    return hashlib.sha256(normalize_clause_text(content).encode()).hexdigest()
+
+
+def align_clauses(
+    prior_clauses: List[Dict[str, Any]],
+    new_clauses: List[Dict[str, Any]],
+    threshold: float = 0.6
+) -> Dict[str, Any]:
+    """
+    이전/새 조항 정렬
+
+    1. 정규화된 내용 해시가 같으면 unchanged (번호, 공백, 당사자 명칭 차이 무시)
+    2. 남은 조항은 유사도가 threshold 이상인 이전 조항과 modified로 연결
+    3. 연결되지 않은 새 조항은 added, 이전 조항은 removed
+
+    Returns:
+        {"matches": [(새 인덱스, 이전 인덱스 또는 None, 상태)], "removed": [이전 인덱스]}
+    """
+    unused: Dict[str, List[int]] = {}
+    for i, clause in enumerate(prior_clauses):
+        unused.setdefault(_content_hash(clause.get("content", "")), []).append(i)
+
+    matches: List[Optional[tuple]] = [None] * len(new_clauses)
+    used_prior = set()
+
+    # 1. 내용 해시 일치
+    for j, clause in enumerate(new_clauses):
+        candidates = unused.get(_content_hash(clause["content"]))
+        if candidates:
+            i = candidates.pop(0)
+            used_prior.add(i)
+            matches[j] = (j, i, "unchanged")
+
+    # 2. 유사도 기반 연결 (유사도가 높은 쌍부터)
+    remaining_prior = [i for i in range(len(prior_clauses)) if i not in used_prior]
+    remaining_new = [j for j in range(len(new_clauses)) if matches[j] is None]
+
+    prior_texts = {i: normalize_clause_text(prior_clauses[i].get("content", "")) for i in remaining_prior}
+    candidates = []
+    for j in remaining_new:
+        new_text = normalize_clause_text(new_clauses[j]["content"])
+        for i in remaining_prior:
+            matcher = SequenceMatcher(None, prior_texts[i], new_text, autojunk=False)
+            # 상한값으로 먼저 걸러 비용이 큰 ratio 계산을 줄임
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= threshold:
+                candidates.append((ratio, j, i))
+
+    for ratio, j, i in sorted(candidates, reverse=True):
+        if matches[j] is not None or i in used_prior:
+            continue
+        used_prior.add(i)
+        matches[j] = (j, i, "modified")
+
+    # 3. 추가/삭제
+    for j in remaining_new:
+        if matches[j] is None:
+            matches[j] = (j, None, "added")
+
+    removed = [i for i in range(len(prior_clauses)) if i not in used_prior]
+    return {"matches": matches, "removed": removed}
+
+
+async def reanalyze_contract(
+    file_bytes: bytes,
+    filename: str,
+    prior_result: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    개정 계약서 증분 분석
+
+    Args:
+        file_bytes: 새 버전 문서
+        filename: 파일명
+        prior_result: 이전 버전의 분석 결과 (analyze_contract 결과 형식)
+
+    Returns:
+        전체 분석 결과 + revision (조항별 변경 상태)
+    """
+    prior_clauses = prior_result.get("clauses", [])
+
+    cached = await get_cached_analysis(file_bytes)
+    if cached is not None:
+        contract_type = cached["contract_type"]
+        new_clauses = [
+            {"number": c["number"], "title": c["title"], "content": c["content"]}
+            for c in cached["clauses"]
+        ]
+    else:
+        prepared = await asyncio.to_thread(prepare_contract, file_bytes, filename)
+        contract_type = prepared["contract_type"]
+        new_clauses = prepared["clauses"]
+
+    alignment = align_clauses(
+        prior_clauses, new_clauses, threshold=settings.revision_match_threshold
+    )
+
+    analyzed_clauses: List[Optional[dict]] = [None] * len(new_clauses)
+    to_analyze: List[int] = []
+
+    for j, i, status in alignment["matches"]:
+        if status == "unchanged" and prior_clauses[i].get("analysis"):
+            # 이전 분석 결과를 새 번호/제목으로 이어받음
+            analyzed_clauses[j] = {
+                **prior_clauses[i],
+                **new_clauses[j],
+            }
+        elif cached is not None:
+            analyzed_clauses[j] = cached["clauses"][j]
+        else:
+            to_analyze.append(j)
+
+    # 변경/추가된 조항만 분석
+    subset = [new_clauses[j] for j in to_analyze]
+    async for index, analyzed in iter_analyzed_clauses(subset, contract_type):
+        analyzed_clauses[to_analyze[index]] = analyzed
+
+    result = build_analysis_result(contract_type, analyzed_clauses)
+    if cached is None:
+        await cache_analysis(file_bytes, result)
+
+    # 캐시에 저장한 결과를 수정하지 않도록 응답은 새 딕셔너리로 구성
+    return {
+        **result,
+        "revision": {
+            "unchanged": sum(1 for _, _, status in alignment["matches"] if status == "unchanged"),
+            "modified": sum(1 for _, _, status in alignment["matches"] if status == "modified"),
+            "added": sum(1 for _, _, status in alignment["matches"] if status == "added"),
+            "removed": len(alignment["removed"]),
+            "reanalyzed_clauses": len(to_analyze),
+            "clauses": [
+                {
+                    "number": new_clauses[j]["number"],
+                    "status": status,
+                    "previous_number": prior_clauses[i].get("number") if i is not None else None,
+                }
+                for j, i, status in alignment["matches"]
+            ],
+            "removed_clauses": [
+                {
+                    "previous_number": prior_clauses[i].get("number"),
+                    "title": prior_clauses[i].get("title", ""),
+                }
+                for i in alignment["removed"]
+            ],
+        },
+    }
+
+
+def describe_revision(revision: Dict[str, Any]) -> List[str]:
+    """협업 버전 기록용 변경 내역 문구"""
+    changes = []
+    if revision["modified"]:
+        changes.append(f"수정된 조항 {revision['modified']}개")
+    if revision["added"]:
+        changes.append(f"추가된 조항 {revision['added']}개")
+    if revision["removed"]:
+        changes.append(f"삭제된 조항 {revision['removed']}개")
+    return changes or ["변경된 조항 없음"]
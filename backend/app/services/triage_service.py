@@ -0,0 +1,106 @@
+"""
+조항 사전 분류 서비스
+- LLM 분석 전에 규칙 기반으로 명백히 위험도가 낮은 조항을 걸러냄
+  (서명란, 날짜, 당사자 정보, 제목만 있는 조항 등)
+- 위험 키워드가 하나라도 있으면 LLM 분석 대상으로 유지
+"""
+import re
+from typing import Optional, Dict, Any
+
+
+# 위험 키워드 (포함 시 반드시 LLM 분석)
+RISK_KEYWORDS = [
+    "손해배상", "배상", "위약금", "위약벌", "지체상금", "지연이자", "벌금", "몰수",
+    "해지", "해제", "해고", "징계", "면책", "책임", "보증", "연대", "담보",
+    "경업", "겸업", "비밀유지", "기밀", "전속", "귀속", "양도", "포기",
+    "일방", "즉시", "임의로", "변경할 수", "감액", "공제", "삭감", "반환",
+    "자동 갱신", "자동갱신", "관할", "중재", "지식재산", "저작권", "소유권",
+    "위반", "불이행", "취소", "무효", "청구", "환불", "초과근무", "연장근로",
+]
+
+_RISK_PATTERN = re.compile("|".join(re.escape(k) for k in RISK_KEYWORDS))
+
+# 고위험 판정으로 이어지는 경우가 많은 키워드 (법령 조회 선행 여부 판단용)
+HIGH_RISK_KEYWORDS = [
+    "손해배상", "위약금", "위약벌", "지체상금", "면책", "경업", "일방", "임의로",
+    "몰수", "포기", "연대보증", "자동갱신", "자동 갱신", "즉시 해지", "즉시 해고",
+]
+
+_HIGH_RISK_PATTERN = re.compile("|".join(re.escape(k) for k in HIGH_RISK_KEYWORDS))
+
+# 그 자체로 위험이 없는 줄 패턴
+_BENIGN_LINE_PATTERNS = [
+    # 서명란 ("갑: (서명)", "대표이사 홍길동 (인)", "서명:") - 문장 속 "서명"은 제외하도록 줄 전체가 서명란 형태일 때만
+    re.compile(
+        r'^\s*[(\[]?\s*(갑|을|병|정|임대인|임차인|근로자|사용자|사업주|발주자|수급자|대표자?|대표이사)?\s*[)\]]?\s*[:：]?\s*'
+        r'(\S{1,10}\s+){0,1}\S{0,10}\s*(서명|날인|기명날인|\(인\)|\(서명\)|\(날인\)|인감)\s*[:：]?\s*(\(인\))?\s*$'
+    ),
+    # 날짜만 있는 줄 (2024년 1월 1일, 2024. 1. 1.)
+    re.compile(r'^\s*\d{4}\s*[년.\-/]\s*\d{1,2}\s*[월.\-/]\s*\d{1,2}\s*일?\.?\s*$'),
+    # 당사자 정보 (주소: ..., 대표자: ...)
+    re.compile(
+        r'^\s*[(\[]?\s*(갑|을|병|정|임대인|임차인|근로자|사용자|발주자|수급자|투자자|회사)?\s*[)\]]?\s*'
+        r'(주\s*소|상\s*호|회사명|대표자|대표이사|성\s*명|이\s*름|연락처|전화번호|전\s*화|'
+        r'사업자\s*등록\s*번호|주민\s*등록\s*번호|생년월일|이메일|소재지)\s*[:：]'
+    ),
+    # 당사자 구분만 있는 줄 (갑), [을], 임대인 등)
+    re.compile(r'^\s*[(\[]?\s*(갑|을|병|정|임대인|임차인|근로자|사용자|발주자|수급자)\s*[)\]]?\s*[:：]?\s*$'),
+]
+
+# 본문 없이 조항 번호와 괄호 제목만 있는 줄 (제1조(목적), 제3조의2(정의))
+# "제7조 휴게시간 미부여"처럼 괄호 밖에 내용이 있는 한 줄 조항은 제목으로 보지 않음
+_HEADING_PATTERN = re.compile(r'^\s*제\s*\d+\s*조(?:의\s*\d+)?\s*[(（][^()（）]{1,30}[)）]\s*$')
+
+# 사전 분류 결과 (결정적 저위험 판정)
+PRESCREEN_ANALYSIS = {
+    "risk_score": 1,
+    "risk_level": "low",
+    "summary": "서명란, 날짜, 당사자 정보 등 위험 요소가 없는 형식적 조항입니다.",
+    "issues": [],
+    "legal_basis": "",
+    "suggestion": ""
+}
+
+
+def has_risk_keyword(text: str) -> bool:
+    """위험 키워드 포함 여부"""
+    return _RISK_PATTERN.search(text) is not None
+
+
+def predicts_high_risk(text: str) -> bool:
+    """
+    고위험 예상 여부
+    - 고위험 키워드가 있거나 위험 키워드가 3종류 이상이면 True
+    """
+    if _HIGH_RISK_PATTERN.search(text):
+        return True
+    return len(set(_RISK_PATTERN.findall(text))) >= 3
+
+
+def prescreen_clause(content: str) -> Optional[Dict[str, Any]]:
+    """
+    조항 사전 분류
+
+    Returns:
+        명백히 위험도가 낮은 조항이면 저위험 분석 결과, 판단이 필요하면 None
+    """
+    if has_risk_keyword(content):
+        return None
+
+    lines = [line.strip() for line in content.splitlines() if line.strip()]
+    if not lines:
+        return dict(PRESCREEN_ANALYSIS)
+
+    # 모든 줄이 서명/날짜/당사자 정보인 경우
+    if all(_is_benign_line(line) for line in lines):
+        return dict(PRESCREEN_ANALYSIS)
+
+    # 제목만 있는 조항 (정확히 "제N조(제목)" 형태의 한 줄)
+    if len(lines) == 1 and _HEADING_PATTERN.match(lines[0]):
+        return dict(PRESCREEN_ANALYSIS)
+
+    return None
+
+
+def _is_benign_line(line: str) -> bool:
+    return any(pattern.search(line) for pattern in _BENIGN_LINE_PATTERNS)
@@ -0,0 +1,13 @@
+import os
+import sys
+
+# app 패키지 import 및 설정 로딩용 (실제 API 호출 없음)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("LLM_PROVIDER", "fake")
+os.environ.setdefault("ANALYSIS_CACHE_DIR", "")
+os.environ.setdefault("EMBEDDING_CACHE_ENABLED", "false")
+os.environ.setdefault("FAKE_LLM_LATENCY_MS", "0")
+os.environ.setdefault("FAKE_LLM_EMBEDDING_LATENCY_MS", "0")
+os.environ.setdefault("FAKE_LLM_TOKENS_PER_SECOND", "0")
+os.environ.setdefault("LLM_RETRY_BASE_DELAY", "0.01")
@@ -0,0 +1,44 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from app.core.adaptive_concurrency import AdaptiveConcurrencyLimiter
+
+_REQUEST = httpx.Request("POST", "https://api.example.com/v1/chat/completions")
+
+
+class APITimeoutError(Exception):
+    """anthropic.APITimeoutError처럼 이름으로만 구분되는 SDK 예외"""
+
+
+@pytest.mark.parametrize("error", [
+    asyncio.TimeoutError(),
+    httpx.ReadTimeout("read timed out", request=_REQUEST),
+    openai.APITimeoutError(request=_REQUEST),
+    APITimeoutError("Request timed out."),
+])
+def test_timeouts_decrease_the_limit(error):
+    limiter = AdaptiveConcurrencyLimiter("test", initial_limit=8)
+
+    async def fail_once():
+        await limiter.acquire()
+        limiter.release("chat", error=error)
+
+    asyncio.run(fail_once())
+
+    assert limiter.current_limit == 4
+    assert limiter.decreases == 1
+
+
+def test_other_errors_keep_the_limit():
+    limiter = AdaptiveConcurrencyLimiter("test", initial_limit=8)
+
+    async def fail_once():
+        await limiter.acquire()
+        limiter.release("chat", error=ValueError("bad request body"))
+
+    asyncio.run(fail_once())
+
+    assert limiter.current_limit == 8
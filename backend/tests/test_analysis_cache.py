@@ -0,0 +1,53 @@
+import asyncio
+
+from app.services.analysis_cache import AnalysisResultCache
+
+
+def test_memory_tier_is_isolated_from_caller_mutation():
+    cache = AnalysisResultCache(memory_size=4)
+    result = {"summary": "원본", "clauses": [{"number": 1}]}
+
+    async def scenario():
+        await cache.set(b"contract", result)
+        result["share_id"] = "stored-after-set"
+        result["clauses"][0]["number"] = 99
+
+        first = await cache.get(b"contract")
+        first["revision"] = {"changed": 1}
+        first["clauses"].append({"number": 2})
+
+        return await cache.get(b"contract")
+
+    cached = asyncio.run(scenario())
+    assert cached == {"summary": "원본", "clauses": [{"number": 1}]}
+
+
+def test_unparsed_clause_analysis_is_not_cached(monkeypatch):
+    from app.core import openai_client
+    from app.services import analysis_service
+
+    document = {
+        "contract_type": "근로계약서",
+        "clauses": [{"number": 1, "title": "제1조", "content": "임금은 사용자가 정하는 날에 지급할 수 있다."}],
+    }
+
+    async def unparsed(clause, context=""):
+        return openai_client._unparsed_analysis()
+
+    async def no_lookup(*args, **kwargs):
+        return []
+
+    monkeypatch.setattr(analysis_service, "prepare_contract", lambda file_bytes, filename: document)
+    monkeypatch.setattr(analysis_service, "analyze_clause", unparsed)
+    monkeypatch.setattr(analysis_service, "_search_similar_cases", no_lookup)
+    monkeypatch.setattr(analysis_service, "_lookup_relevant_laws", no_lookup)
+    monkeypatch.setattr(analysis_service.settings, "clause_prescreen_enabled", False)
+
+    async def scenario():
+        result = await analysis_service.analyze_contract(b"unparsed-contract", "contract.pdf")
+        return result, await analysis_service.get_cached_analysis(b"unparsed-contract")
+
+    result, cached = asyncio.run(scenario())
+
+    assert result["clauses"][0]["analysis"]["failed"] is True
+    assert cached is None
@@ -0,0 +1,77 @@
+import io
+import struct
+import zipfile
+
+from app.services import bulk_analysis_service
+from app.services.bulk_analysis_service import expand_uploads
+
+
+def _zip(members, compression=zipfile.ZIP_STORED) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as archive:
+        for name, data in members:
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def _patch_header(data: bytes, offset: int, value: int) -> bytes:
+    """첫 항목의 로컬 헤더와 중앙 디렉터리 헤더 필드 수정 (offset은 로컬 헤더 기준: 플래그 6, 압축 방식 8)"""
+    data = bytearray(data)
+    struct.pack_into("<H", data, data.index(b"PK\x03\x04") + offset, value)
+    struct.pack_into("<H", data, data.index(b"PK\x01\x02") + offset + 2, value)
+    return bytes(data)
+
+
+def test_encrypted_member_is_reported_as_skipped():
+    contents = _zip([("secret.pdf", "제1조(목적) 비밀"), ("ok.pdf", "제1조(목적) 공개")])
+    contents = _patch_header(contents, 6, 0x1)
+
+    documents, skipped = expand_uploads([("bundle.zip", contents)])
+
+    assert [name for name, _ in documents] == ["ok.pdf"]
+    assert skipped == [{"filename": "secret.pdf", "reason": "암호로 보호된 파일입니다."}]
+
+
+def test_unsupported_compression_is_reported_as_skipped():
+    contents = _patch_header(_zip([("a.pdf", "제1조(목적) 내용")]), 8, 99)
+
+    documents, skipped = expand_uploads([("bundle.zip", contents)])
+
+    assert documents == []
+    assert skipped[0]["reason"] == "지원하지 않는 압축 방식입니다."
+
+
+def test_corrupt_deflate_stream_is_reported_as_skipped():
+    text = "제1조(목적) " * 200
+    contents = bytearray(_zip([("a.pdf", text)], zipfile.ZIP_DEFLATED))
+    start = contents.index(b"PK\x03\x04") + 30 + len("a.pdf")
+    contents[start:start + 8] = b"\xff" * 8
+
+    documents, skipped = expand_uploads([("bundle.zip", bytes(contents))])
+
+    assert documents == []
+    assert skipped[0]["reason"] == "손상된 파일입니다."
+
+
+def test_archive_size_limits(monkeypatch):
+    monkeypatch.setattr(bulk_analysis_service.settings, "bulk_max_archive_size_mb", 0)
+    documents, skipped = expand_uploads([("bundle.zip", _zip([("a.pdf", "내용")]))])
+    assert documents == []
+    assert skipped[0]["reason"] == "zip 파일 크기 제한을 초과합니다."
+
+    monkeypatch.setattr(bulk_analysis_service.settings, "bulk_max_archive_size_mb", 1)
+    half = "가" * (200 * 1024)  # UTF-8 약 600KB
+    contents = _zip([("a.pdf", half), ("b.pdf", half)], zipfile.ZIP_DEFLATED)
+    documents, skipped = expand_uploads([("bundle.zip", contents)])
+    assert [name for name, _ in documents] == ["a.pdf"]
+    assert skipped == [{"filename": "b.pdf", "reason": "zip 파일의 전체 압축 해제 크기 제한을 초과합니다."}]
+
+
+def test_expansion_stops_past_document_limit(monkeypatch):
+    monkeypatch.setattr(bulk_analysis_service.settings, "bulk_max_documents", 2)
+    contents = _zip([(f"c{i}.pdf", "제1조(목적) 내용") for i in range(10)])
+
+    documents, _ = expand_uploads([("bundle.zip", contents)])
+
+    # 제한을 넘었음을 알 수 있을 만큼만 풀고 중단
+    assert len(documents) == 3
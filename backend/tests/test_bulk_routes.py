@@ -0,0 +1,54 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import router, settings
+from app.services import bulk_analysis_service
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    return TestClient(app)
+
+
+def _files(count: int, size: int = 10):
+    return [("files", (f"contract{i}.pdf", b"x" * size, "application/pdf")) for i in range(count)]
+
+
+def test_bulk_upload_rejects_too_many_files(monkeypatch):
+    monkeypatch.setattr(settings, "bulk_max_documents", 2)
+
+    response = _client().post("/api/v1/analyze/bulk", files=_files(3))
+
+    assert response.status_code == 400
+    assert "최대 2개" in response.json()["detail"]
+
+
+def test_bulk_upload_rejects_total_size_while_reading(monkeypatch):
+    monkeypatch.setattr(settings, "bulk_max_upload_size_mb", 0)
+
+    response = _client().post("/api/v1/analyze/bulk", files=_files(1))
+
+    assert response.status_code == 400
+    assert "전체 크기" in response.json()["detail"]
+
+
+def test_bulk_upload_expands_archives_off_the_event_loop(monkeypatch):
+    calls = []
+
+    def expand(uploads):
+        try:
+            asyncio.get_running_loop()
+            calls.append("event loop")
+        except RuntimeError:
+            calls.append("worker thread")
+        return [], []
+
+    monkeypatch.setattr(bulk_analysis_service, "expand_uploads", expand)
+
+    response = _client().post("/api/v1/analyze/bulk", files=_files(1))
+
+    assert response.status_code == 400
+    assert calls == ["worker thread"]
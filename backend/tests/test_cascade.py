@@ -0,0 +1,22 @@
+import logging
+
+from app.core import cascade
+
+
+def test_unsupported_cascade_endpoints_are_ignored_with_warning(monkeypatch, caplog):
+    monkeypatch.setattr(cascade.settings, "llm_cascade_enabled", True)
+    monkeypatch.setattr(cascade.settings, "llm_cascade_endpoints", "clause_analysis,chat")
+    monkeypatch.setattr(cascade.settings, "llm_cascade_model", "fake-llm-mini")
+    monkeypatch.setattr(cascade, "_warned_endpoints", set())
+    monkeypatch.setattr(cascade, "_cascade", None)
+
+    with caplog.at_level(logging.WARNING, logger="app.core.cascade"):
+        assert cascade.get_model_cascade("chat") is None
+        assert cascade.get_model_cascade("chat") is None
+        assert cascade.get_model_cascade("clause_analysis") is not None
+
+    assert len(caplog.records) == 1
+    assert "chat" in caplog.records[0].message
+    stats = cascade.get_cascade_stats()
+    assert stats["applied_endpoints"] == ["clause_analysis"]
+    assert stats["ignored_endpoints"] == ["chat"]
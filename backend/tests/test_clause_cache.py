@@ -0,0 +1,29 @@
+import pytest
+
+from app.services.clause_cache import ClauseAnalysisCache, normalize_clause_text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1. 계약 기간은 1년으로 한다.", "계약 기간은 1년으로 한다."),
+    ("(2) 임금은 매월 지급한다.", "임금은 매월 지급한다."),
+    ("3)\n해지 통보는 서면으로 한다.", "해지 통보는 서면으로 한다."),
+    ("제5조(지연이자) 연 5% 지연이자를 지급한다.", "연 5% 지연이자를 지급한다."),
+])
+def test_numbering_is_removed(text, expected):
+    assert normalize_clause_text(text) == expected
+
+
+def test_decimal_at_line_start_is_kept():
+    assert normalize_clause_text("2.5% 지연이자를 지급한다.") == "2.5% 지연이자를 지급한다."
+    assert normalize_clause_text("2.5% 지연이자") != normalize_clause_text("5% 지연이자")
+
+
+def test_cached_result_is_isolated_from_nested_mutation():
+    cache = ClauseAnalysisCache(max_size=4)
+    result = {"risk_score": 3, "issues": ["원본 문제점"]}
+
+    cache.set("key", result)
+    result["issues"].append("저장 후 추가")
+    cache.get("key")["issues"].append("조회 후 추가")
+
+    assert cache.get("key")["issues"] == ["원본 문제점"]
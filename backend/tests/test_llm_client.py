@@ -0,0 +1,40 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.core.fake_llm import FakeLLMError
+from app.core.llm_client import RateLimitedClient, UpstageClient
+from app.core.rate_limit import ProviderRateLimiter
+
+
+class _FlakyCompletions:
+    """첫 호출은 429, 이후 성공하며 매 시도의 시스템 프롬프트를 기록"""
+
+    def __init__(self):
+        self.system_prompts = []
+
+    async def create(self, **kwargs):
+        self.system_prompts.append(kwargs["messages"][0]["content"])
+        if len(self.system_prompts) == 1:
+            raise FakeLLMError(429)
+        message = SimpleNamespace(content='{"ok": true}')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def test_json_instruction_is_not_accumulated_across_retries():
+    upstage = UpstageClient()
+    completions = _FlakyCompletions()
+    upstage.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    client = RateLimitedClient(upstage, ProviderRateLimiter("upstage-test", 0, 0))
+
+    messages = [
+        {"role": "system", "content": "시스템 프롬프트"},
+        {"role": "user", "content": "질문"},
+    ]
+    reply = asyncio.run(client.chat_completion(messages, json_response=True))
+
+    assert reply == '{"ok": true}'
+    assert len(completions.system_prompts) == 2
+    assert completions.system_prompts[0] == completions.system_prompts[1]
+    assert completions.system_prompts[0].count("JSON 형식") == 1
+    # 호출자의 메시지(단일 요청 키/의미 캐시 네임스페이스 계산 대상)는 그대로
+    assert messages[0]["content"] == "시스템 프롬프트"
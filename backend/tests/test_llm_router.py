@@ -0,0 +1,45 @@
+import asyncio
+
+from app.core.llm_router import LLMRouter
+
+
+class _SleepyClient:
+    """요청마다 지정한 시간만큼 기다린 뒤 응답하는 제공자"""
+
+    model = "sleepy"
+    embedding_model = None
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def chat_completion(self, messages, temperature=0.3, json_response=False, max_tokens=None):
+        await asyncio.sleep(self.latency)
+        return "ok"
+
+
+def test_hedge_delay_does_not_drift_down_when_primaries_are_slow():
+    primary = _SleepyClient(0.005)
+    router = LLMRouter(primary, _SleepyClient(0.03), hedge_min_delay=0.0, window=100)
+    messages = [{"role": "user", "content": "질문"}]
+
+    async def run():
+        for _ in range(20):
+            await router.chat_completion(messages)
+        baseline = router._hedge_delay()
+        # 준비 단계에서도 지터로 헤지가 이길 수 있으므로 이후 증가분만 비교
+        before = (router.hedge_wins, router.primary.requests)
+
+        # 기본 제공자가 느려지면 매번 헤지 요청이 이기고 기본 제공자 요청은 취소됨
+        primary.latency = 10.0
+        for _ in range(6):
+            await router.chat_completion(messages)
+        return baseline, before
+
+    baseline, (wins_before, requests_before) = asyncio.run(run())
+
+    assert router.hedge_wins - wins_before == 6
+    # 취소된 기본 제공자의 경과 시간도 표본에 들어가 헤지 지연 시간이 올라감
+    assert router._hedge_delay() > baseline
+    assert router._hedge_delay() >= 0.03
+    # 취소된 요청은 오류율 계산에 포함하지 않음
+    assert router.primary.requests == requests_before
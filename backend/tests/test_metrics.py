@@ -0,0 +1,29 @@
+from app.core.metrics import REGISTRY
+from app.core.semantic_cache import SemanticCache
+from app.services.clause_cache import ClauseAnalysisCache
+
+
+def _cache_samples():
+    return [line for line in REGISTRY.render().splitlines() if line.startswith("cache_requests_total{")]
+
+
+def test_cache_requests_are_labelled_by_provider_model_and_endpoint():
+    clause_cache = ClauseAnalysisCache(max_size=4)
+    clause_cache.get("missing", model="metrics-test-model", endpoint="clause_batch")
+
+    semantic_cache = SemanticCache(max_size=4)
+    semantic_cache.store("labor_chat", "ns", [1.0, 0.0], "답변")
+    semantic_cache.lookup("labor_chat", "ns", [1.0, 0.0], 0.9, provider="upstage", model="metrics-test-solar")
+
+    samples = _cache_samples()
+    assert any(
+        'cache="clause"' in line and 'model="metrics-test-model"' in line
+        and 'endpoint="clause_batch"' in line and 'result="miss"' in line
+        for line in samples
+    )
+    assert any(
+        'cache="semantic"' in line and 'provider="upstage"' in line
+        and 'model="metrics-test-solar"' in line and 'endpoint="labor_chat"' in line
+        and 'result="hit"' in line
+        for line in samples
+    )
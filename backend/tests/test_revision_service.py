@@ -0,0 +1,45 @@
+import asyncio
+
+from app.services import analysis_service, revision_service
+
+
+def _clauses(*contents):
+    return [
+        {"number": i, "title": f"제{i}조", "content": content}
+        for i, content in enumerate(contents, 1)
+    ]
+
+
+def test_reanalysis_does_not_leak_revision_fields_into_cached_analysis(monkeypatch):
+    prior_doc = {"contract_type": "근로계약서", "clauses": _clauses("근무시간은 주 40시간으로 한다.")}
+    new_doc = {
+        "contract_type": "근로계약서",
+        "clauses": _clauses("근무시간은 주 40시간으로 한다.", "임금은 매월 25일에 지급한다."),
+    }
+    documents = {b"v1": prior_doc, b"v2": new_doc}
+
+    def prepare(file_bytes, filename):
+        return documents[file_bytes]
+
+    async def no_lookup(*args, **kwargs):
+        return []
+
+    monkeypatch.setattr(analysis_service, "prepare_contract", prepare)
+    monkeypatch.setattr(revision_service, "prepare_contract", prepare)
+    monkeypatch.setattr(analysis_service, "_search_similar_cases", no_lookup)
+    monkeypatch.setattr(analysis_service, "_lookup_relevant_laws", no_lookup)
+
+    async def scenario():
+        prior = await analysis_service.analyze_contract(b"v1", "v1.pdf")
+        revised = await revision_service.reanalyze_contract(b"v2", "v2.pdf", prior)
+        # 협업 공유 경로가 응답에 덧붙이는 필드
+        revised["share_id"] = "share-1"
+        revised["version_number"] = 2
+        return revised, await analysis_service.analyze_contract(b"v2", "v2.pdf")
+
+    revised, analyzed = asyncio.run(scenario())
+
+    assert revised["revision"]["added"] == 1
+    assert "revision" not in analyzed
+    assert "share_id" not in analyzed
+    assert "version_number" not in analyzed
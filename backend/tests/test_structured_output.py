@@ -0,0 +1,27 @@
+import pytest
+
+from app.core.structured_output import _coerce_confidence
+
+
+@pytest.mark.parametrize("value, expected", [
+    (0.8, 0.8),
+    ("0.8", 0.8),
+    (80, 0.8),
+    ("80", 0.8),
+    ("80%", 0.8),
+    ("72.5%", 0.725),
+    (100, 1.0),
+    (1, 1.0),
+    # 백분율로 보이지 않는 범위 밖 값은 나누지 않고 제한
+    (1.5, 1.0),
+    ("1.5", 1.0),
+    (250, 1.0),
+    (-0.2, 0.0),
+])
+def test_coerce_confidence(value, expected):
+    assert _coerce_confidence(value) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("value", [True, None, "높음", [0.8]])
+def test_coerce_confidence_rejects_unparseable(value):
+    assert _coerce_confidence(value) is None
@@ -0,0 +1,75 @@
+import logging
+
+import pytest
+
+from app.core.token_budget import PromptBudgetError, fit_messages
+from app.core.tokens import count_message_tokens
+
+
+def test_truncating_clause_is_logged(caplog):
+    messages = [
+        {"role": "system", "content": "조항을 분석하세요."},
+        {"role": "user", "content": "조항: " + "임차인은 모든 손해를 배상한다. " * 200},
+    ]
+
+    with caplog.at_level(logging.WARNING, logger="app.core.token_budget"):
+        fitted = fit_messages(messages, 200, endpoint="clause_analysis")
+
+    assert count_message_tokens(fitted) <= 200
+    assert fitted[-1]["content"].endswith("(이하 생략)")
+    assert any(
+        "마지막 메시지" in record.message and "clause_analysis" in record.message
+        for record in caplog.records
+    )
+
+
+def test_fitting_messages_is_silent_within_budget(caplog):
+    messages = [
+        {"role": "system", "content": "조항을 분석하세요."},
+        {"role": "user", "content": "조항: 계약 기간은 1년으로 한다."},
+    ]
+
+    with caplog.at_level(logging.WARNING, logger="app.core.token_budget"):
+        assert fit_messages(messages, 200, endpoint="clause_analysis") == messages
+
+    assert not caplog.records
+
+
+def test_fixed_system_prompt_is_never_truncated():
+    from app.core.openai_client import CLAUSE_ANALYSIS_SYSTEM_PROMPT
+
+    clause = "제5조(손해배상) 임차인은 임대인에게 발생한 모든 손해를 배상한다. " * 150
+    messages = [
+        {"role": "system", "content": CLAUSE_ANALYSIS_SYSTEM_PROMPT},
+        {"role": "user", "content": f"조항: {clause}\n\n컨텍스트: "},
+    ]
+    assert count_message_tokens(messages) > 4000
+
+    fitted = fit_messages(messages, 4000, endpoint="clause_analysis")
+
+    assert fitted[0]["content"] == CLAUSE_ANALYSIS_SYSTEM_PROMPT
+    assert fitted[-1]["content"].endswith("(이하 생략)")
+    assert count_message_tokens(fitted) <= 4000
+
+
+def test_dynamic_context_is_dropped_before_system_prompt():
+    messages = [
+        {"role": "system", "content": "상담 지시문. " * 5},
+        {"role": "system", "content": "참고 판례: " + "판례 내용 " * 300},
+        {"role": "user", "content": "질문 " * 300},
+    ]
+
+    fitted = fit_messages(messages, 120, endpoint="chat")
+
+    assert fitted[0] == messages[0]
+    assert count_message_tokens(fitted) <= 120
+
+
+def test_system_prompt_over_budget_raises():
+    messages = [
+        {"role": "system", "content": "지시문 " * 500},
+        {"role": "user", "content": "질문"},
+    ]
+
+    with pytest.raises(PromptBudgetError):
+        fit_messages(messages, 100, endpoint="chat")
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core import tokens
+
+
+@pytest.fixture
+def slow_encoding(monkeypatch):
+    """내려받기가 끝나지 않은 상태를 흉내 내는 인코딩 로더"""
+    if tokens.tiktoken is None:
+        pytest.skip("tiktoken이 설치되어 있지 않음")
+    release = threading.Event()
+    loaded = threading.Event()
+
+    class _Encoding:
+        def encode(self, text, disallowed_special=()):
+            return list(text)
+
+    def get_encoding(name):
+        release.wait(5)
+        loaded.set()
+        return _Encoding()
+
+    monkeypatch.setattr(tokens.tiktoken, "get_encoding", get_encoding)
+    monkeypatch.setattr(tokens, "_encodings", {})
+    monkeypatch.setattr(tokens, "_loading", set())
+    yield release, loaded
+    release.set()
+
+
+def test_event_loop_uses_estimate_while_encoding_loads(slow_encoding):
+    release, loaded = slow_encoding
+
+    async def count():
+        return tokens.count_tokens("hello world", "gpt-4o")
+
+    # 내려받기를 기다리지 않고 추정치 반환
+    assert asyncio.run(count()) == tokens.estimate_tokens("hello world")
+    assert "o200k_base" in tokens._loading
+
+    release.set()
+    assert loaded.wait(5)
+    for _ in range(100):
+        if "o200k_base" in tokens._encodings:
+            break
+        threading.Event().wait(0.01)
+    assert asyncio.run(count()) == len("hello world")
+
+
+def test_load_encodings_runs_in_thread(slow_encoding):
+    release, _ = slow_encoding
+
+    async def warm_up():
+        task = asyncio.create_task(tokens.load_encodings(["gpt-4o"]))
+        # 불러오는 동안에도 이벤트 루프는 다른 작업을 처리
+        await asyncio.sleep(0)
+        assert not task.done()
+        release.set()
+        await task
+
+    asyncio.run(warm_up())
+    assert tokens._encodings["o200k_base"] is not None
@@ -0,0 +1,27 @@
+import pytest
+
+from app.services.triage_service import prescreen_clause
+
+
+@pytest.mark.parametrize("content", [
+    "갑: (서명)",
+    "대표이사 홍길동 (인)",
+    "을 : 김철수 서명",
+    "서명:",
+    "2024년 1월 1일",
+    "주소: 서울특별시 강남구",
+    "제1조(목적)",
+    "제3조의2(정의)",
+])
+def test_prescreens_formal_lines(content):
+    assert prescreen_clause(content) is not None
+
+
+@pytest.mark.parametrize("content", [
+    "근로자는 회사가 요구하는 모든 서류에 서명하여야 한다.",
+    "을은 갑의 서명 없이도 본 계약 내용을 변경하는 데 동의한다",
+    "제7조 휴게시간 미부여",
+    "제7조(휴게) 회사는 휴게시간을 부여하지 아니한다.",
+])
+def test_keeps_substantive_clauses_for_llm(content):
+    assert prescreen_clause(content) is None